@@ -28,6 +28,7 @@ from phi.llm.references import References  # noqa: F401
 from phi.memory.assistant import AssistantMemory
 from phi.prompt.template import PromptTemplate
 from phi.storage.assistant import AssistantStorage
+from phi.utils.db import aiterate_in_connection_scope, db_connection_scope, iterate_in_connection_scope
 from phi.utils.format_str import remove_indent
 from phi.tools import Tool, Toolkit, Function
 from phi.utils.log import logger, set_log_level_to_debug
@@ -79,6 +80,10 @@ class Assistant(BaseModel):
     storage: Optional[AssistantStorage] = None
     # AssistantRun from the database: DO NOT SET MANUALLY
     db_row: Optional[AssistantRun] = None
+    # If True, storage, knowledge and tools share one database connection per engine for the run
+    # instead of checking out a pooled connection for every query.
+    # The connection is held for the entire run, including while waiting on the LLM.
+    reuse_db_connection: bool = False
     # -*- Assistant Tools
     # A list of tools provided to the LLM.
     # Tools are functions the model may generate JSON inputs for.
@@ -287,7 +292,8 @@ class Assistant(BaseModel):
                 self.llm.add_tool(self.get_tool_call_history)
         if self.knowledge_base is not None:
             if self.search_knowledge:
-                self.llm.add_tool(self.search_knowledge_base)
+                # Async runs search the knowledge base without blocking the event loop
+                self.llm.add_tool(Function.from_callable(self.search_knowledge_base, self.asearch_knowledge_base))
             if self.update_knowledge:
                 self.llm.add_tool(self.add_to_knowledge_base)
 
@@ -666,6 +672,25 @@ class Assistant(BaseModel):
             return None
 
         relevant_docs: List[Document] = self.knowledge_base.search(query=query, num_documents=num_documents)
+        return self.format_references(relevant_docs)
+
+    async def aget_references_from_knowledge_base(
+        self, query: str, num_documents: Optional[int] = None
+    ) -> Optional[str]:
+        """Return a list of references from the knowledge base without blocking the event loop"""
+
+        if self.references_function is not None:
+            reference_kwargs = {"assistant": self, "query": query, "num_documents": num_documents}
+            return remove_indent(self.references_function(**reference_kwargs))
+
+        if self.knowledge_base is None:
+            return None
+
+        relevant_docs: List[Document] = await self.knowledge_base.asearch(query=query, num_documents=num_documents)
+        return self.format_references(relevant_docs)
+
+    def format_references(self, relevant_docs: List[Document]) -> Optional[str]:
+        """Format documents from the knowledge base as references"""
         if len(relevant_docs) == 0:
             return None
 
@@ -764,6 +789,28 @@ class Assistant(BaseModel):
         stream: bool = True,
         messages: Optional[List[Union[Dict, Message]]] = None,
         **kwargs: Any,
+    ) -> Iterator[str]:
+        if not self.reuse_db_connection:
+            yield from self._run_steps(message=message, stream=stream, messages=messages, **kwargs)
+            return
+
+        if stream and self.streamable:
+            yield from iterate_in_connection_scope(
+                self._run_steps(message=message, stream=stream, messages=messages, **kwargs)
+            )
+        else:
+            # Run to completion so the connection is released before the response is returned
+            with db_connection_scope():
+                response = list(self._run_steps(message=message, stream=stream, messages=messages, **kwargs))
+            yield from response
+
+    def _run_steps(
+        self,
+        message: Optional[Union[List, Dict, str]] = None,
+        *,
+        stream: bool = True,
+        messages: Optional[List[Union[Dict, Message]]] = None,
+        **kwargs: Any,
     ) -> Iterator[str]:
         logger.debug(f"*********** Assistant Run Start: {self.run_id} ***********")
         # Load run from storage
@@ -958,6 +1005,36 @@ class Assistant(BaseModel):
         stream: bool = True,
         messages: Optional[List[Union[Dict, Message]]] = None,
         **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        if not self.reuse_db_connection:
+            async for response_chunk in self._arun_steps(message=message, stream=stream, messages=messages, **kwargs):
+                yield response_chunk
+            return
+
+        if stream and self.streamable:
+            async for response_chunk in aiterate_in_connection_scope(
+                self._arun_steps(message=message, stream=stream, messages=messages, **kwargs)
+            ):
+                yield response_chunk
+        else:
+            # Run to completion so the connection is released before the response is returned
+            with db_connection_scope():
+                response = [
+                    response_chunk
+                    async for response_chunk in self._arun_steps(
+                        message=message, stream=stream, messages=messages, **kwargs
+                    )
+                ]
+            for response_chunk in response:
+                yield response_chunk
+
+    async def _arun_steps(
+        self,
+        message: Optional[Union[List, Dict, str]] = None,
+        *,
+        stream: bool = True,
+        messages: Optional[List[Union[Dict, Message]]] = None,
+        **kwargs: Any,
     ) -> AsyncIterator[str]:
         logger.debug(f"*********** Run Start: {self.run_id} ***********")
         # Load run from storage
@@ -1008,7 +1085,7 @@ class Assistant(BaseModel):
             if self.add_references_to_prompt and message and isinstance(message, str):
                 reference_timer = Timer()
                 reference_timer.start()
-                user_prompt_references = self.get_references_from_knowledge_base(query=message)
+                user_prompt_references = await self.aget_references_from_knowledge_base(query=message)
                 reference_timer.stop()
                 references = References(
                     query=message, references=user_prompt_references, time=round(reference_timer.elapsed, 4)
@@ -1289,6 +1366,23 @@ class Assistant(BaseModel):
         self.memory.add_references(references=_ref)
         return references or ""
 
+    async def asearch_knowledge_base(self, query: str) -> str:
+        """Use this function to search the knowledge base for information about a query.
+
+        Args:
+            query: The query to search for.
+
+        Returns:
+            str: A string containing the response from the knowledge base.
+        """
+        reference_timer = Timer()
+        reference_timer.start()
+        references = await self.aget_references_from_knowledge_base(query=query)
+        reference_timer.stop()
+        _ref = References(query=query, references=references, time=round(reference_timer.elapsed, 4))
+        self.memory.add_references(references=_ref)
+        return references or ""
+
     def add_to_knowledge_base(self, query: str, result: str) -> str:
         """Use this function to add information to the knowledge base for future use.
 
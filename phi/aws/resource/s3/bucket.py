@@ -1,4 +1,4 @@
-from typing import Optional, Any, Dict, List
+from typing import Optional, Any, Dict, List, Iterator
 from typing_extensions import Literal
 
 from phi.aws.api_client import AwsApiClient
@@ -175,6 +175,15 @@ class S3Bucket(AwsResource):
     def get_objects(self, aws_client: Optional[AwsApiClient] = None, prefix: Optional[str] = None) -> List[Any]:
         """Returns a list of s3.Object objects for the s3.Bucket
 
+        Args:
+            aws_client: The AwsApiClient for the current cluster
+            prefix: Prefix to filter objects by
+        """
+        return list(self.iter_objects(aws_client=aws_client, prefix=prefix))
+
+    def iter_objects(self, aws_client: Optional[AwsApiClient] = None, prefix: Optional[str] = None) -> Iterator[Any]:
+        """Yields s3.Object objects for the s3.Bucket, fetching one page of the listing at a time
+
         Args:
             aws_client: The AwsApiClient for the current cluster
             prefix: Prefix to filter objects by
@@ -182,19 +191,13 @@ class S3Bucket(AwsResource):
         bucket = self.get_resource(aws_client)
         if bucket is None:
             logger.warning(f"Could not get bucket: {self.name}")
-            return []
+            return
 
         logger.debug(f"Getting objects for bucket: {bucket.name}")
-        # Get all objects in bucket
-        object_summaries = bucket.objects.all()
-        all_objects: List[S3Object] = []
+        # Filter objects by prefix on the server
+        object_summaries = bucket.objects.filter(Prefix=prefix) if prefix is not None else bucket.objects.all()
         for object_summary in object_summaries:
-            if prefix is not None and not object_summary.key.startswith(prefix):
-                continue
-            all_objects.append(
-                S3Object(
-                    bucket_name=bucket.name,
-                    name=object_summary.key,
-                )
+            yield S3Object(
+                bucket_name=bucket.name,
+                name=object_summary.key,
             )
-        return all_objects
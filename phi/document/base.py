@@ -25,7 +25,36 @@ class Document(BaseModel):
         if _embedder is None:
             raise ValueError("No embedder provided")
 
-        self.embedding, self.usage = _embedder.get_embedding_and_usage(self.content)
+        # Embed through the batch api so the embedder cache is used
+        self.embed_documents(documents=[self], embedder=_embedder)
+
+    @staticmethod
+    def embed_documents(documents: List["Document"], embedder: Embedder) -> None:
+        """Embed a list of documents using batched requests to the embedder"""
+
+        if len(documents) == 0:
+            return
+
+        embeddings, usage = embedder.get_embeddings_batch_and_usage([document.content for document in documents])
+        if len(embeddings) != len(documents):
+            raise ValueError(f"Embedder returned {len(embeddings)} embeddings for {len(documents)} documents")
+        for document, _embedding, _usage in zip(documents, embeddings, usage):
+            document.embedding = _embedding
+            document.usage = _usage
+
+    @staticmethod
+    async def aembed_documents(documents: List["Document"], embedder: Embedder) -> None:
+        """Embed a list of documents using batched requests to the embedder, without blocking the event loop"""
+
+        if len(documents) == 0:
+            return
+
+        embeddings, usage = await embedder.aget_embeddings_batch_and_usage([document.content for document in documents])
+        if len(embeddings) != len(documents):
+            raise ValueError(f"Embedder returned {len(embeddings)} embeddings for {len(documents)} documents")
+        for document, _embedding, _usage in zip(documents, embeddings, usage):
+            document.embedding = _embedding
+            document.usage = _usage
 
     def to_dict(self) -> Dict[str, Any]:
         """Returns a dictionary representation of the document"""
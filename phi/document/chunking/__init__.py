@@ -0,0 +1 @@
+from phi.document.chunking.base import ChunkingStrategy
@@ -0,0 +1,58 @@
+import re
+from typing import List
+
+from pydantic import BaseModel, ConfigDict
+
+from phi.document.base import Document
+
+# Matches any run of whitespace, which is replaced by a single space in one pass
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class ChunkingStrategy(BaseModel):
+    """Base class for strategies that split a document into smaller documents"""
+
+    # Maximum size of a chunk
+    chunk_size: int = 3000
+    # Size of the overlap between consecutive chunks
+    overlap: int = 0
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def chunk(self, document: Document) -> List[Document]:
+        raise NotImplementedError
+
+    def clean_text(self, text: str) -> str:
+        """Clean the text by replacing each run of whitespace with a single space"""
+        return WHITESPACE_PATTERN.sub(" ", text)
+
+    def get_overlap(self, pieces: List[str], max_length: int, separator: str = "") -> List[str]:
+        """Returns the last pieces of a chunk, joined by `separator`, with a total length of at most `overlap`
+        and `max_length` characters, to repeat at the start of the next chunk
+        """
+        limit = min(max(self.overlap, 0), max_length)
+        overlap_pieces: List[str] = []
+        length = 0
+        for piece in reversed(pieces):
+            if length + len(piece) + len(separator) > limit:
+                break
+            overlap_pieces.insert(0, piece)
+            length += len(piece) + len(separator)
+        return overlap_pieces
+
+    def create_chunk(self, document: Document, content: str, chunk_number: int) -> Document:
+        """Returns a Document for a chunk of the document"""
+        chunk_id = None
+        if document.id:
+            chunk_id = f"{document.id}_{chunk_number}"
+        elif document.name:
+            chunk_id = f"{document.name}_{chunk_number}"
+        meta_data = document.meta_data.copy()
+        meta_data["chunk"] = chunk_number
+        meta_data["chunk_size"] = len(content)
+        return Document(
+            id=chunk_id,
+            name=document.name,
+            meta_data=meta_data,
+            content=content,
+        )
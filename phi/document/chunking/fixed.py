@@ -0,0 +1,42 @@
+from typing import List
+
+from phi.document.base import Document
+from phi.document.chunking.base import ChunkingStrategy
+
+
+class FixedSizeChunking(ChunkingStrategy):
+    """Split the document into chunks of at most `chunk_size` characters, ending chunks at a space when possible"""
+
+    def chunk(self, document: Document) -> List[Document]:
+        content = self.clean_text(document.content)
+        content_length = len(content)
+        chunk_size = max(self.chunk_size, 1)
+        overlap = min(max(self.overlap, 0), chunk_size - 1)
+        chunks: List[Document] = []
+        chunk_number = 1
+
+        start = 0
+        while start < content_length:
+            end = start + chunk_size
+            if end < content_length:
+                # Ensure we're not splitting a word in half: end the chunk at the last space in the window.
+                # If the entire chunk is a word, then just split it at chunk_size
+                boundary = content.rfind(" ", start + 1, end + 1)
+                if boundary != -1:
+                    end = boundary
+            else:
+                end = content_length
+
+            chunks.append(self.create_chunk(document=document, content=content[start:end], chunk_number=chunk_number))
+            chunk_number += 1
+            if end >= content_length:
+                break
+            if overlap > 0:
+                # Start the next chunk at most `overlap` characters before the end of this one,
+                # at a space if possible, always moving forward
+                overlap_start = max(end - overlap, start + 1)
+                boundary = content.find(" ", overlap_start, end)
+                start = boundary if boundary != -1 else overlap_start
+            else:
+                start = end
+        return chunks
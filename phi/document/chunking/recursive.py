@@ -0,0 +1,74 @@
+import re
+from typing import List, Optional
+
+from phi.document.base import Document
+from phi.document.chunking.base import ChunkingStrategy
+
+
+class RecursiveChunking(ChunkingStrategy):
+    """Split the document on the first separator that occurs in the text (e.g. paragraphs), recursively
+    splitting pieces which are still larger than `chunk_size` on the next separators (e.g. lines, sentences, words),
+    then merge adjacent pieces into chunks of at most `chunk_size` characters.
+    """
+
+    # Separators in order of priority. If None, separators set on the Reader or paragraphs, lines, sentences, words
+    separators: Optional[List[str]] = None
+
+    def clean_text(self, text: str) -> str:
+        """Clean the text while keeping line breaks, which are used as separators"""
+        cleaned_text = text.replace("\r\n", "\n").replace("\r", "\n")
+        # Replace runs of other whitespace with a single space
+        cleaned_text = re.sub(r"[^\S\n]+", " ", cleaned_text)
+        # Replace more than two consecutive newlines (ignoring spaces between them) with a paragraph break
+        return re.sub(r"\n[ \n]*\n", "\n\n", cleaned_text)
+
+    def chunk(self, document: Document) -> List[Document]:
+        separators = self.separators if self.separators is not None else ["\n\n", "\n", ". ", " "]
+        content = self.clean_text(document.content)
+        chunks: List[Document] = []
+        for chunk_number, chunk_content in enumerate(self.split_text(content, separators), start=1):
+            chunks.append(self.create_chunk(document=document, content=chunk_content, chunk_number=chunk_number))
+        return chunks
+
+    def split_text(self, text: str, separators: List[str]) -> List[str]:
+        """Split the text into chunks of at most `chunk_size` characters, starting each chunk with up to `overlap`
+        characters of pieces from the end of the previous chunk
+        """
+        chunk_size = max(self.chunk_size, 1)
+        chunks: List[str] = []
+        current: List[str] = []
+        current_length = 0
+        for piece in self.split_pieces(text, separators, chunk_size):
+            if len(current) > 0 and current_length + len(piece) > chunk_size:
+                chunks.append("".join(current).strip())
+                current = self.get_overlap(current, max_length=chunk_size - len(piece))
+                current_length = sum(len(p) for p in current)
+            current.append(piece)
+            current_length += len(piece)
+        if len(current) > 0:
+            chunks.append("".join(current).strip())
+        return [chunk for chunk in chunks if chunk]
+
+    def split_pieces(self, text: str, separators: List[str], chunk_size: int) -> List[str]:
+        """Split the text on the first separator that occurs in it, recursively splitting pieces which are still
+        larger than `chunk_size` on the next separators. The pieces join back into the text.
+        """
+        if len(text) <= chunk_size:
+            return [text] if text else []
+
+        for i, separator in enumerate(separators):
+            if separator == "" or separator not in text:
+                continue
+
+            # Keep the separator at the end of each piece, so pieces can be joined back without it
+            parts = text.split(separator)
+            pieces: List[str] = []
+            for piece in [part + separator for part in parts[:-1]] + [parts[-1]]:
+                if len(piece) > chunk_size:
+                    pieces.extend(self.split_pieces(piece, separators[i + 1 :], chunk_size))
+                elif piece:
+                    pieces.append(piece)
+            return pieces
+
+        # No separator left, split at chunk_size
+        return [text[i : i + chunk_size] for i in range(0, len(text), chunk_size)]
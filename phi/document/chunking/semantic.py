@@ -0,0 +1,77 @@
+import re
+from math import sqrt
+from typing import List, Optional
+
+from phi.document.base import Document
+from phi.document.chunking.base import ChunkingStrategy
+from phi.document.chunking.recursive import RecursiveChunking
+from phi.embedder import Embedder
+
+# Split sentences after terminal punctuation followed by whitespace
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+
+class SemanticChunking(ChunkingStrategy):
+    """Group adjacent sentences into chunks, starting a new chunk when the similarity between the embeddings
+    of consecutive sentences drops below `similarity_threshold` or the chunk would exceed `chunk_size` characters.
+    Sentences longer than `chunk_size` are split with RecursiveChunking. A chunk started because of its size repeats
+    up to `overlap` characters of sentences from the end of the previous chunk, but at most half of that chunk.
+    """
+
+    # Embedder used to embed sentences, defaults to the OpenAIEmbedder
+    embedder: Optional[Embedder] = None
+    # Minimum cosine similarity between consecutive sentences to keep them in the same chunk
+    similarity_threshold: float = 0.5
+
+    def get_embedder(self) -> Embedder:
+        if self.embedder is None:
+            from phi.embedder.openai import OpenAIEmbedder
+
+            self.embedder = OpenAIEmbedder()
+        return self.embedder
+
+    @staticmethod
+    def cosine_similarity(a: List[float], b: List[float]) -> float:
+        dot = sum(x * y for x, y in zip(a, b))
+        norm = sqrt(sum(x * x for x in a)) * sqrt(sum(y * y for y in b))
+        return dot / norm if norm > 0 else 0.0
+
+    def chunk(self, document: Document) -> List[Document]:
+        content = self.clean_text(document.content)
+        chunk_size = max(self.chunk_size, 1)
+        sentence_splitter = RecursiveChunking(chunk_size=chunk_size)
+        sentences: List[str] = []
+        for sentence in SENTENCE_PATTERN.split(content):
+            if len(sentence) > chunk_size:
+                sentences.extend(sentence_splitter.split_text(sentence, ["; ", ", ", " "]))
+            elif sentence.strip():
+                sentences.append(sentence)
+        if len(sentences) == 0:
+            return []
+
+        # Embed all sentences of the document using batched requests
+        embeddings = self.get_embedder().get_embeddings_batch(sentences)
+
+        chunk_contents: List[str] = []
+        current: List[str] = [sentences[0]]
+        for i in range(1, len(sentences)):
+            similarity = self.cosine_similarity(embeddings[i - 1], embeddings[i])
+            # Length of the chunk with the sentence added, including the spaces between sentences
+            length = sum(len(sentence) + 1 for sentence in current) + len(sentences[i])
+            if similarity < self.similarity_threshold:
+                # The topic changed, so the next chunk starts without repeating the previous chunk
+                chunk_contents.append(" ".join(current))
+                current = []
+            elif length > chunk_size:
+                chunk_content = " ".join(current)
+                chunk_contents.append(chunk_content)
+                # Repeat at most half of the previous chunk, so the next chunk never repeats all of it
+                max_length = min(chunk_size - len(sentences[i]), len(chunk_content) // 2)
+                current = self.get_overlap(current, max_length=max_length, separator=" ")
+            current.append(sentences[i])
+        chunk_contents.append(" ".join(current))
+
+        return [
+            self.create_chunk(document=document, content=chunk_content, chunk_number=chunk_number)
+            for chunk_number, chunk_content in enumerate(chunk_contents, start=1)
+        ]
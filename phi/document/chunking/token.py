@@ -0,0 +1,34 @@
+from typing import List, Optional
+
+from phi.document.base import Document
+from phi.document.chunking.base import ChunkingStrategy
+from phi.utils.tokenizer import Tokenizer, TiktokenTokenizer
+
+
+class TokenChunking(ChunkingStrategy):
+    """Split the document into chunks of at most `chunk_size` tokens, with `overlap` tokens between chunks"""
+
+    chunk_size: int = 512
+    # Tokenizer used to count tokens, defaults to the tiktoken cl100k_base encoding
+    tokenizer: Optional[Tokenizer] = None
+
+    def get_tokenizer(self) -> Tokenizer:
+        if self.tokenizer is None:
+            self.tokenizer = TiktokenTokenizer()
+        return self.tokenizer
+
+    def chunk(self, document: Document) -> List[Document]:
+        tokenizer = self.get_tokenizer()
+        tokens = tokenizer.encode(self.clean_text(document.content))
+        chunk_size = max(self.chunk_size, 1)
+        step = chunk_size - min(max(self.overlap, 0), chunk_size - 1)
+
+        chunks: List[Document] = []
+        for chunk_number, start in enumerate(range(0, len(tokens), step), start=1):
+            content = tokenizer.decode(tokens[start : start + chunk_size])
+            chunk = self.create_chunk(document=document, content=content, chunk_number=chunk_number)
+            chunk.meta_data["tokens"] = len(tokens[start : start + chunk_size])
+            chunks.append(chunk)
+            if start + chunk_size >= len(tokens):
+                break
+        return chunks
@@ -1,23 +1,178 @@
+from contextlib import ExitStack, contextmanager
+from io import BytesIO
+from os import stat
 from pathlib import Path
-from typing import List, Union, IO, Any
+from typing import TYPE_CHECKING, List, Union, IO, Any, Dict, Iterator, Optional, Tuple
+
+from pydantic import PrivateAttr
 
 from phi.document.base import Document
 from phi.document.reader.base import Reader
 from phi.utils.log import logger
 
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+# The pdf last opened by this worker process, so consecutive page ranges of a pdf are parsed once per worker
+_worker_pdf: Dict[str, Any] = {}
+
+
+def extract_page_texts(pdf_path: str, start: int, end: int) -> List[str]:
+    """Extract the text of pages [start, end) of a pdf file, returning fewer texts past the last page.
+    Defined at module level so it can run in a worker process.
+    """
+    from pypdf import PdfReader as DocumentReader
+
+    pdf_stat = stat(pdf_path)
+    pdf_key = (pdf_path, pdf_stat.st_ino, pdf_stat.st_size, pdf_stat.st_mtime_ns)
+    if _worker_pdf.get("key") != pdf_key:
+        if "file" in _worker_pdf:
+            _worker_pdf["file"].close()
+        # Pass pypdf a file object, as it reads the whole file into memory when given a path
+        pdf_file = open(pdf_path, "rb")
+        _worker_pdf.update(key=pdf_key, file=pdf_file, reader=DocumentReader(pdf_file))
+    doc_reader = _worker_pdf["reader"]
+    return [doc_reader.pages[i].extract_text() for i in range(start, min(end, len(doc_reader.pages)))]
+
+
+class BasePDFReader(Reader):
+    """Base class for PDF readers, which can extract text from pages in parallel"""
+
+    # Number of processes used to extract text from pages. Pages are read in the current process if None or 1.
+    num_workers: Optional[int] = None
+    # Number of pages extracted by a worker process per task
+    pages_per_task: int = 10
+
+    _executor: Optional["ProcessPoolExecutor"] = PrivateAttr(default=None)
+    _pool_size: int = PrivateAttr(default=0)
+
+    @contextmanager
+    def worker_pool(self, num_workers: Optional[int] = None) -> Iterator[Optional["ProcessPoolExecutor"]]:
+        """Shares one pool of `num_workers` processes, defaulting to `self.num_workers`, between all pdfs read
+        within the block. Yields None if pdfs are read in the current process.
+        Nested blocks use the pool of the outermost block.
+        """
+        if self._executor is not None:
+            yield self._executor
+            return
+
+        _num_workers = num_workers or self.num_workers
+        if _num_workers is None or _num_workers <= 1:
+            yield None
+            return
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        logger.debug(f"Starting {_num_workers} pdf workers")
+        executor = ProcessPoolExecutor(max_workers=_num_workers)
+        self._executor = executor
+        self._pool_size = _num_workers
+        try:
+            yield executor
+        finally:
+            self._executor = None
+            executor.shutdown(wait=True)
+
+    def get_page_texts(self, executor: "ProcessPoolExecutor", pdf_path: str) -> Iterator[Tuple[int, str]]:
+        """Yields (page_number, text) for each page, in page order, extracting page ranges in the process pool.
+        At most `2 * num_workers` tasks are submitted ahead of the pages being consumed. The number of pages is
+        not known ahead, so tasks are submitted until one returns less than `pages_per_task` pages.
+        """
+        from collections import deque
+        from concurrent.futures import Future
+
+        _pages_per_task = max(self.pages_per_task, 1)
+        _max_pending = 2 * max(self._pool_size, 1)
+        pending: "deque[Future]" = deque()
+        next_start = 0
+        page_number = 1
+        while True:
+            while len(pending) < _max_pending:
+                pending.append(executor.submit(extract_page_texts, pdf_path, next_start, next_start + _pages_per_task))
+                next_start += _pages_per_task
+            page_texts = pending.popleft().result()
+            for page_text in page_texts:
+                yield page_number, page_text
+                page_number += 1
+            if len(page_texts) < _pages_per_task:
+                # Past the last page, the remaining tasks return no pages
+                for future in pending:
+                    future.cancel()
+                return
+
+    def iter_pdf(self, doc_name: str, pdf: Union[str, Path, IO[Any], bytes]) -> Iterator[Document]:
+        """Yields documents from a pdf file path, file object or pdf contents.
+        Pages are extracted and chunked one at a time, so the full text of the pdf is never held in memory.
+        """
+        try:
+            from pypdf import PdfReader as DocumentReader
+        except ImportError:
+            raise ImportError("`pypdf` not installed")
 
-class PDFReader(Reader):
+        with ExitStack() as stack:
+            executor = stack.enter_context(self.worker_pool())
+            page_texts: Iterator[Tuple[int, str]]
+            if executor is not None:
+                # Worker processes are passed a path, never the contents of the pdf
+                pdf_path: str
+                if isinstance(pdf, (str, Path)):
+                    pdf_path = str(pdf)
+                else:
+                    # Copy the pdf to a temporary file instead of reading it into memory
+                    from shutil import copyfileobj
+                    from tempfile import NamedTemporaryFile
+
+                    temporary_file = stack.enter_context(NamedTemporaryFile(suffix=".pdf"))
+                    if isinstance(pdf, bytes):
+                        temporary_file.write(pdf)
+                    else:
+                        pdf.seek(0)
+                        copyfileobj(pdf, temporary_file)
+                    temporary_file.flush()
+                    pdf_path = temporary_file.name
+                logger.debug(f"Extracting pages of {doc_name} using {self._pool_size} workers")
+                page_texts = self.get_page_texts(executor=executor, pdf_path=pdf_path)
+            else:
+                # pypdf reads a file object lazily, but reads the whole file into memory when given a path
+                pdf_stream: IO[Any]
+                if isinstance(pdf, (str, Path)):
+                    pdf_stream = stack.enter_context(open(pdf, "rb"))
+                elif isinstance(pdf, bytes):
+                    pdf_stream = BytesIO(pdf)
+                else:
+                    pdf_stream = pdf
+                doc_reader = DocumentReader(pdf_stream)
+                page_texts = (
+                    (page_number, page.extract_text()) for page_number, page in enumerate(doc_reader.pages, 1)
+                )
+
+            for page_number, page_text in page_texts:
+                document = Document(
+                    name=doc_name,
+                    id=f"{doc_name}_{page_number}",
+                    meta_data={"page": page_number},
+                    content=page_text,
+                )
+                if self.chunk:
+                    yield from self.chunk_document(document)
+                else:
+                    yield document
+
+    def read_pdf(self, doc_name: str, pdf: Union[str, Path, IO[Any], bytes]) -> List[Document]:
+        """Read the pages of a pdf file path, file object or pdf contents into documents"""
+        return list(self.iter_pdf(doc_name=doc_name, pdf=pdf))
+
+
+class PDFReader(BasePDFReader):
     """Reader for PDF files"""
 
     def read(self, pdf: Union[str, Path, IO[Any]]) -> List[Document]:
+        return list(self.iter_read(pdf=pdf))
+
+    def iter_read(self, pdf: Union[str, Path, IO[Any]]) -> Iterator[Document]:
         if not pdf:
             raise ValueError("No pdf provided")
 
-        try:
-            from pypdf import PdfReader as DocumentReader  # noqa: F401
-        except ImportError:
-            raise ImportError("`pypdf` not installed")
-
         doc_name = ""
         try:
             if isinstance(pdf, str):
@@ -28,62 +183,33 @@ class PDFReader(Reader):
             doc_name = "pdf"
 
         logger.info(f"Reading: {doc_name}")
-        doc_reader = DocumentReader(pdf)
-
-        documents = [
-            Document(
-                name=doc_name,
-                id=f"{doc_name}_{page_number}",
-                meta_data={"page": page_number},
-                content=page.extract_text(),
-            )
-            for page_number, page in enumerate(doc_reader.pages, start=1)
-        ]
-        if self.chunk:
-            chunked_documents = []
-            for document in documents:
-                chunked_documents.extend(self.chunk_document(document))
-            return chunked_documents
-        return documents
-
-
-class PDFUrlReader(Reader):
+        yield from self.iter_pdf(doc_name=doc_name, pdf=pdf)
+
+
+class PDFUrlReader(BasePDFReader):
     """Reader for PDF files from URL"""
 
     def read(self, url: str) -> List[Document]:
+        return list(self.iter_read(url=url))
+
+    def iter_read(self, url: str) -> Iterator[Document]:
         if not url:
             raise ValueError("No url provided")
 
-        from io import BytesIO
+        from tempfile import NamedTemporaryFile
 
         try:
             import httpx
         except ImportError:
             raise ImportError("`httpx` not installed")
 
-        try:
-            from pypdf import PdfReader as DocumentReader  # noqa: F401
-        except ImportError:
-            raise ImportError("`pypdf` not installed")
-
         logger.info(f"Reading: {url}")
-        response = httpx.get(url)
-
         doc_name = url.split("/")[-1].split(".")[0].replace("/", "_").replace(" ", "_")
-        doc_reader = DocumentReader(BytesIO(response.content))
-
-        documents = [
-            Document(
-                name=doc_name,
-                id=f"{doc_name}_{page_number}",
-                meta_data={"page": page_number},
-                content=page.extract_text(),
-            )
-            for page_number, page in enumerate(doc_reader.pages, start=1)
-        ]
-        if self.chunk:
-            chunked_documents = []
-            for document in documents:
-                chunked_documents.extend(self.chunk_document(document))
-            return chunked_documents
-        return documents
+        # Stream the pdf to a temporary file instead of holding it in memory
+        with NamedTemporaryFile(suffix=".pdf") as temporary_file:
+            with httpx.stream("GET", url) as response:
+                response.raise_for_status()
+                for data in response.iter_bytes():
+                    temporary_file.write(data)
+            temporary_file.flush()
+            yield from self.iter_pdf(doc_name=doc_name, pdf=temporary_file.name)
@@ -1,12 +1,20 @@
-from typing import Optional, Dict, List, Tuple
+import asyncio
+from typing import Any, Optional, Dict, List, Tuple
 
 from pydantic import BaseModel, ConfigDict
 
+from phi.embedder.cache import EmbeddingCache, get_cache_key
+from phi.utils.log import logger
+
 
 class Embedder(BaseModel):
     """Base class for managing embedders"""
 
     dimensions: int = 1536
+    # Maximum number of texts to embed in a single request
+    batch_size: int = 100
+    # Cache for embeddings, consulted before making requests to the embedder
+    cache: Optional[EmbeddingCache] = None
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -15,3 +23,122 @@ class Embedder(BaseModel):
 
     def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
         raise NotImplementedError
+
+    async def aget_embedding(self, text: str) -> List[float]:
+        """Returns the embedding for a text without blocking the event loop.
+        Embedders with an async client should override this, the default calls get_embedding in a thread.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_embedding, text)
+
+    def get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Returns the embeddings for a list of texts, in the same order as the texts"""
+        embeddings, _ = self.get_embeddings_batch_and_usage(texts)
+        return embeddings
+
+    def get_embeddings_batch_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        """Returns the embeddings and usage for a list of texts, in the same order as the texts.
+
+        If a cache is provided, only texts without a cached embedding are sent to the embedder,
+        in batches of `batch_size`.
+        """
+        if self.cache is None:
+            return self._embed_in_batches(texts)
+
+        keys = [self.get_cache_key(text) for text in texts]
+        cached = self.cache.get_many(list(set(keys)))
+
+        # Embed each text missing from the cache only once
+        texts_to_embed: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in texts_to_embed:
+                texts_to_embed[key] = text
+        logger.debug(f"Embedding cache hits: {len(texts) - len(texts_to_embed)}/{len(texts)}")
+
+        embedded_usage: Dict[str, Optional[Dict]] = {}
+        if len(texts_to_embed) > 0:
+            new_embeddings, new_usage = self._embed_in_batches(list(texts_to_embed.values()))
+            embedded: Dict[str, List[float]] = {}
+            for key, _embedding, _usage in zip(texts_to_embed.keys(), new_embeddings, new_usage):
+                embedded_usage[key] = _usage
+                # Do not cache failed embeddings
+                if _embedding:
+                    embedded[key] = _embedding
+            self.cache.set_many(embedded)
+            cached.update(embedded)
+
+        embeddings: List[List[float]] = []
+        usage: List[Optional[Dict]] = []
+        for key in keys:
+            embeddings.append(cached.get(key, []))
+            # Usage is only reported the first time a text is embedded
+            usage.append(embedded_usage.pop(key, None))
+        return embeddings, usage
+
+    async def aget_embeddings_batch_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        """Returns the embeddings and usage for a list of texts without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_embeddings_batch_and_usage, texts)
+
+    def get_cache_key(self, text: str) -> str:
+        model = getattr(self, "model", self.__class__.__name__)
+        return get_cache_key(model=model, dimensions=self.dimensions, text=text)
+
+    def _embed_in_batches(self, texts: List[str]) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        embeddings: List[List[float]] = []
+        usage: List[Optional[Dict]] = []
+        _batch_size = max(self.batch_size, 1)
+        for i in range(0, len(texts), _batch_size):
+            batch_embeddings, batch_usage = self._embed_batch(texts[i : i + _batch_size])
+            embeddings.extend(batch_embeddings)
+            usage.extend(batch_usage)
+        return embeddings, usage
+
+    @staticmethod
+    def split_batch_usage(usage: Dict[str, Any], texts: List[str]) -> List[Optional[Dict]]:
+        """Splits the usage of a request embedding multiple texts between the texts.
+
+        APIs only report the usage of the whole request, so token counts are estimated in proportion to the length
+        of the texts, adding up to the usage of the request. Each usage has `estimated` set if split, `batch_size` set
+        to the number of texts in the request and the counts reported for the request as `batch_<key>`.
+        """
+        weights = [len(text) for text in texts]
+        if sum(weights) == 0:
+            weights = [1] * len(texts)
+        total_weight = sum(weights)
+
+        split_usage: List[Dict[str, Any]] = [{} for _ in texts]
+        for key, value in usage.items():
+            if not isinstance(value, int) or isinstance(value, bool):
+                for _usage in split_usage:
+                    _usage[key] = value
+                continue
+            # Largest remainder split, so the parts add up to the value
+            shares = [value * weight / total_weight for weight in weights]
+            parts = [int(share) for share in shares]
+            by_remainder = sorted(range(len(texts)), key=lambda i: shares[i] - parts[i], reverse=True)
+            for i in by_remainder[: value - sum(parts)]:
+                parts[i] += 1
+            for _usage, part in zip(split_usage, parts):
+                _usage[key] = part
+        batch_usage = {f"batch_{key}": value for key, value in usage.items()}
+        for _usage in split_usage:
+            # The usage of a single text is the usage of the request
+            _usage["estimated"] = len(texts) > 1
+            _usage["batch_size"] = len(texts)
+            _usage.update(batch_usage)
+        return list(split_usage)
+
+    def _embed_batch(self, texts: List[str]) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        """Embeds a single batch of texts.
+
+        Embedders that support multiple inputs per request should override this method.
+        The default implementation makes one request per text.
+        """
+        embeddings: List[List[float]] = []
+        usage: List[Optional[Dict]] = []
+        for text in texts:
+            _embedding, _usage = self.get_embedding_and_usage(text)
+            embeddings.append(_embedding)
+            usage.append(_usage)
+        return embeddings, usage
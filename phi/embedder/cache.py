@@ -0,0 +1,145 @@
+import sqlite3
+from array import array
+from collections import OrderedDict
+from hashlib import md5
+from pathlib import Path
+from threading import Lock
+from typing import Optional, Dict, List, Union
+
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+
+from phi.utils.log import logger
+
+
+def get_cache_key(model: str, dimensions: int, text: str) -> str:
+    """Returns the cache key for the embedding of a text by a model"""
+    return f"{model}:{dimensions}:{md5(text.encode()).hexdigest()}"
+
+
+class EmbeddingCache(BaseModel):
+    """Base class for caching embeddings, keyed by model name, dimensions and content hash"""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def get(self, key: str) -> Optional[List[float]]:
+        raise NotImplementedError
+
+    def set(self, key: str, embedding: List[float]) -> None:
+        raise NotImplementedError
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Returns the cached embeddings for the keys that exist in the cache"""
+        cached: Dict[str, List[float]] = {}
+        for key in keys:
+            embedding = self.get(key)
+            if embedding is not None:
+                cached[key] = embedding
+        return cached
+
+    def set_many(self, embeddings: Dict[str, List[float]]) -> None:
+        for key, embedding in embeddings.items():
+            self.set(key, embedding)
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class InMemoryEmbeddingCache(EmbeddingCache):
+    """Least recently used embedding cache held in memory"""
+
+    # Maximum number of embeddings to keep in the cache
+    max_size: int = 10000
+
+    _cache: "OrderedDict[str, List[float]]" = PrivateAttr(default_factory=OrderedDict)
+    _lock: Lock = PrivateAttr(default_factory=Lock)
+
+    def get(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            embedding = self._cache.get(key)
+            if embedding is not None:
+                self._cache.move_to_end(key)
+            return embedding
+
+    def set(self, key: str, embedding: List[float]) -> None:
+        with self._lock:
+            self._cache[key] = embedding
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+class SqliteEmbeddingCache(EmbeddingCache):
+    """Embedding cache persisted to a sqlite database file, optionally fronted by an in-memory LRU cache"""
+
+    db_file: Union[str, Path] = "storage/embeddings.db"
+    table_name: str = "embedding_cache"
+    # Keep recently used embeddings in memory as well
+    memory_cache: Optional[InMemoryEmbeddingCache] = None
+
+    _connection: Optional[sqlite3.Connection] = PrivateAttr(default=None)
+    _lock: Lock = PrivateAttr(default_factory=Lock)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            db_path = Path(self.db_file)
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            logger.debug(f"Opening embedding cache: {db_path}")
+            self._connection = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table_name} (key TEXT PRIMARY KEY, embedding BLOB NOT NULL)"
+            )
+            self._connection.commit()
+        return self._connection
+
+    def get(self, key: str) -> Optional[List[float]]:
+        return self.get_many([key]).get(key)
+
+    def set(self, key: str, embedding: List[float]) -> None:
+        self.set_many({key: embedding})
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        cached: Dict[str, List[float]] = {}
+        if self.memory_cache is not None:
+            cached = self.memory_cache.get_many(keys)
+
+        keys_to_fetch = [key for key in keys if key not in cached]
+        # sqlite limits the number of variables in a single statement
+        for i in range(0, len(keys_to_fetch), 500):
+            batch = keys_to_fetch[i : i + 500]
+            placeholders = ", ".join("?" for _ in batch)
+            with self._lock:
+                rows = self.connection.execute(
+                    f"SELECT key, embedding FROM {self.table_name} WHERE key IN ({placeholders})", batch
+                ).fetchall()
+            for key, blob in rows:
+                embedding = array("d")
+                embedding.frombytes(blob)
+                cached[key] = embedding.tolist()
+                if self.memory_cache is not None:
+                    self.memory_cache.set(key, cached[key])
+        return cached
+
+    def set_many(self, embeddings: Dict[str, List[float]]) -> None:
+        if len(embeddings) == 0:
+            return
+
+        if self.memory_cache is not None:
+            self.memory_cache.set_many(embeddings)
+        rows = [(key, array("d", embedding).tobytes()) for key, embedding in embeddings.items()]
+        with self._lock:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO {self.table_name} (key, embedding) VALUES (?, ?)", rows
+            )
+            self.connection.commit()
+
+    def clear(self) -> None:
+        if self.memory_cache is not None:
+            self.memory_cache.clear()
+        with self._lock:
+            self.connection.execute(f"DELETE FROM {self.table_name}")
+            self.connection.commit()
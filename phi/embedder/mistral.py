@@ -1,6 +1,7 @@
-from typing import Optional, Dict, List, Tuple, Any
+from typing import Optional, Dict, List, Tuple, Any, Union
 
 from phi.embedder.base import Embedder
+from phi.utils.http import get_client
 from phi.utils.log import logger
 
 try:
@@ -40,9 +41,9 @@ class MistralEmbedder(Embedder):
             _client_params["timeout"] = self.timeout
         if self.client_params:
             _client_params.update(self.client_params)
-        return MistralClient(**_client_params)
+        return get_client("mistral", MistralClient, **_client_params)
 
-    def _response(self, text: str) -> EmbeddingResponse:
+    def _response(self, text: Union[str, List[str]]) -> EmbeddingResponse:
         _request_params: Dict[str, Any] = {
             "input": text,
             "model": self.model,
@@ -65,3 +66,16 @@ class MistralEmbedder(Embedder):
         embedding = response.data[0].embedding
         usage = response.usage
         return embedding, usage.model_dump()
+
+    def _embed_batch(self, texts: List[str]) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        response: EmbeddingResponse = self._response(text=texts)
+
+        embeddings = [data.embedding for data in sorted(response.data, key=lambda d: d.index)]
+        if response.usage is None:
+            return embeddings, [None] * len(embeddings)
+        # The API only reports usage for the whole request
+        usage = response.usage.model_dump()
+        if len(embeddings) == 1:
+            return embeddings, [usage]
+        logger.debug(f"Embedded {len(texts)} texts | Usage: {usage}")
+        return embeddings, self.split_batch_usage(usage, texts)
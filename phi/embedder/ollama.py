@@ -1,6 +1,7 @@
 from typing import Optional, Dict, List, Tuple, Any
 
 from phi.embedder.base import Embedder
+from phi.utils.http import get_client
 from phi.utils.log import logger
 
 try:
@@ -31,7 +32,7 @@ class OllamaEmbedder(Embedder):
             _ollama_params["timeout"] = self.timeout
         if self.client_kwargs:
             _ollama_params.update(self.client_kwargs)
-        return OllamaClient(**_ollama_params)
+        return get_client("ollama", OllamaClient, **_ollama_params)
 
     def _response(self, text: str) -> Dict[str, Any]:
         kwargs: Dict[str, Any] = {}
@@ -60,3 +61,24 @@ class OllamaEmbedder(Embedder):
         except Exception as e:
             logger.warning(e)
         return embedding, usage
+
+    def _embed_batch(self, texts: List[str]) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        client = self.client
+        # Older versions of the ollama client only support one prompt per request
+        if not hasattr(client, "embed"):
+            return super()._embed_batch(texts)
+
+        kwargs: Dict[str, Any] = {}
+        if self.options is not None:
+            kwargs["options"] = self.options
+
+        embeddings: List[List[float]] = []
+        try:
+            response = client.embed(input=texts, model=self.model, **kwargs)  # type: ignore
+            if response is not None:
+                embeddings = response.get("embeddings", [])
+        except Exception as e:
+            logger.warning(e)
+        if len(embeddings) != len(texts):
+            embeddings = [[] for _ in texts]
+        return embeddings, [None] * len(texts)
@@ -1,11 +1,12 @@
-from typing import Optional, Dict, List, Tuple, Any
+from typing import Optional, Dict, List, Tuple, Any, Union
 from typing_extensions import Literal
 
 from phi.embedder.base import Embedder
+from phi.utils.http import get_client, get_async_client, with_http_client, with_async_http_client
 from phi.utils.log import logger
 
 try:
-    from openai import OpenAI as OpenAIClient
+    from openai import OpenAI as OpenAIClient, AsyncOpenAI as AsyncOpenAIClient
     from openai.types.create_embedding_response import CreateEmbeddingResponse
 except ImportError:
     raise ImportError("`openai` not installed")
@@ -22,12 +23,9 @@ class OpenAIEmbedder(Embedder):
     request_params: Optional[Dict[str, Any]] = None
     client_params: Optional[Dict[str, Any]] = None
     openai_client: Optional[OpenAIClient] = None
+    async_openai_client: Optional[AsyncOpenAIClient] = None
 
-    @property
-    def client(self) -> OpenAIClient:
-        if self.openai_client:
-            return self.openai_client
-
+    def get_client_params(self) -> Dict[str, Any]:
         _client_params: Dict[str, Any] = {}
         if self.api_key:
             _client_params["api_key"] = self.api_key
@@ -37,9 +35,21 @@ class OpenAIEmbedder(Embedder):
             _client_params["base_url"] = self.base_url
         if self.client_params:
             _client_params.update(self.client_params)
-        return OpenAIClient(**_client_params)
+        return _client_params
+
+    @property
+    def client(self) -> OpenAIClient:
+        if self.openai_client:
+            return self.openai_client
+        return get_client("openai", with_http_client(OpenAIClient), **self.get_client_params())
+
+    @property
+    def async_client(self) -> AsyncOpenAIClient:
+        if self.async_openai_client:
+            return self.async_openai_client
+        return get_async_client("openai", with_async_http_client(AsyncOpenAIClient), **self.get_client_params())
 
-    def _response(self, text: str) -> CreateEmbeddingResponse:
+    def get_request_params(self, text: Union[str, List[str]]) -> Dict[str, Any]:
         _request_params: Dict[str, Any] = {
             "input": text,
             "model": self.model,
@@ -51,7 +61,13 @@ class OpenAIEmbedder(Embedder):
             _request_params["dimensions"] = self.dimensions
         if self.request_params:
             _request_params.update(self.request_params)
-        return self.client.embeddings.create(**_request_params)
+        return _request_params
+
+    def _response(self, text: Union[str, List[str]]) -> CreateEmbeddingResponse:
+        return self.client.embeddings.create(**self.get_request_params(text))
+
+    async def _aresponse(self, text: Union[str, List[str]]) -> CreateEmbeddingResponse:
+        return await self.async_client.embeddings.create(**self.get_request_params(text))
 
     def get_embedding(self, text: str) -> List[float]:
         response: CreateEmbeddingResponse = self._response(text=text)
@@ -61,9 +77,30 @@ class OpenAIEmbedder(Embedder):
             logger.warning(e)
             return []
 
+    async def aget_embedding(self, text: str) -> List[float]:
+        response: CreateEmbeddingResponse = await self._aresponse(text=text)
+        try:
+            return response.data[0].embedding
+        except Exception as e:
+            logger.warning(e)
+            return []
+
     def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
         response: CreateEmbeddingResponse = self._response(text=text)
 
         embedding = response.data[0].embedding
         usage = response.usage
         return embedding, usage.model_dump()
+
+    def _embed_batch(self, texts: List[str]) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        response: CreateEmbeddingResponse = self._response(text=texts)
+
+        embeddings = [data.embedding for data in sorted(response.data, key=lambda d: d.index)]
+        if response.usage is None:
+            return embeddings, [None] * len(embeddings)
+        # The API only reports usage for the whole request
+        usage = response.usage.model_dump()
+        if len(embeddings) == 1:
+            return embeddings, [usage]
+        logger.debug(f"Embedded {len(texts)} texts | Usage: {usage}")
+        return embeddings, self.split_batch_usage(usage, texts)
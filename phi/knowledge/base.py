@@ -1,10 +1,13 @@
-from typing import List, Optional, Iterator, Dict, Any
+from pathlib import Path
+from typing import List, Optional, Iterator, Dict, Any, Set
 
 from pydantic import BaseModel, ConfigDict
 
 from phi.document import Document
 from phi.document.reader.base import Reader
+from phi.knowledge.manifest import KnowledgeManifest
 from phi.vectordb import VectorDb
+from phi.vectordb.bm25 import BM25Index
 from phi.utils.log import logger
 
 
@@ -19,6 +22,21 @@ class AssistantKnowledge(BaseModel):
     num_documents: int = 5
     # Number of documents to optimize the vector db on
     optimize_on: Optional[int] = 1000
+    # Manifest of the source files, if provided only new or changed files are read on load
+    # and the documents of modified or removed files are deleted from the vector db
+    manifest: Optional[KnowledgeManifest] = None
+    # Maximum number of documents in each list yielded when streaming documents from large sources
+    batch_size: int = 100
+    # Filters applied to every search, e.g. {"tenant": "acme"}. Keys match meta_data fields, values can be
+    # a value to match, a list of values to match any of, or a phi.vectordb.filters.Range.
+    filters: Optional[Dict[str, Any]] = None
+    # Combine keyword and vector search results using reciprocal rank fusion
+    hybrid_search: bool = False
+    # Constant of reciprocal rank fusion, higher values reduce the weight of the top ranked results
+    rrf_k: int = 60
+    # In-process keyword index used for hybrid search when the vector db does not support keyword search.
+    # Filled with the documents read on load, so it only covers documents loaded by the current process.
+    keyword_index: Optional[BM25Index] = None
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -29,6 +47,28 @@ class AssistantKnowledge(BaseModel):
         """
         raise NotImplementedError
 
+    @property
+    def source_files(self) -> Iterator[Path]:
+        """Iterator that yields the source files of the knowledge base.
+        Knowledge bases backed by files implement this to support incremental loading using a manifest.
+        """
+        raise NotImplementedError
+
+    def read_file(self, path: Path) -> List[Document]:
+        """Read the documents from a source file"""
+        raise NotImplementedError
+
+    def batch_documents(self, documents: Iterator[Document]) -> Iterator[List[Document]]:
+        """Group a stream of documents into lists of at most `batch_size` documents"""
+        batch: List[Document] = []
+        for document in documents:
+            batch.append(document)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if len(batch) > 0:
+            yield batch
+
     def search(self, query: str, num_documents: Optional[int] = None) -> List[Document]:
         """Returns relevant documents matching the query"""
         try:
@@ -38,18 +78,124 @@ class AssistantKnowledge(BaseModel):
 
             _num_documents = num_documents or self.num_documents
             logger.debug(f"Getting {_num_documents} relevant documents for query: {query}")
-            return self.vector_db.search(query=query, limit=_num_documents)
+            if self.hybrid_search:
+                return self._hybrid_search(query=query, num_documents=_num_documents)
+            return self._vector_search(query=query, num_documents=_num_documents)
         except Exception as e:
             logger.error(f"Error searching for documents: {e}")
             return []
 
-    def load(self, recreate: bool = False, upsert: bool = False, skip_existing: bool = True) -> None:
+    async def asearch(self, query: str, num_documents: Optional[int] = None) -> List[Document]:
+        """Returns relevant documents matching the query without blocking the event loop"""
+        try:
+            if self.vector_db is None:
+                logger.warning("No vector db provided")
+                return []
+
+            _num_documents = num_documents or self.num_documents
+            logger.debug(f"Getting {_num_documents} relevant documents for query: {query}")
+            if self.hybrid_search:
+                return await self._ahybrid_search(query=query, num_documents=_num_documents)
+            return await self._avector_search(query=query, num_documents=_num_documents)
+        except Exception as e:
+            logger.error(f"Error searching for documents: {e}")
+            return []
+
+    def keyword_search(self, query: str, num_documents: Optional[int] = None) -> List[Document]:
+        """Returns documents matching the keywords of the query, using the vector db if it supports keyword search"""
+        if self.vector_db is None:
+            logger.warning("No vector db provided")
+            return []
+
+        _num_documents = num_documents or self.num_documents
+        if self.vector_db.keyword_search_available():
+            return self.vector_db.keyword_search(query=query, limit=_num_documents, filters=self.filters)
+        if self.keyword_index is None or len(self.keyword_index) == 0:
+            logger.debug("Keyword index is empty, load the knowledge base to build it")
+            return []
+        return self.keyword_index.search(query=query, limit=_num_documents, filters=self.filters)
+
+    def _vector_search(self, query: str, num_documents: int) -> List[Document]:
+        if self.vector_db is None:
+            return []
+        return self.vector_db.search(query=query, limit=num_documents, filters=self.filters)
+
+    def _hybrid_search(self, query: str, num_documents: int) -> List[Document]:
+        if self.vector_db is None:
+            return []
+
+        # Get more candidates than requested from each search, so documents ranked well by both reach the top
+        num_candidates = 2 * num_documents
+        vector_results = self._vector_search(query=query, num_documents=num_candidates)
+        keyword_results = self.keyword_search(query=query, num_documents=num_candidates)
+        logger.debug(f"Fusing {len(vector_results)} vector and {len(keyword_results)} keyword results")
+        return self.reciprocal_rank_fusion([vector_results, keyword_results], limit=num_documents)
+
+    async def _avector_search(self, query: str, num_documents: int) -> List[Document]:
+        if self.vector_db is None:
+            return []
+        return await self.vector_db.asearch(query=query, limit=num_documents, filters=self.filters)
+
+    async def _ahybrid_search(self, query: str, num_documents: int) -> List[Document]:
+        import asyncio
+
+        if self.vector_db is None:
+            return []
+
+        # Run the vector search and the keyword search concurrently
+        num_candidates = 2 * num_documents
+        loop = asyncio.get_running_loop()
+        vector_results, keyword_results = await asyncio.gather(
+            self._avector_search(query=query, num_documents=num_candidates),
+            loop.run_in_executor(None, self.keyword_search, query, num_candidates),
+        )
+        logger.debug(f"Fusing {len(vector_results)} vector and {len(keyword_results)} keyword results")
+        return self.reciprocal_rank_fusion([vector_results, keyword_results], limit=num_documents)
+
+    def reciprocal_rank_fusion(self, result_lists: List[List[Document]], limit: int) -> List[Document]:
+        """Merge ranked lists of documents, scoring each document by the sum of 1 / (rrf_k + rank) over the lists"""
+        scores: Dict[str, float] = {}
+        documents: Dict[str, Document] = {}
+        for results in result_lists:
+            for rank, document in enumerate(results, start=1):
+                content_hash = VectorDb.get_content_hash(document)
+                scores[content_hash] = scores.get(content_hash, 0.0) + 1.0 / (self.rrf_k + rank)
+                # Prefer the document from the first list, which includes the embedding
+                documents.setdefault(content_hash, document)
+
+        top_hashes = sorted(scores, key=lambda content_hash: scores[content_hash], reverse=True)[:limit]
+        return [documents[content_hash] for content_hash in top_hashes]
+
+    def _init_keyword_index(self, recreate: bool = False) -> None:
+        """Create the in-process keyword index if hybrid search needs it.
+        Called before loading so worker threads share a single index.
+        """
+        if not self.hybrid_search or self.vector_db is None or self.vector_db.keyword_search_available():
+            return
+        if self.keyword_index is None:
+            self.keyword_index = BM25Index()
+        elif recreate:
+            self.keyword_index.clear()
+
+    def _index_keywords(self, documents: List[Document]) -> None:
+        if self.keyword_index is not None and self.hybrid_search:
+            self.keyword_index.add(documents)
+
+    def load(
+        self,
+        recreate: bool = False,
+        upsert: bool = False,
+        skip_existing: bool = True,
+        concurrency: Optional[int] = None,
+    ) -> None:
         """Load the knowledge base to the vector db
 
         Args:
             recreate (bool): If True, recreates the collection in the vector db. Defaults to False.
             upsert (bool): If True, upserts documents to the vector db. Defaults to False.
             skip_existing (bool): If True, skips documents which already exist in the vector db when inserting. Defaults to True.
+            concurrency (Optional[int]): If greater than 1, document lists are embedded and written to the vector db
+                by this many worker threads while the next document lists are being read. Defaults to None.
         """
 
         if self.vector_db is None:
@@ -62,29 +208,237 @@ class AssistantKnowledge(BaseModel):
 
         logger.info("Creating collection")
         self.vector_db.create()
+        self._init_keyword_index(recreate=recreate)
 
         logger.info("Loading knowledge base")
         num_documents = 0
-        for document_list in self.document_lists:
-            documents_to_load = document_list
-            # Upsert documents if upsert is True and vector db supports upsert
-            if upsert and self.vector_db.upsert_available():
-                self.vector_db.upsert(documents=documents_to_load)
-            # Insert documents
-            else:
-                # Filter out documents which already exist in the vector db
-                if skip_existing:
-                    documents_to_load = [
-                        document for document in document_list if not self.vector_db.doc_exists(document)
-                    ]
-                self.vector_db.insert(documents=documents_to_load)
-            num_documents += len(documents_to_load)
-            logger.info(f"Added {len(documents_to_load)} documents to knowledge base")
+        stale_hashes: Set[str] = set()
+        document_lists = self._get_document_lists(recreate=recreate, stale_hashes=stale_hashes)
+        if concurrency is not None and concurrency > 1:
+            num_documents = self._load_concurrently(
+                document_lists=document_lists, upsert=upsert, skip_existing=skip_existing, concurrency=concurrency
+            )
+        else:
+            for document_list in document_lists:
+                num_documents += self._load_document_list(
+                    document_list=document_list, upsert=upsert, skip_existing=skip_existing
+                )
+        self._update_manifest(stale_hashes=stale_hashes)
 
         if self.optimize_on is not None and num_documents > self.optimize_on:
             logger.info("Optimizing Vector DB")
             self.vector_db.optimize()
 
+    async def aload(
+        self,
+        recreate: bool = False,
+        upsert: bool = False,
+        skip_existing: bool = True,
+        concurrency: int = 4,
+    ) -> None:
+        """Load the knowledge base to the vector db without blocking the event loop.
+
+        Reading runs as one stage and writing runs as `concurrency` workers, connected by a bounded queue
+        so that at most `2 * concurrency` document lists are held in memory at once.
+
+        Args:
+            recreate (bool): If True, recreates the collection in the vector db. Defaults to False.
+            upsert (bool): If True, upserts documents to the vector db. Defaults to False.
+            skip_existing (bool): If True, skips documents which already exist in the vector db when inserting. Defaults to True.
+            concurrency (int): Number of document lists to embed and write to the vector db at once. Defaults to 4.
+        """
+        import asyncio
+
+        if self.vector_db is None:
+            logger.warning("No vector db provided")
+            return
+
+        vector_db = self.vector_db
+        loop = asyncio.get_running_loop()
+        if recreate:
+            logger.info("Deleting collection")
+            await loop.run_in_executor(None, vector_db.delete)
+
+        logger.info("Creating collection")
+        await loop.run_in_executor(None, vector_db.create)
+        self._init_keyword_index(recreate=recreate)
+
+        logger.info("Loading knowledge base")
+        _concurrency = max(concurrency, 1)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2 * _concurrency)
+        num_documents = 0
+        stale_hashes: Set[str] = set()
+
+        async def read() -> None:
+            document_lists = iter(self._get_document_lists(recreate=recreate, stale_hashes=stale_hashes))
+            while True:
+                document_list = await loop.run_in_executor(None, next, document_lists, None)
+                if document_list is None:
+                    break
+                await queue.put(document_list)
+            # Signal the writers to stop. If reading fails the writers are cancelled instead, as they may be gone
+            # and a put on the full queue would never return.
+            for _ in range(_concurrency):
+                await queue.put(None)
+
+        async def write() -> None:
+            nonlocal num_documents
+            while True:
+                document_list = await queue.get()
+                if document_list is None:
+                    break
+                num_documents += await loop.run_in_executor(
+                    None, self._load_document_list, document_list, upsert, skip_existing
+                )
+
+        tasks = [asyncio.ensure_future(read())] + [asyncio.ensure_future(write()) for _ in range(_concurrency)]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            # Wait for the cancelled tasks to finish, so no task is left pending
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        await loop.run_in_executor(None, self._update_manifest, stale_hashes)
+
+        if self.optimize_on is not None and num_documents > self.optimize_on:
+            logger.info("Optimizing Vector DB")
+            await loop.run_in_executor(None, vector_db.optimize)
+
+    def _load_concurrently(
+        self, document_lists: Iterator[List[Document]], upsert: bool, skip_existing: bool, concurrency: int
+    ) -> int:
+        """Read document lists on the calling thread and load them to the vector db using a pool of worker threads.
+        At most `2 * concurrency` document lists are held in memory at once.
+        """
+        from concurrent.futures import ThreadPoolExecutor, Future
+        from threading import BoundedSemaphore
+
+        num_documents = 0
+        in_flight = BoundedSemaphore(2 * concurrency)
+        pending: Set[Future] = set()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="knowledge-load") as executor:
+            for document_list in document_lists:
+                # Wait for a slot before reading the next document list
+                in_flight.acquire()
+                future = executor.submit(
+                    self._load_document_list, document_list=document_list, upsert=upsert, skip_existing=skip_existing
+                )
+                future.add_done_callback(lambda _: in_flight.release())
+                pending.add(future)
+
+                # Collect finished workers, raising their errors as soon as they are noticed
+                done = {f for f in pending if f.done()}
+                for f in done:
+                    num_documents += f.result()
+                pending -= done
+
+            for f in pending:
+                num_documents += f.result()
+        return num_documents
+
+    def _supports_manifest(self) -> bool:
+        if self.manifest is None:
+            return False
+        try:
+            self.source_files
+            return True
+        except NotImplementedError:
+            return False
+
+    def _get_document_lists(self, recreate: bool, stale_hashes: Set[str]) -> Iterator[List[Document]]:
+        """Returns the document lists to load.
+        If a manifest is used, only document lists from new or changed files are returned
+        and the content hashes of documents that should be removed are added to `stale_hashes`.
+        """
+        if self.manifest is None:
+            return self.document_lists
+        if not self._supports_manifest():
+            logger.warning(f"{self.__class__.__name__} does not support a manifest, loading all documents")
+            return self.document_lists
+        return self._get_changed_document_lists(manifest=self.manifest, recreate=recreate, stale_hashes=stale_hashes)
+
+    def _get_changed_document_lists(
+        self, manifest: KnowledgeManifest, recreate: bool, stale_hashes: Set[str]
+    ) -> Iterator[List[Document]]:
+        if recreate:
+            manifest.clear()
+        else:
+            manifest.read()
+
+        seen_files: Set[str] = set()
+        for file in self.source_files:
+            file_key = str(file)
+            seen_files.add(file_key)
+            entry = manifest.get_changed_entry(file)
+            if entry is None:
+                logger.debug(f"Skipping unchanged file: {file}")
+                continue
+
+            document_list = self.read_file(file)
+            entry.document_hashes = sorted({VectorDb.get_content_hash(document) for document in document_list})
+            previous_entry = manifest.entries.get(file_key)
+            if previous_entry is not None:
+                stale_hashes.update(set(previous_entry.document_hashes) - set(entry.document_hashes))
+            manifest.entries[file_key] = entry
+            yield document_list
+
+        for file_key in list(manifest.entries.keys()):
+            if file_key not in seen_files:
+                logger.debug(f"Removing deleted file: {file_key}")
+                stale_hashes.update(manifest.entries.pop(file_key).document_hashes)
+
+    def _update_manifest(self, stale_hashes: Set[str]) -> None:
+        """Delete documents of modified or removed files and save the manifest"""
+
+        if self.manifest is None or self.vector_db is None or not self._supports_manifest():
+            return
+
+        # Keep documents which are still part of another file
+        for entry in self.manifest.entries.values():
+            stale_hashes.difference_update(entry.document_hashes)
+        if len(stale_hashes) > 0:
+            logger.info(f"Deleting {len(stale_hashes)} documents from modified or removed files")
+            try:
+                self.vector_db.delete_documents(content_hashes=list(stale_hashes))
+            except NotImplementedError:
+                logger.warning(f"{self.vector_db.__class__.__name__} does not support deleting documents")
+            if self.keyword_index is not None:
+                self.keyword_index.remove(list(stale_hashes))
+        self.manifest.write()
+
+    def _load_document_list(self, document_list: List[Document], upsert: bool, skip_existing: bool) -> int:
+        """Load a list of documents to the vector db and return the number of documents loaded"""
+
+        if self.vector_db is None:
+            return 0
+
+        # Index all documents, including the ones already in the vector db, as the keyword index is not persisted
+        self._index_keywords(document_list)
+
+        documents_to_load = document_list
+        # Upsert documents if upsert is True and vector db supports upsert
+        if upsert and self.vector_db.upsert_available():
+            self.vector_db.upsert(documents=documents_to_load)
+        # Insert documents
+        else:
+            # Filter out documents which already exist in the vector db
+            if skip_existing:
+                documents_to_load = self._filter_existing(document_list)
+            self.vector_db.insert(documents=documents_to_load)
+        logger.info(f"Added {len(documents_to_load)} documents to knowledge base")
+        return len(documents_to_load)
+
+    def _filter_existing(self, documents: List[Document]) -> List[Document]:
+        """Returns the documents which do not exist in the vector db, checked using a single bulk query"""
+
+        if self.vector_db is None or len(documents) == 0:
+            return documents
+
+        existing = self.vector_db.docs_exist(documents)
+        return [document for document in documents if self.vector_db.get_content_hash(document) not in existing]
+
     def load_documents(self, documents: List[Document], upsert: bool = False, skip_existing: bool = True) -> None:
         """Load documents to the knowledge base
 
@@ -101,6 +455,8 @@ class AssistantKnowledge(BaseModel):
 
         logger.debug("Creating collection")
         self.vector_db.create()
+        self._init_keyword_index()
+        self._index_keywords(documents)
 
         # Upsert documents if upsert is True
         if upsert and self.vector_db.upsert_available():
@@ -109,11 +465,7 @@ class AssistantKnowledge(BaseModel):
             return
 
         # Filter out documents which already exist in the vector db
-        documents_to_load = (
-            [document for document in documents if not self.vector_db.doc_exists(document)]
-            if skip_existing
-            else documents
-        )
+        documents_to_load = self._filter_existing(documents) if skip_existing else documents
 
         # Insert documents
         if len(documents_to_load) > 0:
@@ -175,4 +527,6 @@ class AssistantKnowledge(BaseModel):
             logger.warning("No vector db available")
             return True
 
+        if self.keyword_index is not None:
+            self.keyword_index.clear()
         return self.vector_db.clear()
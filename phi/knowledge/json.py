@@ -19,10 +19,19 @@ class JSONKnowledgeBase(AssistantKnowledge):
             Iterator[List[Document]]: Iterator yielding list of documents
         """
 
+        for _json in self.source_files:
+            yield self.read_file(_json)
+
+    @property
+    def source_files(self) -> Iterator[Path]:
+        """Iterate over the Json files in the path"""
+
         _json_path: Path = Path(self.path) if isinstance(self.path, str) else self.path
 
         if _json_path.exists() and _json_path.is_dir():
-            for _pdf in _json_path.glob("*.json"):
-                yield self.reader.read(path=_pdf)
+            yield from _json_path.glob("*.json")
         elif _json_path.exists() and _json_path.is_file() and _json_path.suffix == ".json":
-            yield self.reader.read(path=_json_path)
+            yield _json_path
+
+    def read_file(self, path: Path) -> List[Document]:
+        return self.reader.read(path=path)
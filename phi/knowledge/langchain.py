@@ -50,7 +50,14 @@ class LangChainKnowledgeBase(AssistantKnowledge):
             )
         return documents
 
-    def load(self, recreate: bool = False, upsert: bool = True, skip_existing: bool = True) -> None:
+    def load(
+        self,
+        recreate: bool = False,
+        upsert: bool = True,
+        skip_existing: bool = True,
+        concurrency: Optional[int] = None,
+    ) -> None:
+        """Run the loader, which loads the documents to the vectorstore. The arguments are not used."""
         if self.loader is None:
             logger.error("No loader provided for LangChainKnowledgeBase")
             return
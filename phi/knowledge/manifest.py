@@ -0,0 +1,69 @@
+from hashlib import md5
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from pydantic import BaseModel
+
+from phi.utils.json_io import read_json_file, write_json_file
+from phi.utils.log import logger
+
+
+class ManifestEntry(BaseModel):
+    """Fingerprint of a source file and the documents loaded from it"""
+
+    size: int
+    mtime: float
+    content_hash: str
+    # Content hashes of the documents read from the file
+    document_hashes: List[str] = []
+
+
+class KnowledgeManifest(BaseModel):
+    """Manifest of the source files loaded to a knowledge base, stored as a json file.
+
+    Used to only re-read files which changed since the last load and to remove the documents
+    of files which were modified or deleted.
+    """
+
+    path: Union[str, Path] = "storage/knowledge_manifest.json"
+    entries: Dict[str, ManifestEntry] = {}
+
+    @property
+    def manifest_path(self) -> Path:
+        return Path(self.path) if isinstance(self.path, str) else self.path
+
+    def read(self) -> None:
+        data = read_json_file(self.manifest_path)
+        self.entries = {}
+        if isinstance(data, dict):
+            self.entries = {k: ManifestEntry.model_validate(v) for k, v in data.get("entries", {}).items()}
+        logger.debug(f"Read manifest with {len(self.entries)} files")
+
+    def write(self) -> None:
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        write_json_file(self.manifest_path, {"entries": {k: v.model_dump() for k, v in self.entries.items()}})
+
+    def clear(self) -> None:
+        self.entries = {}
+
+    @staticmethod
+    def get_file_hash(file: Path) -> str:
+        file_hash = md5()
+        with file.open("rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                file_hash.update(block)
+        return file_hash.hexdigest()
+
+    def get_changed_entry(self, file: Path) -> Optional[ManifestEntry]:
+        """Returns a new entry for the file if it changed since it was added to the manifest, None otherwise"""
+        stat = file.stat()
+        entry = self.entries.get(str(file))
+        if entry is not None and entry.size == stat.st_size and entry.mtime == stat.st_mtime:
+            return None
+
+        content_hash = self.get_file_hash(file)
+        if entry is not None and entry.content_hash == content_hash:
+            # Contents are unchanged, only record the new modification time
+            entry.mtime = stat.st_mtime
+            return None
+        return ManifestEntry(size=stat.st_size, mtime=stat.st_mtime, content_hash=content_hash)
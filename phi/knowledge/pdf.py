@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Union, List, Iterator
+from typing import Union, List, Iterator, Optional, Set
 
 from phi.document import Document
 from phi.document.reader.pdf import PDFReader, PDFUrlReader
@@ -9,23 +9,60 @@ from phi.knowledge.base import AssistantKnowledge
 class PDFKnowledgeBase(AssistantKnowledge):
     path: Union[str, Path]
     reader: PDFReader = PDFReader()
+    # Number of processes used to read PDFs in parallel. PDFs are read in the current process if None or 1.
+    num_workers: Optional[int] = None
 
     @property
     def document_lists(self) -> Iterator[List[Document]]:
         """Iterate over PDFs and yield lists of documents.
         Each object yielded by the iterator is a list of documents.
 
+        With `num_workers` (or `reader.num_workers`) set, the PDFs of a directory are read in parallel in one pool
+        of processes and the pages of a single PDF are extracted in parallel.
+
         Returns:
             Iterator[List[Document]]: Iterator yielding list of documents
         """
 
+        num_workers = self.num_workers or self.reader.num_workers
+        _pdf_path: Path = Path(self.path) if isinstance(self.path, str) else self.path
+        if num_workers is None or num_workers <= 1 or not _pdf_path.is_dir():
+            # Stream documents from each PDF in batches to bound memory use
+            with self.reader.worker_pool(num_workers):
+                for _pdf in self.source_files:
+                    yield from self.batch_documents(self.reader.iter_read(pdf=_pdf))
+            return
+
+        from concurrent.futures import Future, wait, as_completed, FIRST_COMPLETED
+
+        # Files are already read in parallel, so each worker reads its pages serially.
+        # The copy is made before the pool is started, as the pool can not be sent to the workers.
+        reader = self.reader.model_copy(update={"num_workers": None})
+        with self.reader.worker_pool(num_workers) as executor:
+            pending: Set[Future] = set()
+            for _pdf in self.source_files:
+                # Limit the number of parsed PDFs held in memory
+                if len(pending) >= 2 * num_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from self.batch_documents(iter(future.result()))
+                pending.add(executor.submit(reader.read, pdf=str(_pdf)))  # type: ignore
+            for future in as_completed(pending):
+                yield from self.batch_documents(iter(future.result()))
+
+    @property
+    def source_files(self) -> Iterator[Path]:
+        """Iterate over the PDF files in the path"""
+
         _pdf_path: Path = Path(self.path) if isinstance(self.path, str) else self.path
 
         if _pdf_path.exists() and _pdf_path.is_dir():
-            for _pdf in _pdf_path.glob("**/*.pdf"):
-                yield self.reader.read(pdf=_pdf)
+            yield from _pdf_path.glob("**/*.pdf")
         elif _pdf_path.exists() and _pdf_path.is_file() and _pdf_path.suffix == ".pdf":
-            yield self.reader.read(pdf=_pdf_path)
+            yield _pdf_path
+
+    def read_file(self, path: Path) -> List[Document]:
+        return self.reader.read(pdf=path)
 
 
 class PDFUrlKnowledgeBase(AssistantKnowledge):
@@ -42,4 +79,4 @@ class PDFUrlKnowledgeBase(AssistantKnowledge):
         """
 
         for url in self.urls:
-            yield self.reader.read(url=url)
+            yield from self.batch_documents(self.reader.iter_read(url=url))
@@ -24,16 +24,14 @@ class S3KnowledgeBase(AssistantKnowledge):
         raise NotImplementedError
 
     @property
-    def s3_objects(self) -> List[S3Object]:
-        """Iterate over PDFs in a s3 bucket and yield lists of documents.
-        Each object yielded by the iterator is a list of documents.
+    def s3_objects(self) -> Iterator[S3Object]:
+        """Iterate over the objects to read from the s3 bucket.
+        Objects under a prefix are listed lazily, one page at a time.
 
         Returns:
-            Iterator[List[Document]]: Iterator yielding list of documents
+            Iterator[S3Object]: Iterator yielding s3 objects
         """
 
-        s3_objects_to_read: List[S3Object] = []
-
         if self.bucket is None and self.bucket_name is None:
             raise ValueError("No bucket or bucket_name provided")
 
@@ -48,13 +46,8 @@ class S3KnowledgeBase(AssistantKnowledge):
 
         if self.bucket is not None:
             if self.key is not None:
-                _object = S3Object(bucket_name=self.bucket.name, name=self.key)
-                s3_objects_to_read.append(_object)
+                yield S3Object(bucket_name=self.bucket.name, name=self.key)
             elif self.object is not None:
-                s3_objects_to_read.append(self.object)
-            elif self.prefix is not None:
-                s3_objects_to_read.extend(self.bucket.get_objects(prefix=self.prefix))
+                yield self.object
             else:
-                s3_objects_to_read.extend(self.bucket.get_objects())
-
-        return s3_objects_to_read
+                yield from self.bucket.iter_objects(prefix=self.prefix)
@@ -16,6 +16,8 @@ class S3PDFKnowledgeBase(S3KnowledgeBase):
         Returns:
             Iterator[List[Document]]: Iterator yielding list of documents
         """
-        for s3_object in self.s3_objects:
-            if s3_object.name.endswith(".pdf"):
-                yield self.reader.read(s3_object=s3_object)
+        # Share one pool of worker processes between all PDFs if the reader extracts pages in parallel
+        with self.reader.worker_pool():
+            for s3_object in self.s3_objects:
+                if s3_object.name.endswith(".pdf"):
+                    yield from self.batch_documents(self.reader.iter_read(s3_object=s3_object))
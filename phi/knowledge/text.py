@@ -20,11 +20,21 @@ class TextKnowledgeBase(AssistantKnowledge):
             Iterator[List[Document]]: Iterator yielding list of documents
         """
 
+        for _file in self.source_files:
+            yield self.read_file(_file)
+
+    @property
+    def source_files(self) -> Iterator[Path]:
+        """Iterate over the files in the path matching the formats"""
+
         _file_path: Path = Path(self.path) if isinstance(self.path, str) else self.path
 
         if _file_path.exists() and _file_path.is_dir():
             for _file in _file_path.glob("**/*"):
                 if _file.suffix in self.formats:
-                    yield self.reader.read(path=_file)
+                    yield _file
         elif _file_path.exists() and _file_path.is_file() and _file_path.suffix in self.formats:
-            yield self.reader.read(path=_file_path)
+            yield _file_path
+
+    def read_file(self, path: Path) -> List[Document]:
+        return self.reader.read(path=path)
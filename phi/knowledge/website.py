@@ -34,8 +34,16 @@ class WebsiteKnowledgeBase(AssistantKnowledge):
             for _url in self.urls:
                 yield self.reader.read(url=_url)
 
-    def load(self, recreate: bool = False, upsert: bool = True, skip_existing: bool = True) -> None:
-        """Load the website contents to the vector db"""
+    def load(
+        self,
+        recreate: bool = False,
+        upsert: bool = True,
+        skip_existing: bool = True,
+        concurrency: Optional[int] = None,
+    ) -> None:
+        """Load the website contents to the vector db.
+        If `concurrency` is greater than 1, urls are read while worker threads load the previous urls.
+        """
 
         if self.vector_db is None:
             logger.warning("No vector db provided")
@@ -65,15 +73,24 @@ class WebsiteKnowledgeBase(AssistantKnowledge):
                     logger.debug(f"Skipping {url} as it exists in the vector db")
                     urls_to_read.remove(url)
 
-        for url in urls_to_read:
-            document_list = self.reader.read(url=url)
-            # Filter out documents which already exist in the vector db
-            if not recreate:
-                document_list = [document for document in document_list if not self.vector_db.doc_exists(document)]
-
-            self.vector_db.insert(documents=document_list)
-            num_documents += len(document_list)
-            logger.info(f"Loaded {num_documents} documents to knowledge base")
+        reader = self.reader
+        if concurrency is not None and concurrency > 1:
+            num_documents = self._load_concurrently(
+                document_lists=(reader.read(url=url) for url in urls_to_read),
+                upsert=False,
+                skip_existing=not recreate,
+                concurrency=concurrency,
+            )
+        else:
+            for url in urls_to_read:
+                document_list = reader.read(url=url)
+                # Filter out documents which already exist in the vector db
+                if not recreate:
+                    document_list = self._filter_existing(document_list)
+
+                self.vector_db.insert(documents=document_list)
+                num_documents += len(document_list)
+                logger.info(f"Loaded {num_documents} documents to knowledge base")
 
         if self.optimize_on is not None and num_documents > self.optimize_on:
             logger.debug("Optimizing Vector DB")
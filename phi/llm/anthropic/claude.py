@@ -6,6 +6,7 @@ from typing import Optional, List, Iterator, Dict, Any
 from phi.llm.base import LLM
 from phi.llm.message import Message
 from phi.tools.function import FunctionCall
+from phi.utils.http import get_client, with_http_client
 from phi.utils.log import logger
 from phi.utils.timer import Timer
 from phi.utils.tools import (
@@ -46,7 +47,9 @@ class Claude(LLM):
         _client_params: Dict[str, Any] = {}
         if self.api_key:
             _client_params["api_key"] = self.api_key
-        return AnthropicClient(**_client_params)
+        if self.client_params:
+            _client_params.update(self.client_params)
+        return get_client("anthropic", with_http_client(AnthropicClient), **_client_params)
 
     @property
     def api_kwargs(self) -> Dict[str, Any]:
@@ -102,11 +105,8 @@ class Claude(LLM):
             **api_kwargs,
         )
 
-    def response(self, messages: List[Message]) -> str:
+    def response_round(self, messages: List[Message]) -> str:
         logger.debug("---------- Claude Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
 
         response_timer = Timer()
         response_timer.start()
@@ -207,8 +207,6 @@ class Claude(LLM):
 
                 messages.append(Message(role="user", content=fc_responses))
 
-            # -*- Yield new response using results of tool calls
-            final_response += self.response(messages=messages)
             return final_response
         logger.debug("---------- Claude Response End ----------")
         # -*- Return content if no function calls are present
@@ -216,11 +214,8 @@ class Claude(LLM):
             return assistant_message.get_content_string()
         return "Something went wrong, please try again."
 
-    def response_stream(self, messages: List[Message]) -> Iterator[str]:
+    def response_stream_round(self, messages: List[Message]) -> Iterator[str]:
         logger.debug("---------- Claude Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
 
         assistant_message_content = ""
         tool_calls_counter = 0
@@ -362,8 +357,6 @@ class Claude(LLM):
 
                 messages.append(Message(role="user", content=fc_responses))
 
-            # -*- Yield new response using results of tool calls
-            yield from self.response_stream(messages=messages)
         logger.debug("---------- Claude Response End ----------")
 
     def get_tool_call_prompt(self) -> Optional[str]:
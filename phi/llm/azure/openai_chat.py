@@ -1,5 +1,6 @@
 from os import getenv
 from typing import Optional, Dict, Any
+from phi.utils.http import get_client, with_http_client
 from phi.utils.log import logger
 from phi.llm.openai.like import OpenAILike
 
@@ -49,4 +50,4 @@ class AzureOpenAIChat(OpenAILike):
         if self.client_params:
             _client_params.update(self.client_params)
 
-        return AzureOpenAIClient(**_client_params)
+        return get_client("azure_openai", with_http_client(AzureOpenAIClient), **_client_params)
@@ -1,4 +1,9 @@
-from typing import List, Iterator, Optional, Dict, Any, Callable, Union
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from importlib.util import find_spec
+from typing import List, Iterator, AsyncIterator, Optional, Dict, Any, Callable, Union, Tuple
 
 from pydantic import BaseModel, ConfigDict
 
@@ -6,6 +11,7 @@ from phi.llm.message import Message
 from phi.tools import Tool, Toolkit
 from phi.tools.function import Function, FunctionCall
 from phi.utils.timer import Timer
+from phi.utils.tokenizer import Tokenizer, TiktokenTokenizer
 from phi.utils.log import logger
 
 
@@ -42,6 +48,16 @@ class LLM(BaseModel):
     function_call_limit: int = 10
     # Function call stack.
     function_call_stack: Optional[List[FunctionCall]] = None
+    # If True, the function calls of a response are run in parallel: in threads, or as concurrent tasks when
+    # responding asynchronously.
+    # Only enable this if the tools are thread safe and do not depend on each other.
+    run_tools_in_parallel: bool = False
+    # Maximum number of function calls to run at once when run_tools_in_parallel is True.
+    tool_call_concurrency: int = 4
+
+    # Tokenizer used to estimate token usage when the API does not return it, e.g. for streamed responses.
+    # Defaults to a tiktoken tokenizer for the model if `tiktoken` is installed.
+    tokenizer: Optional[Tokenizer] = None
 
     system_prompt: Optional[str] = None
     instructions: Optional[List[str]] = None
@@ -68,17 +84,137 @@ class LLM(BaseModel):
         raise NotImplementedError
 
     def response(self, messages: List[Message]) -> str:
-        raise NotImplementedError
+        """Returns the response to the messages, running tool calls until the model responds without calling tools.
+        LLMs implement response_round() to generate a single response.
+        """
+        self.log_messages(messages)
+        final_response = ""
+        round_number = 0
+        while True:
+            round_number += 1
+            num_messages = len(messages)
+            round_timer = Timer()
+            round_timer.start()
+            final_response += self.response_round(messages=messages)
+            round_timer.stop()
+            if not self.end_response_round(messages, num_messages, round_number, round_timer.elapsed):
+                return final_response
 
     async def aresponse(self, messages: List[Message]) -> str:
-        raise NotImplementedError
+        """Async version of response(), LLMs implement aresponse_round() to generate a single response"""
+        self.log_messages(messages)
+        final_response = ""
+        round_number = 0
+        while True:
+            round_number += 1
+            num_messages = len(messages)
+            round_timer = Timer()
+            round_timer.start()
+            final_response += await self.aresponse_round(messages=messages)
+            round_timer.stop()
+            if not self.end_response_round(messages, num_messages, round_number, round_timer.elapsed):
+                return final_response
 
     def response_stream(self, messages: List[Message]) -> Iterator[str]:
+        """Streams the response to the messages, running tool calls until the model responds without calling tools.
+        LLMs implement response_stream_round() to stream a single response.
+        """
+        self.log_messages(messages)
+        round_number = 0
+        while True:
+            round_number += 1
+            num_messages = len(messages)
+            round_timer = Timer()
+            round_timer.start()
+            yield from self.response_stream_round(messages=messages)
+            round_timer.stop()
+            if not self.end_response_round(messages, num_messages, round_number, round_timer.elapsed):
+                return
+
+    async def aresponse_stream(self, messages: List[Message]) -> AsyncIterator[str]:
+        """Async version of response_stream(), LLMs implement aresponse_stream_round() to stream a single response"""
+        self.log_messages(messages)
+        round_number = 0
+        while True:
+            round_number += 1
+            num_messages = len(messages)
+            round_timer = Timer()
+            round_timer.start()
+            async for response_content in self.aresponse_stream_round(messages=messages):
+                yield response_content
+            round_timer.stop()
+            if not self.end_response_round(messages, num_messages, round_number, round_timer.elapsed):
+                return
+
+    def response_round(self, messages: List[Message]) -> str:
+        """Generates a single response and adds the assistant message to the messages.
+        If the response calls tools, runs them and adds their results to the messages.
+
+        Returns the content of the response, or the tool calls to show if tools were run.
+        The assistant message is logged by the round, the other messages are logged by end_response_round().
+        """
+        raise NotImplementedError
+
+    async def aresponse_round(self, messages: List[Message]) -> str:
         raise NotImplementedError
 
-    async def aresponse_stream(self, messages: List[Message]) -> Any:
+    def response_stream_round(self, messages: List[Message]) -> Iterator[str]:
+        """Streams a single response, see response_round()"""
         raise NotImplementedError
 
+    def aresponse_stream_round(self, messages: List[Message]) -> AsyncIterator[str]:
+        raise NotImplementedError
+
+    def log_messages(self, messages: List[Message]) -> None:
+        """Log messages for debugging"""
+        for m in messages:
+            m.log()
+
+    def end_response_round(self, messages: List[Message], num_messages: int, round_number: int, elapsed: float) -> bool:
+        """Logs the messages added after the assistant message of a response round.
+        Returns True if tool results were added, so the model needs to respond to them in another round.
+        """
+        tool_messages = messages[num_messages + 1 :]
+        self.log_messages(tool_messages)
+        logger.debug(f"Response round {round_number}: {elapsed:.4f}s, {len(tool_messages)} tool messages")
+        return len(tool_messages) > 0
+
+    def get_tokenizer(self) -> Optional[Tokenizer]:
+        if self.tokenizer is None and find_spec("tiktoken") is not None:
+            self.tokenizer = TiktokenTokenizer(model=self.model)
+        return self.tokenizer
+
+    def count_message_tokens(self, message: Message, tokenizer: Tokenizer) -> int:
+        num_tokens = tokenizer.count_tokens(message.get_content_string())
+        if message.tool_calls is not None:
+            num_tokens += tokenizer.count_tokens(json.dumps(message.tool_calls))
+        if message.function_call is not None:
+            num_tokens += tokenizer.count_tokens(json.dumps(message.function_call))
+        return num_tokens
+
+    def estimate_token_usage(
+        self, messages: List[Message], assistant_message: Message, num_chunks: int
+    ) -> Tuple[int, int]:
+        """Estimates the (prompt_tokens, completion_tokens) of a response to the messages using the tokenizer.
+
+        Like the OpenAI chat format, each prompt message adds 3 tokens (4 with a name) and the reply is primed
+        with 3 tokens. Tool definitions are not counted.
+        Without a tokenizer, the prompt tokens are 0 and the completion tokens are the number of streamed chunks.
+        """
+        tokenizer = self.get_tokenizer()
+        if tokenizer is not None:
+            try:
+                prompt_tokens = 3
+                for m in messages:
+                    prompt_tokens += self.count_message_tokens(m, tokenizer) + (4 if m.name else 3)
+                completion_tokens = self.count_message_tokens(assistant_message, tokenizer)
+                logger.debug(f"Estimated prompt tokens: {prompt_tokens}, completion tokens: {completion_tokens}")
+                return prompt_tokens, completion_tokens
+            except Exception as e:
+                logger.warning(f"Could not count tokens: {e}")
+        logger.debug(f"Estimated completion tokens: {num_chunks}")
+        return 0, num_chunks
+
     def generate(self, messages: List[Message]) -> Dict:
         raise NotImplementedError
 
@@ -138,38 +274,99 @@ class LLM(BaseModel):
         self.tool_choice = "none"
 
     def run_function_calls(self, function_calls: List[FunctionCall], role: str = "tool") -> List[Message]:
+        function_calls = self.get_function_calls_to_run(function_calls)
+
+        # -*- Run function calls
+        if self.run_tools_in_parallel and len(function_calls) > 1:
+            logger.debug(f"Running {len(function_calls)} function calls in parallel")
+            with ThreadPoolExecutor(
+                max_workers=max(min(self.tool_call_concurrency, len(function_calls)), 1)
+            ) as executor:
+                # Each call runs in a copy of the current context, so context variables are visible to the tools
+                futures = [
+                    executor.submit(copy_context().run, self.execute_function_call, function_call)
+                    for function_call in function_calls
+                ]
+                call_times = [future.result() for future in futures]
+        else:
+            call_times = [self.execute_function_call(function_call) for function_call in function_calls]
+
+        return self.get_function_call_results(function_calls=function_calls, call_times=call_times, role=role)
+
+    async def arun_function_calls(self, function_calls: List[FunctionCall], role: str = "tool") -> List[Message]:
+        """Runs function calls without blocking the event loop.
+        Coroutine functions are awaited and other functions run in threads.
+        """
+        function_calls = self.get_function_calls_to_run(function_calls)
+
+        # -*- Run function calls
+        if self.run_tools_in_parallel and len(function_calls) > 1:
+            logger.debug(f"Running {len(function_calls)} function calls in parallel")
+            semaphore = asyncio.Semaphore(max(self.tool_call_concurrency, 1))
+
+            async def _execute(function_call: FunctionCall) -> float:
+                async with semaphore:
+                    return await self.aexecute_function_call(function_call)
+
+            call_times = list(await asyncio.gather(*[_execute(function_call) for function_call in function_calls]))
+        else:
+            call_times = [await self.aexecute_function_call(function_call) for function_call in function_calls]
+
+        return self.get_function_call_results(function_calls=function_calls, call_times=call_times, role=role)
+
+    def get_function_calls_to_run(self, function_calls: List[FunctionCall]) -> List[FunctionCall]:
+        """Returns the function calls allowed by the function call limit: the calls left and at least one"""
+        if self.function_call_stack is None:
+            self.function_call_stack = []
+        num_calls = max(self.function_call_limit - len(self.function_call_stack), 1)
+        return function_calls[:num_calls]
+
+    def get_function_call_results(
+        self, function_calls: List[FunctionCall], call_times: List[float], role: str = "tool"
+    ) -> List[Message]:
+        """Builds the result messages in the order of the function calls and records the function calls"""
+        if self.function_call_stack is None:
+            self.function_call_stack = []
+
         function_call_results: List[Message] = []
-        for function_call in function_calls:
-            if self.function_call_stack is None:
-                self.function_call_stack = []
-
-            # -*- Run function call
-            _function_call_timer = Timer()
-            _function_call_timer.start()
-            function_call.execute()
-            _function_call_timer.stop()
+        for function_call, call_time in zip(function_calls, call_times):
             _function_call_result = Message(
                 role=role,
                 content=function_call.result,
                 tool_call_id=function_call.call_id,
                 tool_call_name=function_call.function.name,
-                metrics={"time": _function_call_timer.elapsed},
+                metrics={"time": call_time},
             )
             if "tool_call_times" not in self.metrics:
                 self.metrics["tool_call_times"] = {}
             if function_call.function.name not in self.metrics["tool_call_times"]:
                 self.metrics["tool_call_times"][function_call.function.name] = []
-            self.metrics["tool_call_times"][function_call.function.name].append(_function_call_timer.elapsed)
+            self.metrics["tool_call_times"][function_call.function.name].append(call_time)
             function_call_results.append(_function_call_result)
             self.function_call_stack.append(function_call)
 
-            # -*- Check function call limit
-            if len(self.function_call_stack) >= self.function_call_limit:
-                self.deactivate_function_calls()
-                break  # Exit early if we reach the function call limit
+        # -*- Check function call limit
+        if len(self.function_call_stack) >= self.function_call_limit:
+            self.deactivate_function_calls()
 
         return function_call_results
 
+    def execute_function_call(self, function_call: FunctionCall) -> float:
+        """Runs a function call and returns the time it took in seconds"""
+        _function_call_timer = Timer()
+        _function_call_timer.start()
+        function_call.execute()
+        _function_call_timer.stop()
+        return _function_call_timer.elapsed
+
+    async def aexecute_function_call(self, function_call: FunctionCall) -> float:
+        """Runs a function call without blocking the event loop and returns the time it took in seconds"""
+        _function_call_timer = Timer()
+        _function_call_timer.start()
+        await function_call.aexecute()
+        _function_call_timer.stop()
+        return _function_call_timer.elapsed
+
     def get_system_prompt_from_llm(self) -> Optional[str]:
         return self.system_prompt
 
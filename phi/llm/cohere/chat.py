@@ -1,10 +1,11 @@
 import json
 from textwrap import dedent
-from typing import Optional, List, Dict, Any, Iterator
+from typing import Optional, List, Dict, Any, Iterator, Generator, Tuple
 
 from phi.llm.base import LLM
 from phi.llm.message import Message
 from phi.tools.function import FunctionCall
+from phi.utils.http import get_client
 from phi.utils.log import logger
 from phi.utils.timer import Timer
 from phi.utils.tools import get_function_call_for_tool_call
@@ -54,7 +55,7 @@ class CohereChat(LLM):
         _client_params: Dict[str, Any] = {}
         if self.api_key:
             _client_params["api_key"] = self.api_key
-        return CohereClient(**_client_params)
+        return get_client("cohere", CohereClient, **_client_params)
 
     @property
     def api_kwargs(self) -> Dict[str, Any]:
@@ -181,10 +182,29 @@ class CohereChat(LLM):
         return self.client.chat_stream(message=chat_message or "", model=self.model, **api_kwargs)
 
     def response(self, messages: List[Message], tool_results: Optional[List[ChatRequestToolResultsItem]] = None) -> str:
+        """Like LLM.response(), passing the tool results of each response round to the next round"""
+        self.log_messages(messages)
+        final_response = ""
+        round_number = 0
+        while True:
+            round_number += 1
+            num_messages = len(messages)
+            round_timer = Timer()
+            round_timer.start()
+            round_response, tool_results = self.run_response_round(messages=messages, tool_results=tool_results)
+            final_response += round_response
+            round_timer.stop()
+            if not self.end_response_round(messages, num_messages, round_number, round_timer.elapsed):
+                return final_response
+
+    def response_round(self, messages: List[Message]) -> str:
+        return self.run_response_round(messages=messages)[0]
+
+    def run_response_round(
+        self, messages: List[Message], tool_results: Optional[List[ChatRequestToolResultsItem]] = None
+    ) -> Tuple[str, Optional[List[ChatRequestToolResultsItem]]]:
+        """Runs a response round, returning its response and the tool results to send with the next request"""
         logger.debug("---------- Cohere Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
 
         response_timer = Timer()
         response_timer.start()
@@ -229,6 +249,7 @@ class CohereChat(LLM):
         # -*- Run function call
         if assistant_message.tool_calls is not None and self.run_tools:
             final_response = ""
+            next_tool_results: Optional[List[ChatRequestToolResultsItem]] = None
             function_calls_to_run: List[FunctionCall] = []
             for tool_call in assistant_message.tool_calls:
                 _function_call = get_function_call_for_tool_call(tool_call, self.functions)
@@ -255,7 +276,7 @@ class CohereChat(LLM):
             if response_tool_calls is not None and 0 < len(function_call_results) == len(response_tool_calls):
                 # Constructs a list named tool_results, where each element is a dictionary that contains details of tool calls and their outputs.
                 # It pairs each tool call in response_tool_calls with its corresponding result in function_call_results.
-                tool_results = [
+                next_tool_results = [
                     ChatRequestToolResultsItem(
                         call=tool_call, outputs=[tool_call.parameters, {"result": fn_result.content}]
                     )
@@ -263,23 +284,37 @@ class CohereChat(LLM):
                 ]
                 messages.append(Message(role="user", content="Tool result"))
                 # logger.debug(f"Tool results: {tool_results}")
-
-            # -*- Yield new response using results of tool calls
-            final_response += self.response(messages=messages, tool_results=tool_results)
-            return final_response
+            return final_response, next_tool_results
         logger.debug("---------- Cohere Response End ----------")
         # -*- Return content if no function calls are present
         if assistant_message.content is not None:
-            return assistant_message.get_content_string()
-        return "Something went wrong, please try again."
+            return assistant_message.get_content_string(), None
+        return "Something went wrong, please try again.", None
 
     def response_stream(
         self, messages: List[Message], tool_results: Optional[List[ChatRequestToolResultsItem]] = None
-    ) -> Any:
+    ) -> Iterator[str]:
+        """Like LLM.response_stream(), passing the tool results of each response round to the next round"""
+        self.log_messages(messages)
+        round_number = 0
+        while True:
+            round_number += 1
+            num_messages = len(messages)
+            round_timer = Timer()
+            round_timer.start()
+            tool_results = yield from self.run_response_stream_round(messages=messages, tool_results=tool_results)
+            round_timer.stop()
+            if not self.end_response_round(messages, num_messages, round_number, round_timer.elapsed):
+                return
+
+    def response_stream_round(self, messages: List[Message]) -> Iterator[str]:
+        yield from self.run_response_stream_round(messages=messages)
+
+    def run_response_stream_round(
+        self, messages: List[Message], tool_results: Optional[List[ChatRequestToolResultsItem]] = None
+    ) -> Generator[str, None, Optional[List[ChatRequestToolResultsItem]]]:
+        """Streams a response round, returning the tool results to send with the next request"""
         logger.debug("---------- Cohere Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
 
         assistant_message_content = ""
         tool_calls: List[Dict[str, Any]] = []
@@ -334,6 +369,7 @@ class CohereChat(LLM):
         assistant_message.log()
 
         # -*- Parse and run function call
+        next_tool_results: Optional[List[ChatRequestToolResultsItem]] = None
         if assistant_message.tool_calls is not None and self.run_tools:
             function_calls_to_run: List[FunctionCall] = []
             for tool_call in assistant_message.tool_calls:
@@ -361,7 +397,7 @@ class CohereChat(LLM):
             if response_tool_calls is not None and 0 < len(function_call_results) == len(tool_calls):
                 # Constructs a list named tool_results, where each element is a dictionary that contains details of tool calls and their outputs.
                 # It pairs each tool call in response_tool_calls with its corresponding result in function_call_results.
-                tool_results = [
+                next_tool_results = [
                     ChatRequestToolResultsItem(
                         call=tool_call, outputs=[tool_call.parameters, {"result": fn_result.content}]
                     )
@@ -370,9 +406,8 @@ class CohereChat(LLM):
                 messages.append(Message(role="user", content="Tool result"))
                 # logger.debug(f"Tool results: {tool_results}")
 
-            # -*- Yield new response using results of tool calls
-            yield from self.response_stream(messages=messages, tool_results=tool_results)
         logger.debug("---------- Cohere Response End ----------")
+        return next_tool_results
 
     def get_tool_call_prompt(self) -> Optional[str]:
         if self.functions is not None and len(self.functions) > 0:
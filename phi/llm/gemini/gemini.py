@@ -138,11 +138,8 @@ class Gemini(LLM):
             stream=True,
         )
 
-    def response(self, messages: List[Message]) -> str:
+    def response_round(self, messages: List[Message]) -> str:
         logger.debug("---------- VertexAI Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
 
         response_timer = Timer()
         response_timer.start()
@@ -230,17 +227,12 @@ class Gemini(LLM):
             function_call_results = self.run_function_calls(function_calls_to_run)
             if len(function_call_results) > 0:
                 messages.extend(function_call_results)
-            # -*- Get new response using result of tool call
-            final_response += self.response(messages=messages)
             return final_response
         logger.debug("---------- VertexAI Response End ----------")
         return assistant_message.get_content_string()
 
-    def response_stream(self, messages: List[Message]) -> Iterator[str]:
+    def response_stream_round(self, messages: List[Message]) -> Iterator[str]:
         logger.debug("---------- VertexAI Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
 
         response_role: Optional[str] = None
         response_function_calls: Optional[List[Dict[str, Any]]] = None
@@ -323,6 +315,4 @@ class Gemini(LLM):
             function_call_results = self.run_function_calls(function_calls_to_run)
             if len(function_call_results) > 0:
                 messages.extend(function_call_results)
-            # -*- Yield new response using results of tool calls
-            yield from self.response_stream(messages=messages)
         logger.debug("---------- VertexAI Response End ----------")
@@ -4,6 +4,7 @@ from typing import Optional, List, Iterator, Dict, Any, Union
 from phi.llm.base import LLM
 from phi.llm.message import Message
 from phi.tools.function import FunctionCall
+from phi.utils.http import get_client, with_http_client
 from phi.utils.log import logger
 from phi.utils.timer import Timer
 from phi.utils.tools import get_function_call_for_tool_call
@@ -67,7 +68,7 @@ class Groq(LLM):
             _client_params["default_query"] = self.default_query
         if self.client_params:
             _client_params.update(self.client_params)
-        return GroqClient(**_client_params)
+        return get_client("groq", with_http_client(GroqClient), **_client_params)
 
     @property
     def api_kwargs(self) -> Dict[str, Any]:
@@ -163,11 +164,8 @@ class Groq(LLM):
             **self.api_kwargs,
         )
 
-    def response(self, messages: List[Message]) -> str:
+    def response_round(self, messages: List[Message]) -> str:
         logger.debug("---------- Groq Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
 
         response_timer = Timer()
         response_timer.start()
@@ -231,8 +229,6 @@ class Groq(LLM):
             function_call_results = self.run_function_calls(function_calls_to_run)
             if len(function_call_results) > 0:
                 messages.extend(function_call_results)
-            # -*- Get new response using result of tool call
-            final_response += self.response(messages=messages)
             return final_response
         logger.debug("---------- Groq Response End ----------")
         # -*- Return content if no function calls are present
@@ -240,11 +236,8 @@ class Groq(LLM):
             return assistant_message.get_content_string()
         return "Something went wrong, please try again."
 
-    def response_stream(self, messages: List[Message]) -> Iterator[str]:
+    def response_stream_round(self, messages: List[Message]) -> Iterator[str]:
         logger.debug("---------- Groq Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
 
         assistant_message_role = None
         assistant_message_content = ""
@@ -323,6 +316,4 @@ class Groq(LLM):
             function_call_results = self.run_function_calls(function_calls_to_run)
             if len(function_call_results) > 0:
                 messages.extend(function_call_results)
-            # -*- Yield new response using results of tool calls
-            yield from self.response_stream(messages=messages)
         logger.debug("---------- Groq Response End ----------")
@@ -3,6 +3,7 @@ from typing import Optional, List, Iterator, Dict, Any, Union
 from phi.llm.base import LLM
 from phi.llm.message import Message
 from phi.tools.function import FunctionCall
+from phi.utils.http import get_client
 from phi.utils.log import logger
 from phi.utils.timer import Timer
 from phi.utils.tools import get_function_call_for_tool_call
@@ -59,7 +60,7 @@ class Mistral(LLM):
             _client_params["timeout"] = self.timeout
         if self.client_params:
             _client_params.update(self.client_params)
-        return MistralClient(**_client_params)
+        return get_client("mistral", MistralClient, **_client_params)
 
     @property
     def api_kwargs(self) -> Dict[str, Any]:
@@ -116,11 +117,8 @@ class Mistral(LLM):
             **self.api_kwargs,
         )  # type: ignore
 
-    def response(self, messages: List[Message]) -> str:
+    def response_round(self, messages: List[Message]) -> str:
         logger.debug("---------- Mistral Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
 
         response_timer = Timer()
         response_timer.start()
@@ -183,8 +181,6 @@ class Mistral(LLM):
             function_call_results = self.run_function_calls(function_calls_to_run)
             if len(function_call_results) > 0:
                 messages.extend(function_call_results)
-            # -*- Get new response using result of tool call
-            final_response += self.response(messages=messages)
             return final_response
         logger.debug("---------- Mistral Response End ----------")
         # -*- Return content if no function calls are present
@@ -192,11 +188,8 @@ class Mistral(LLM):
             return assistant_message.get_content_string()
         return "Something went wrong, please try again."
 
-    def response_stream(self, messages: List[Message]) -> Iterator[str]:
+    def response_stream_round(self, messages: List[Message]) -> Iterator[str]:
         logger.debug("---------- Mistral Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
 
         assistant_message_role = None
         assistant_message_content = ""
@@ -275,6 +268,4 @@ class Mistral(LLM):
             function_call_results = self.run_function_calls(function_calls_to_run)
             if len(function_call_results) > 0:
                 messages.extend(function_call_results)
-            # -*- Yield new response using results of tool calls
-            yield from self.response_stream(messages=messages)
         logger.debug("---------- Mistral Response End ----------")
@@ -5,6 +5,7 @@ from typing import Optional, List, Iterator, Dict, Any, Mapping, Union
 from phi.llm.base import LLM
 from phi.llm.message import Message
 from phi.tools.function import FunctionCall
+from phi.utils.http import get_client
 from phi.utils.log import logger
 from phi.utils.timer import Timer
 from phi.utils.tools import get_function_call_for_tool_call
@@ -45,7 +46,7 @@ class Ollama(LLM):
             _ollama_params["timeout"] = self.timeout
         if self.client_kwargs:
             _ollama_params.update(self.client_kwargs)
-        return OllamaClient(**_ollama_params)
+        return get_client("ollama", OllamaClient, **_ollama_params)
 
     @property
     def api_kwargs(self) -> Dict[str, Any]:
@@ -104,11 +105,8 @@ class Ollama(LLM):
         # This is triggered when the function call limit is reached.
         self.format = ""
 
-    def response(self, messages: List[Message]) -> str:
+    def response_round(self, messages: List[Message]) -> str:
         logger.debug("---------- Ollama Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
 
         response_timer = Timer()
         response_timer.start()
@@ -203,8 +201,6 @@ class Ollama(LLM):
             if self.deactivate_tools_after_use:
                 self.deactivate_function_calls()
 
-            # -*- Yield new response using results of tool calls
-            final_response += self.response(messages=messages)
             return final_response
         logger.debug("---------- Ollama Response End ----------")
         # -*- Return content if no function calls are present
@@ -212,11 +208,8 @@ class Ollama(LLM):
             return assistant_message.get_content_string()
         return "Something went wrong, please try again."
 
-    def response_stream(self, messages: List[Message]) -> Iterator[str]:
+    def response_stream_round(self, messages: List[Message]) -> Iterator[str]:
         logger.debug("---------- Ollama Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
 
         assistant_message_content = ""
         response_is_tool_call = False
@@ -364,8 +357,6 @@ class Ollama(LLM):
             if self.deactivate_tools_after_use:
                 self.deactivate_function_calls()
 
-            # -*- Yield new response using results of tool calls
-            yield from self.response_stream(messages=messages)
         logger.debug("---------- Ollama Response End ----------")
 
     def add_original_user_message(self, messages: List[Message]) -> List[Message]:
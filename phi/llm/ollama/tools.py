@@ -6,6 +6,7 @@ from phi.llm.base import LLM
 from phi.llm.message import Message
 from phi.llm.exceptions import InvalidToolCallException
 from phi.tools.function import FunctionCall
+from phi.utils.http import get_client
 from phi.utils.log import logger
 from phi.utils.timer import Timer
 from phi.utils.tools import (
@@ -48,7 +49,7 @@ class OllamaTools(LLM):
             _ollama_params["timeout"] = self.timeout
         if self.client_kwargs:
             _ollama_params.update(self.client_kwargs)
-        return OllamaClient(**_ollama_params)
+        return get_client("ollama", OllamaClient, **_ollama_params)
 
     @property
     def api_kwargs(self) -> Dict[str, Any]:
@@ -107,11 +108,8 @@ class OllamaTools(LLM):
         # This is triggered when the function call limit is reached.
         self.format = ""
 
-    def response(self, messages: List[Message]) -> str:
+    def response_round(self, messages: List[Message]) -> str:
         logger.debug("---------- OllamaTools Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
 
         response_timer = Timer()
         response_timer.start()
@@ -230,8 +228,6 @@ class OllamaTools(LLM):
                 if self.add_user_message_after_tool_call:
                     messages = self.add_original_user_message(messages)
 
-            # -*- Yield new response using results of tool calls
-            final_response += self.response(messages=messages)
             return final_response
         logger.debug("---------- OllamaTools Response End ----------")
         # -*- Return content if no function calls are present
@@ -239,11 +235,8 @@ class OllamaTools(LLM):
             return assistant_message.get_content_string()
         return "Something went wrong, please try again."
 
-    def response_stream(self, messages: List[Message]) -> Iterator[str]:
+    def response_stream_round(self, messages: List[Message]) -> Iterator[str]:
         logger.debug("---------- OllamaTools Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
 
         assistant_message_content = ""
         tool_calls_counter = 0
@@ -398,8 +391,6 @@ class OllamaTools(LLM):
                 if self.add_user_message_after_tool_call:
                     messages = self.add_original_user_message(messages)
 
-            # -*- Yield new response using results of tool calls
-            yield from self.response_stream(messages=messages)
         logger.debug("---------- OllamaTools Response End ----------")
 
     def add_original_user_message(self, messages: List[Message]) -> List[Message]:
@@ -1,9 +1,10 @@
 import httpx
-from typing import Optional, List, Iterator, Dict, Any, Union, Tuple
+from typing import Optional, List, Iterator, AsyncIterator, Dict, Any, Union, Tuple
 
 from phi.llm.base import LLM
 from phi.llm.message import Message
 from phi.tools.function import FunctionCall
+from phi.utils.http import get_client, get_async_client, with_http_client, with_async_http_client
 from phi.utils.log import logger
 from phi.utils.timer import Timer
 from phi.utils.functions import get_function_call
@@ -48,6 +49,9 @@ class OpenAIChat(LLM):
     extra_headers: Optional[Any] = None
     extra_query: Optional[Any] = None
     request_params: Optional[Dict[str, Any]] = None
+    # Request the token usage of streamed responses, which is returned in the last chunk.
+    # Disable for OpenAI compatible APIs that do not support `stream_options`.
+    stream_usage: bool = True
     # -*- Client parameters
     api_key: Optional[str] = None
     organization: Optional[str] = None
@@ -90,7 +94,7 @@ class OpenAIChat(LLM):
             _client_params["http_client"] = self.http_client
         if self.client_params:
             _client_params.update(self.client_params)
-        return OpenAIClient(**_client_params)
+        return get_client("openai", with_http_client(OpenAIClient), **_client_params)
 
     def get_async_client(self) -> AsyncOpenAIClient:
         if self.async_client:
@@ -113,13 +117,9 @@ class OpenAIChat(LLM):
             _client_params["default_query"] = self.default_query
         if self.http_client:
             _client_params["http_client"] = self.http_client
-        else:
-            _client_params["http_client"] = httpx.AsyncClient(
-                limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100)
-            )
         if self.client_params:
             _client_params.update(self.client_params)
-        return AsyncOpenAIClient(**_client_params)
+        return get_async_client("openai", with_async_http_client(AsyncOpenAIClient), **_client_params)
 
     @property
     def api_kwargs(self) -> Dict[str, Any]:
@@ -162,6 +162,13 @@ class OpenAIChat(LLM):
             _request_params.update(self.request_params)
         return _request_params
 
+    @property
+    def stream_api_kwargs(self) -> Dict[str, Any]:
+        _request_params: Dict[str, Any] = self.api_kwargs
+        if self.stream_usage and "stream_options" not in _request_params:
+            _request_params["stream_options"] = {"include_usage": True}
+        return _request_params
+
     def to_dict(self) -> Dict[str, Any]:
         _dict = super().to_dict()
         if self.frequency_penalty:
@@ -219,7 +226,7 @@ class OpenAIChat(LLM):
             model=self.model,
             messages=[m.to_dict() for m in messages],  # type: ignore
             stream=True,
-            **self.api_kwargs,
+            **self.stream_api_kwargs,
         )  # type: ignore
 
     async def ainvoke_stream(self, messages: List[Message]) -> Any:
@@ -227,7 +234,7 @@ class OpenAIChat(LLM):
             model=self.model,
             messages=[m.to_dict() for m in messages],  # type: ignore
             stream=True,
-            **self.api_kwargs,
+            **self.stream_api_kwargs,
         )
         async for chunk in async_stream:  # type: ignore
             yield chunk
@@ -278,11 +285,8 @@ class OpenAIChat(LLM):
             return _function_call_message, _function_call
         return Message(role="function", content="Function name is None."), None
 
-    def response(self, messages: List[Message]) -> str:
+    def response_round(self, messages: List[Message]) -> str:
         logger.debug("---------- OpenAI Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
 
         response_timer = Timer()
         response_timer.start()
@@ -350,11 +354,9 @@ class OpenAIChat(LLM):
             if assistant_message.function_call is not None:
                 function_call_message, function_call = self.run_function(function_call=assistant_message.function_call)
                 messages.append(function_call_message)
-                # -*- Get new response using result of function call
                 final_response = ""
                 if self.show_tool_calls and function_call is not None:
                     final_response += f"\n - Running: {function_call.get_call_str()}\n\n"
-                final_response += self.response(messages=messages)
                 return final_response
             elif assistant_message.tool_calls is not None:
                 final_response = ""
@@ -394,8 +396,6 @@ class OpenAIChat(LLM):
                 function_call_results = self.run_function_calls(function_calls_to_run)
                 if len(function_call_results) > 0:
                     messages.extend(function_call_results)
-                # -*- Get new response using result of tool call
-                final_response += self.response(messages=messages)
                 return final_response
         logger.debug("---------- OpenAI Response End ----------")
         # -*- Return content if no function calls are present
@@ -403,11 +403,8 @@ class OpenAIChat(LLM):
             return assistant_message.get_content_string()
         return "Something went wrong, please try again."
 
-    async def aresponse(self, messages: List[Message]) -> str:
+    async def aresponse_round(self, messages: List[Message]) -> str:
         logger.debug("---------- OpenAI Async Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
 
         response_timer = Timer()
         response_timer.start()
@@ -475,11 +472,9 @@ class OpenAIChat(LLM):
             if assistant_message.function_call is not None:
                 function_call_message, function_call = self.run_function(function_call=assistant_message.function_call)
                 messages.append(function_call_message)
-                # -*- Get new response using result of function call
                 final_response = ""
                 if self.show_tool_calls and function_call is not None:
                     final_response += f"\n - Running: {function_call.get_call_str()}\n\n"
-                final_response += self.response(messages=messages)
                 return final_response
             elif assistant_message.tool_calls is not None:
                 final_response = ""
@@ -516,11 +511,9 @@ class OpenAIChat(LLM):
                             final_response += f"\n - {_f.get_call_str()}"
                         final_response += "\n\n"
 
-                function_call_results = self.run_function_calls(function_calls_to_run)
+                function_call_results = await self.arun_function_calls(function_calls_to_run)
                 if len(function_call_results) > 0:
                     messages.extend(function_call_results)
-                # -*- Get new response using result of tool call
-                final_response += await self.aresponse(messages=messages)
                 return final_response
         logger.debug("---------- OpenAI Async Response End ----------")
         # -*- Return content if no function calls are present
@@ -599,22 +592,22 @@ class OpenAIChat(LLM):
         logger.debug("---------- OpenAI Response End ----------")
         return response_message_dict
 
-    def response_stream(self, messages: List[Message]) -> Iterator[str]:
+    def response_stream_round(self, messages: List[Message]) -> Iterator[str]:
         logger.debug("---------- OpenAI Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
 
         assistant_message_content = ""
         assistant_message_function_name = ""
         assistant_message_function_arguments_str = ""
         assistant_message_tool_calls: Optional[List[ChoiceDeltaToolCall]] = None
         completion_tokens = 0
+        response_usage: Optional[CompletionUsage] = None
         response_timer = Timer()
         response_timer.start()
         for response in self.invoke_stream(messages=messages):
             # logger.debug(f"OpenAI response type: {type(response)}")
             # logger.debug(f"OpenAI response: {response}")
+            if response.usage is not None:
+                response_usage = response.usage
             response_content: Optional[str] = None
             response_function_call: Optional[ChoiceDeltaFunctionCall] = None
             response_tool_calls: Optional[List[ChoiceDeltaToolCall]] = None
@@ -711,14 +704,16 @@ class OpenAIChat(LLM):
         self.metrics["response_times"].append(response_timer.elapsed)
 
         # Add token usage to metrics
-        # TODO: compute prompt tokens
-        prompt_tokens = 0
+        if response_usage is not None:
+            prompt_tokens = response_usage.prompt_tokens
+            completion_tokens = response_usage.completion_tokens
+        else:
+            prompt_tokens, completion_tokens = self.estimate_token_usage(messages, assistant_message, completion_tokens)
         assistant_message.metrics["prompt_tokens"] = prompt_tokens
         if "prompt_tokens" not in self.metrics:
             self.metrics["prompt_tokens"] = prompt_tokens
         else:
             self.metrics["prompt_tokens"] += prompt_tokens
-        logger.debug(f"Estimated completion tokens: {completion_tokens}")
         assistant_message.metrics["completion_tokens"] = completion_tokens
         if "completion_tokens" not in self.metrics:
             self.metrics["completion_tokens"] = completion_tokens
@@ -743,8 +738,6 @@ class OpenAIChat(LLM):
                 messages.append(function_call_message)
                 if self.show_tool_calls and function_call is not None:
                     yield f"\n - Running: {function_call.get_call_str()}\n\n"
-                # -*- Yield new response using result of function call
-                yield from self.response_stream(messages=messages)
             elif assistant_message.tool_calls is not None:
                 function_calls_to_run: List[FunctionCall] = []
                 for tool_call in assistant_message.tool_calls:
@@ -787,27 +780,25 @@ class OpenAIChat(LLM):
                     #     yield "\n"
                     #     yield f.get_content_string()
                     #     yield "\n"
-                # -*- Yield new response using results of tool calls
-                yield from self.response_stream(messages=messages)
         logger.debug("---------- OpenAI Response End ----------")
 
-    async def aresponse_stream(self, messages: List[Message]) -> Any:
+    async def aresponse_stream_round(self, messages: List[Message]) -> AsyncIterator[str]:
         logger.debug("---------- OpenAI Async Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
 
         assistant_message_content = ""
         assistant_message_function_name = ""
         assistant_message_function_arguments_str = ""
         assistant_message_tool_calls: Optional[List[ChoiceDeltaToolCall]] = None
         completion_tokens = 0
+        response_usage: Optional[CompletionUsage] = None
         response_timer = Timer()
         response_timer.start()
         async_stream = self.ainvoke_stream(messages=messages)
         async for response in async_stream:
             # logger.debug(f"OpenAI response type: {type(response)}")
             # logger.debug(f"OpenAI response: {response}")
+            if response.usage is not None:
+                response_usage = response.usage
             response_content: Optional[str] = None
             response_function_call: Optional[ChoiceDeltaFunctionCall] = None
             response_tool_calls: Optional[List[ChoiceDeltaToolCall]] = None
@@ -904,14 +895,16 @@ class OpenAIChat(LLM):
         self.metrics["response_times"].append(response_timer.elapsed)
 
         # Add token usage to metrics
-        # TODO: compute prompt tokens
-        prompt_tokens = 0
+        if response_usage is not None:
+            prompt_tokens = response_usage.prompt_tokens
+            completion_tokens = response_usage.completion_tokens
+        else:
+            prompt_tokens, completion_tokens = self.estimate_token_usage(messages, assistant_message, completion_tokens)
         assistant_message.metrics["prompt_tokens"] = prompt_tokens
         if "prompt_tokens" not in self.metrics:
             self.metrics["prompt_tokens"] = prompt_tokens
         else:
             self.metrics["prompt_tokens"] += prompt_tokens
-        logger.debug(f"Estimated completion tokens: {completion_tokens}")
         assistant_message.metrics["completion_tokens"] = completion_tokens
         if "completion_tokens" not in self.metrics:
             self.metrics["completion_tokens"] = completion_tokens
@@ -936,11 +929,6 @@ class OpenAIChat(LLM):
                 messages.append(function_call_message)
                 if self.show_tool_calls and function_call is not None:
                     yield f"\n - Running: {function_call.get_call_str()}\n\n"
-                # -*- Yield new response using result of function call
-                fc_stream = self.aresponse_stream(messages=messages)
-                async for fc in fc_stream:
-                    yield fc
-                # yield from self.response_stream(messages=messages)
             elif assistant_message.tool_calls is not None:
                 function_calls_to_run: List[FunctionCall] = []
                 for tool_call in assistant_message.tool_calls:
@@ -975,7 +963,7 @@ class OpenAIChat(LLM):
                             yield f"\n - {_f.get_call_str()}"
                         yield "\n\n"
 
-                function_call_results = self.run_function_calls(function_calls_to_run)
+                function_call_results = await self.arun_function_calls(function_calls_to_run)
                 if len(function_call_results) > 0:
                     messages.extend(function_call_results)
                     # Code to show function call results
@@ -983,11 +971,6 @@ class OpenAIChat(LLM):
                     #     yield "\n"
                     #     yield f.get_content_string()
                     #     yield "\n"
-                # -*- Yield new response using results of tool calls
-                fc_stream = self.aresponse_stream(messages=messages)
-                async for fc in fc_stream:
-                    yield fc
-                # yield from self.response_stream(messages=messages)
         logger.debug("---------- OpenAI Async Response End ----------")
 
     def generate_stream(self, messages: List[Message]) -> Iterator[Dict]:
@@ -1001,11 +984,17 @@ class OpenAIChat(LLM):
         assistant_message_function_arguments_str = ""
         assistant_message_tool_calls: Optional[List[ChoiceDeltaToolCall]] = None
         completion_tokens = 0
+        response_usage: Optional[CompletionUsage] = None
         response_timer = Timer()
         response_timer.start()
         for response in self.invoke_stream(messages=messages):
             # logger.debug(f"OpenAI response type: {type(response)}")
             # logger.debug(f"OpenAI response: {response}")
+            if response.usage is not None:
+                response_usage = response.usage
+            # The usage chunk has no choices
+            if len(response.choices) == 0:
+                continue
             completion_tokens += 1
 
             # -*- Parse response
@@ -1097,14 +1086,16 @@ class OpenAIChat(LLM):
         self.metrics["response_times"].append(response_timer.elapsed)
 
         # Add token usage to metrics
-        # TODO: compute prompt tokens
-        prompt_tokens = 0
+        if response_usage is not None:
+            prompt_tokens = response_usage.prompt_tokens
+            completion_tokens = response_usage.completion_tokens
+        else:
+            prompt_tokens, completion_tokens = self.estimate_token_usage(messages, assistant_message, completion_tokens)
         assistant_message.metrics["prompt_tokens"] = prompt_tokens
         if "prompt_tokens" not in self.metrics:
             self.metrics["prompt_tokens"] = prompt_tokens
         else:
             self.metrics["prompt_tokens"] += prompt_tokens
-        logger.debug(f"Estimated completion tokens: {completion_tokens}")
         assistant_message.metrics["completion_tokens"] = completion_tokens
         if "completion_tokens" not in self.metrics:
             self.metrics["completion_tokens"] = completion_tokens
@@ -6,3 +6,5 @@ class OpenAILike(OpenAIChat):
     name: str = "OpenAILike"
     model: str = "not-provided"
     api_key: Optional[str] = "not-provided"
+    # Not all OpenAI compatible APIs support `stream_options`
+    stream_usage: bool = False
@@ -17,16 +17,12 @@ class Together(OpenAILike):
     base_url: str = "https://api.together.xyz/v1"
     monkey_patch: bool = False
 
-    def response_stream(self, messages: List[Message]) -> Iterator[str]:
+    def response_stream_round(self, messages: List[Message]) -> Iterator[str]:
         if not self.monkey_patch:
-            yield from super().response_stream(messages)
+            yield from super().response_stream_round(messages)
             return
 
         logger.debug("---------- Together Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
-
         assistant_message_content = ""
         response_is_tool_call = False
         completion_tokens = 0
@@ -101,12 +97,23 @@ class Together(OpenAILike):
         self.metrics["response_times"].append(response_timer.elapsed)
 
         # Add token usage to metrics
-        logger.debug(f"Estimated completion tokens: {completion_tokens}")
+        prompt_tokens, completion_tokens = self.estimate_token_usage(messages, assistant_message, completion_tokens)
+        assistant_message.metrics["prompt_tokens"] = prompt_tokens
+        if "prompt_tokens" not in self.metrics:
+            self.metrics["prompt_tokens"] = prompt_tokens
+        else:
+            self.metrics["prompt_tokens"] += prompt_tokens
         assistant_message.metrics["completion_tokens"] = completion_tokens
         if "completion_tokens" not in self.metrics:
             self.metrics["completion_tokens"] = completion_tokens
         else:
             self.metrics["completion_tokens"] += completion_tokens
+        total_tokens = prompt_tokens + completion_tokens
+        assistant_message.metrics["total_tokens"] = total_tokens
+        if "total_tokens" not in self.metrics:
+            self.metrics["total_tokens"] = total_tokens
+        else:
+            self.metrics["total_tokens"] += total_tokens
 
         # -*- Add assistant message to messages
         messages.append(assistant_message)
@@ -141,6 +148,4 @@ class Together(OpenAILike):
             # Add results of the function calls to the messages
             if len(function_call_results) > 0:
                 messages.extend(function_call_results)
-            # -*- Yield new response using results of tool calls
-            yield from self.response_stream(messages=messages)
         logger.debug("---------- Together Response End ----------")
@@ -2,10 +2,10 @@ from typing import Optional, Any, List
 
 try:
     from sqlalchemy.dialects import postgresql
-    from sqlalchemy.engine import create_engine, Engine
+    from sqlalchemy.engine import Engine
     from sqlalchemy.engine.row import Row
     from sqlalchemy.inspection import inspect
-    from sqlalchemy.orm import Session, sessionmaker
+    from sqlalchemy.orm import Session
     from sqlalchemy.schema import MetaData, Table, Column
     from sqlalchemy.sql.expression import text, select
     from sqlalchemy.types import DateTime, String
@@ -14,6 +14,7 @@ except ImportError:
 
 from phi.assistant.run import AssistantRun
 from phi.storage.assistant.base import AssistantStorage
+from phi.utils.db import get_engine, SessionFactory
 from phi.utils.log import logger
 
 
@@ -39,7 +40,7 @@ class PgAssistantStorage(AssistantStorage):
         """
         _engine: Optional[Engine] = db_engine
         if _engine is None and db_url is not None:
-            _engine = create_engine(db_url)
+            _engine = get_engine(db_url)
 
         if _engine is None:
             raise ValueError("Must provide either db_url or db_engine")
@@ -52,7 +53,7 @@ class PgAssistantStorage(AssistantStorage):
         self.metadata: MetaData = MetaData(schema=self.schema)
 
         # Database session
-        self.Session: sessionmaker[Session] = sessionmaker(bind=self.db_engine)
+        self.Session: SessionFactory = SessionFactory(self.db_engine)
 
         # Database table for storage
         self.table: Table = self.get_table()
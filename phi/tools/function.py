@@ -1,4 +1,9 @@
-from typing import Any, Dict, Optional, Callable, get_type_hints
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
+from inspect import isawaitable, iscoroutinefunction
+from typing import Any, Awaitable, Dict, Optional, Callable, get_type_hints
 from pydantic import BaseModel, validate_call
 
 from phi.utils.log import logger
@@ -16,6 +21,10 @@ class Function(BaseModel):
     # To describe a function that accepts no parameters, provide the value {"type": "object", "properties": {}}.
     parameters: Dict[str, Any] = {"type": "object", "properties": {}}
     entrypoint: Optional[Callable] = None
+    # True if the entrypoint is a coroutine function, which is awaited when the function is called.
+    is_async: bool = False
+    # Coroutine function awaited instead of the entrypoint when the function is called from an async response.
+    async_entrypoint: Optional[Callable] = None
 
     # If True, the arguments are sanitized before being passed to the function.
     sanitize_arguments: bool = True
@@ -24,7 +33,10 @@ class Function(BaseModel):
         return self.model_dump(exclude_none=True, include={"name", "description", "parameters"})
 
     @classmethod
-    def from_callable(cls, c: Callable) -> "Function":
+    def from_callable(cls, c: Callable, async_c: Optional[Callable] = None) -> "Function":
+        """Returns the Function calling `c`, with the same arguments as the optional coroutine function `async_c`,
+        which is awaited instead when the function is called from an async response.
+        """
         from inspect import getdoc
         from phi.utils.json_schema import get_json_schema
 
@@ -45,6 +57,8 @@ class Function(BaseModel):
             description=getdoc(c),
             parameters=parameters,
             entrypoint=validate_call(c),
+            is_async=iscoroutinefunction(c),
+            async_entrypoint=validate_call(async_c) if async_c is not None else None,
         )
 
     def get_type_name(self, t):
@@ -139,6 +153,8 @@ class FunctionCall(BaseModel):
         if self.arguments is None:
             try:
                 self.result = self.function.entrypoint()
+                if isawaitable(self.result):
+                    self.result = run_coroutine(self.result)
                 return True
             except Exception as e:
                 logger.warning(f"Could not run function {self.get_call_str()}")
@@ -148,9 +164,55 @@ class FunctionCall(BaseModel):
 
         try:
             self.result = self.function.entrypoint(**self.arguments)
+            if isawaitable(self.result):
+                self.result = run_coroutine(self.result)
             return True
         except Exception as e:
             logger.warning(f"Could not run function {self.get_call_str()}")
             logger.exception(e)
             self.result = str(e)
             return False
+
+    async def aexecute(self) -> bool:
+        """Runs the function call without blocking the event loop.
+        Coroutine functions are awaited, other functions run in a thread.
+
+        @return: True if the function call was successful, False otherwise.
+        """
+        if self.function.entrypoint is None:
+            return False
+
+        logger.debug(f"Running: {self.get_call_str()}")
+
+        arguments = self.arguments or {}
+        try:
+            if self.function.async_entrypoint is not None:
+                self.result = await self.function.async_entrypoint(**arguments)
+            elif self.function.is_async:
+                self.result = await self.function.entrypoint(**arguments)
+            else:
+                loop = asyncio.get_running_loop()
+                # Run in a copy of the current context, so context variables are visible to the function
+                self.result = await loop.run_in_executor(
+                    None, partial(copy_context().run, self.function.entrypoint, **arguments)
+                )
+                if isawaitable(self.result):
+                    self.result = await self.result
+            return True
+        except Exception as e:
+            logger.warning(f"Could not run function {self.get_call_str()}")
+            logger.exception(e)
+            self.result = str(e)
+            return False
+
+
+def run_coroutine(coroutine: Awaitable[Any]) -> Any:
+    """Runs a coroutine to completion from synchronous code"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)  # type: ignore
+
+    # The event loop of this thread is busy running the caller, so run the coroutine in a new thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()  # type: ignore
@@ -1,6 +1,7 @@
 from typing import List, Optional, Dict, Any
 
 from phi.tools import Toolkit
+from phi.utils.db import get_engine, SessionFactory
 from phi.utils.log import logger
 
 try:
@@ -9,8 +10,7 @@ except ImportError:
     raise ImportError("`simplejson` not installed")
 
 try:
-    from sqlalchemy import create_engine, Engine, Row
-    from sqlalchemy.orm import Session, sessionmaker
+    from sqlalchemy import Engine, Row
     from sqlalchemy.inspection import inspect
     from sqlalchemy.sql.expression import text
 except ImportError:
@@ -38,19 +38,19 @@ class SQLTools(Toolkit):
         # Get the database engine
         _engine: Optional[Engine] = db_engine
         if _engine is None and db_url is not None:
-            _engine = create_engine(db_url)
+            _engine = get_engine(db_url)
         elif user and password and host and port and dialect:
             if schema is not None:
-                _engine = create_engine(f"{dialect}://{user}:{password}@{host}:{port}/{schema}")
+                _engine = get_engine(f"{dialect}://{user}:{password}@{host}:{port}/{schema}")
             else:
-                _engine = create_engine(f"{dialect}://{user}:{password}@{host}:{port}")
+                _engine = get_engine(f"{dialect}://{user}:{password}@{host}:{port}")
 
         if _engine is None:
             raise ValueError("Could not build the database connection")
 
         # Database connection
         self.db_engine: Engine = _engine
-        self.Session: sessionmaker[Session] = sessionmaker(bind=self.db_engine)
+        self.Session: SessionFactory = SessionFactory(self.db_engine)
 
         # Tables this toolkit can access
         self.tables: Optional[Dict[str, Any]] = tables
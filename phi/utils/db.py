@@ -0,0 +1,208 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock, get_ident
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterator, Optional, TypeVar
+
+from phi.utils.log import logger
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection, Engine
+    from sqlalchemy.ext.asyncio import AsyncEngine
+    from sqlalchemy.orm import Session
+
+# Pool settings for engines created by get_engine(), ignored for sqlite urls
+DEFAULT_POOL_SETTINGS: Dict[str, Any] = {
+    "pool_size": 5,
+    "max_overflow": 10,
+    # Check connections before use, so connections closed by the server are replaced transparently
+    "pool_pre_ping": True,
+    # Replace connections after an hour, before servers or proxies close idle connections
+    "pool_recycle": 3600,
+}
+
+T = TypeVar("T")
+
+_engines: Dict[str, "Engine"] = {}
+_async_engines: Dict[str, "AsyncEngine"] = {}
+_engines_lock = Lock()
+
+
+def get_engine(db_url: str, **engine_kwargs: Any) -> "Engine":
+    """Returns the engine for a database url, creating it on first use.
+
+    All classes connecting to the same url share the engine and its connection pool.
+    The engine is created with DEFAULT_POOL_SETTINGS updated with `engine_kwargs`. As the first call creates
+    the engine, call get_engine(db_url, pool_size=...) at startup to tune the pool for an application.
+    """
+    with _engines_lock:
+        engine = _engines.get(db_url)
+        if engine is not None:
+            if engine_kwargs:
+                logger.debug("Engine already created for this url, ignoring engine arguments")
+            return engine
+
+        from sqlalchemy.engine import create_engine
+
+        kwargs: Dict[str, Any] = {} if db_url.startswith("sqlite") else dict(DEFAULT_POOL_SETTINGS)
+        kwargs.update(engine_kwargs)
+        engine = create_engine(db_url, **kwargs)
+        _engines[db_url] = engine
+        return engine
+
+
+def get_async_engine(db_url: str, **engine_kwargs: Any) -> "AsyncEngine":
+    """Returns the asyncio engine for a database url, creating it on first use.
+
+    The url must use a driver with asyncio support, e.g. postgresql+psycopg or postgresql+asyncpg.
+    Engines are shared and configured like get_engine().
+    """
+    with _engines_lock:
+        engine = _async_engines.get(db_url)
+        if engine is not None:
+            if engine_kwargs:
+                logger.debug("Async engine already created for this url, ignoring engine arguments")
+            return engine
+
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        kwargs: Dict[str, Any] = {} if db_url.startswith("sqlite") else dict(DEFAULT_POOL_SETTINGS)
+        kwargs.update(engine_kwargs)
+        engine = create_async_engine(db_url, **kwargs)
+        _async_engines[db_url] = engine
+        return engine
+
+
+def dispose_engines() -> None:
+    """Close the connections of all engines created by get_engine(), e.g. after forking worker processes.
+    Connections of async engines are discarded without being closed, as this may not run in an event loop.
+    """
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+        for async_engine in _async_engines.values():
+            async_engine.sync_engine.dispose(close=False)
+        _async_engines.clear()
+
+
+class ConnectionScope:
+    """Connections shared by the sessions created within a db_connection_scope(), one per engine"""
+
+    def __init__(self) -> None:
+        # Connections are not thread safe, so they are only shared with sessions created on this thread
+        self.thread_id: int = get_ident()
+        self.connections: Dict[int, "Connection"] = {}
+
+    def get_connection(self, engine: "Engine") -> "Connection":
+        connection = self.connections.get(id(engine))
+        if connection is None or connection.closed:
+            connection = engine.connect()
+            self.connections[id(engine)] = connection
+        return connection
+
+    def close(self) -> None:
+        for connection in self.connections.values():
+            try:
+                connection.close()
+            except Exception as e:
+                logger.warning(f"Error closing connection: {e}")
+        self.connections.clear()
+
+
+_connection_scope: ContextVar[Optional[ConnectionScope]] = ContextVar("phi_db_connection_scope", default=None)
+
+
+@contextmanager
+def db_connection_scope() -> Iterator[None]:
+    """Share one connection per engine between all sessions created by SessionFactory within the scope.
+
+    The connections are checked out on first use and returned to the pool when the scope exits.
+    Nested scopes use the connections of the outermost scope.
+    """
+    if _connection_scope.get() is not None:
+        yield
+        return
+
+    scope = ConnectionScope()
+    token = _connection_scope.set(scope)
+    try:
+        yield
+    finally:
+        _connection_scope.reset(token)
+        scope.close()
+
+
+def iterate_in_connection_scope(iterator: Iterator[T]) -> Iterator[T]:
+    """Iterate over a generator with one connection scope around the whole iteration.
+
+    Use this instead of yielding from within a db_connection_scope(), which would leave the scope set
+    in the context of the caller between items. The scope is only set while the next item is produced.
+    """
+    if _connection_scope.get() is not None:
+        yield from iterator
+        return
+
+    scope = ConnectionScope()
+    try:
+        while True:
+            token = _connection_scope.set(scope)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                _connection_scope.reset(token)
+            yield item
+    finally:
+        scope.close()
+
+
+async def aiterate_in_connection_scope(iterator: AsyncIterator[T]) -> AsyncIterator[T]:
+    """Asynchronous version of iterate_in_connection_scope()"""
+    if _connection_scope.get() is not None:
+        async for item in iterator:
+            yield item
+        return
+
+    scope = ConnectionScope()
+    try:
+        while True:
+            token = _connection_scope.set(scope)
+            try:
+                item = await iterator.__anext__()
+            except StopAsyncIteration:
+                return
+            finally:
+                _connection_scope.reset(token)
+            yield item
+    finally:
+        scope.close()
+
+
+class SessionFactory:
+    """Creates sessions like a sessionmaker.
+
+    Within a db_connection_scope() sessions are bound to the connection of the scope instead of
+    checking out a connection from the pool for every session.
+    """
+
+    def __init__(self, engine: "Engine"):
+        from sqlalchemy.orm import sessionmaker
+
+        self.engine: "Engine" = engine
+        self.sessionmaker = sessionmaker(bind=engine)
+
+    def __call__(self) -> "Session":
+        scope = _connection_scope.get()
+        if scope is not None and scope.thread_id == get_ident():
+            from sqlalchemy.orm import Session
+
+            return Session(bind=scope.get_connection(self.engine))
+        return self.sessionmaker()
+
+    @contextmanager
+    def begin(self) -> Iterator["Session"]:
+        """Returns a session with a transaction which is committed when the block exits"""
+        with self() as session:
+            with session.begin():
+                yield session
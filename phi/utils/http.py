@@ -0,0 +1,131 @@
+from asyncio import get_running_loop
+from importlib.util import find_spec
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Callable, Dict, Tuple, TypeVar
+from weakref import WeakKeyDictionary
+
+from phi.utils.log import logger
+
+if TYPE_CHECKING:
+    import httpx
+
+ClientType = TypeVar("ClientType")
+
+# Connection pool limits for http clients created by create_http_client(), see httpx.Limits
+DEFAULT_HTTP_LIMITS: Dict[str, Any] = {
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    # Keep idle connections open, so consecutive requests skip the TCP and TLS handshakes
+    "keepalive_expiry": 60,
+}
+# Connection pool limits for async http clients created by create_async_http_client(). An async client is shared
+# by every class using it within the event loop, which may run many concurrent requests and streams.
+DEFAULT_ASYNC_HTTP_LIMITS: Dict[str, Any] = {
+    "max_connections": 1000,
+    "max_keepalive_connections": 100,
+    "keepalive_expiry": 60,
+}
+
+_clients: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Any] = {}
+_async_clients: "WeakKeyDictionary[Any, Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Any]]" = WeakKeyDictionary()
+_clients_lock = Lock()
+
+
+def http2_available() -> bool:
+    """HTTP/2 is used if the `h2` package is installed: `pip install httpx[http2]`"""
+    return find_spec("h2") is not None
+
+
+def create_http_client(**httpx_kwargs: Any) -> "httpx.Client":
+    """Returns a httpx.Client using DEFAULT_HTTP_LIMITS and HTTP/2 when available, updated with `httpx_kwargs`"""
+    import httpx
+
+    kwargs: Dict[str, Any] = {"limits": httpx.Limits(**DEFAULT_HTTP_LIMITS), "http2": http2_available()}
+    kwargs.update(httpx_kwargs)
+    return httpx.Client(**kwargs)
+
+
+def create_async_http_client(**httpx_kwargs: Any) -> "httpx.AsyncClient":
+    """Returns a httpx.AsyncClient using DEFAULT_ASYNC_HTTP_LIMITS, otherwise configured like create_http_client()"""
+    import httpx
+
+    kwargs: Dict[str, Any] = {"limits": httpx.Limits(**DEFAULT_ASYNC_HTTP_LIMITS), "http2": http2_available()}
+    kwargs.update(httpx_kwargs)
+    return httpx.AsyncClient(**kwargs)
+
+
+def with_http_client(create_client: Callable[..., ClientType]) -> Callable[..., ClientType]:
+    """Wraps a client constructor accepting a `http_client`, to pass it a client from create_http_client()
+    unless one is provided.
+    """
+
+    def _create_client(**client_params: Any) -> ClientType:
+        if client_params.get("http_client") is None:
+            client_params["http_client"] = create_http_client()
+        return create_client(**client_params)
+
+    return _create_client
+
+
+def with_async_http_client(create_client: Callable[..., ClientType]) -> Callable[..., ClientType]:
+    """Like with_http_client(), for async clients accepting a httpx.AsyncClient"""
+
+    def _create_client(**client_params: Any) -> ClientType:
+        if client_params.get("http_client") is None:
+            client_params["http_client"] = create_async_http_client()
+        return create_client(**client_params)
+
+    return _create_client
+
+
+def get_client_key(provider: str, client_params: Dict[str, Any]) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    # Parameters are compared by their repr, so unhashable values like headers can be part of the key
+    return provider, tuple(sorted((k, repr(v)) for k, v in client_params.items()))
+
+
+def get_client(provider: str, create_client: Callable[..., ClientType], **client_params: Any) -> ClientType:
+    """Returns the client created by `create_client(**client_params)`, creating it on first use.
+
+    All classes using the same provider and client parameters (e.g. base_url and api_key) share the client
+    and its connection pool. Clients reading the api key from the environment read it once, when created.
+    """
+    key = get_client_key(provider, client_params)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            logger.debug(f"Creating {provider} client")
+            client = create_client(**client_params)
+            _clients[key] = client
+        return client
+
+
+def get_async_client(provider: str, create_client: Callable[..., ClientType], **client_params: Any) -> ClientType:
+    """Returns the async client created by `create_client(**client_params)` like get_client().
+
+    Connections of async clients can only be used by the event loop that opened them,
+    so clients are shared within the running event loop.
+    """
+    key = get_client_key(provider, client_params)
+    loop = get_running_loop()
+    with _clients_lock:
+        loop_clients = _async_clients.setdefault(loop, {})
+        client = loop_clients.get(key)
+        if client is None:
+            logger.debug(f"Creating async {provider} client")
+            client = create_client(**client_params)
+            loop_clients[key] = client
+        return client
+
+
+def close_clients() -> None:
+    """Close the sync clients created by get_client(), e.g. after forking worker processes.
+    Async clients are discarded, as their connections can not be closed outside of their event loop.
+    """
+    with _clients_lock:
+        for client in _clients.values():
+            try:
+                client.close()
+            except Exception as e:
+                logger.warning(f"Error closing client: {e}")
+        _clients.clear()
+        _async_clients.clear()
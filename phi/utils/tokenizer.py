@@ -0,0 +1,51 @@
+from typing import Any, List, Optional
+
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+
+
+class Tokenizer(BaseModel):
+    """Base class for tokenizers used to count and split text by tokens"""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def encode(self, text: str) -> List[int]:
+        raise NotImplementedError
+
+    def decode(self, tokens: List[int]) -> str:
+        raise NotImplementedError
+
+    def count_tokens(self, text: str) -> int:
+        return len(self.encode(text))
+
+
+class TiktokenTokenizer(Tokenizer):
+    """Tokenizer using a tiktoken encoding, selected by model name or encoding name"""
+
+    # If provided, the encoding for this model is used
+    model: Optional[str] = None
+    encoding_name: str = "cl100k_base"
+
+    _encoding: Optional[Any] = PrivateAttr(default=None)
+
+    @property
+    def encoding(self) -> Any:
+        if self._encoding is None:
+            try:
+                import tiktoken
+            except ImportError:
+                raise ImportError("`tiktoken` not installed. Please install it via `pip install tiktoken`.")
+
+            if self.model is not None:
+                try:
+                    self._encoding = tiktoken.encoding_for_model(self.model)
+                except KeyError:
+                    self._encoding = tiktoken.get_encoding(self.encoding_name)
+            else:
+                self._encoding = tiktoken.get_encoding(self.encoding_name)
+        return self._encoding
+
+    def encode(self, text: str) -> List[int]:
+        return self.encoding.encode(text, disallowed_special=())
+
+    def decode(self, tokens: List[int]) -> str:
+        return self.encoding.decode(tokens)
@@ -1,12 +1,19 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List
+from functools import partial
+from hashlib import md5
+from typing import Any, Dict, List, Optional, Set
 
 from phi.document import Document
+from phi.vectordb.cache import SearchCache
 
 
 class VectorDb(ABC):
     """Base class for managing Vector Databases"""
 
+    # Cache for query embeddings and search results
+    search_cache: Optional[SearchCache] = None
+
     @abstractmethod
     def create(self) -> None:
         raise NotImplementedError
@@ -15,6 +22,18 @@ class VectorDb(ABC):
     def doc_exists(self, document: Document) -> bool:
         raise NotImplementedError
 
+    def docs_exist(self, documents: List[Document]) -> Set[str]:
+        """Returns the content hashes of the documents which already exist in the vector db.
+
+        Vector dbs should override this to check all documents using a single request.
+        """
+        return {self.get_content_hash(document) for document in documents if self.doc_exists(document)}
+
+    @staticmethod
+    def get_content_hash(document: Document) -> str:
+        cleaned_content = document.content.replace("\x00", "\ufffd")
+        return md5(cleaned_content.encode()).hexdigest()
+
     @abstractmethod
     def name_exists(self, name: str) -> bool:
         raise NotImplementedError
@@ -23,6 +42,13 @@ class VectorDb(ABC):
     def insert(self, documents: List[Document]) -> None:
         raise NotImplementedError
 
+    async def ainsert(self, documents: List[Document]) -> None:
+        """Insert documents without blocking the event loop.
+        Vector dbs with an async client should override this, the default calls insert in a thread.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.insert, documents)
+
     def upsert_available(self) -> bool:
         return False
 
@@ -30,10 +56,73 @@ class VectorDb(ABC):
     def upsert(self, documents: List[Document]) -> None:
         raise NotImplementedError
 
+    async def aupsert(self, documents: List[Document]) -> None:
+        """Upsert documents without blocking the event loop, the default calls upsert in a thread"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.upsert, documents)
+
+    def delete_documents(self, content_hashes: List[str]) -> None:
+        """Delete the documents with the given content hashes"""
+        raise NotImplementedError
+
     @abstractmethod
-    def search(self, query: str, limit: int = 5) -> List[Document]:
+    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        raise NotImplementedError
+
+    async def asearch(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """Search without blocking the event loop, the default calls search in a thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self.search, query, limit, filters=filters))
+
+    def keyword_search_available(self) -> bool:
+        return False
+
+    def keyword_search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """Returns the documents matching the keywords of the query, ordered by relevance"""
         raise NotImplementedError
 
+    def get_query_embedding(self, query: str) -> Optional[List[float]]:
+        """Returns the embedding for a search query, using the search cache if available"""
+        if self.search_cache is not None:
+            cached_embedding = self.search_cache.get_embedding(query)
+            if cached_embedding is not None:
+                return cached_embedding
+
+        query_embedding = self.embedder.get_embedding(query)  # type: ignore
+        if self.search_cache is not None and query_embedding:
+            self.search_cache.set_embedding(query, query_embedding)
+        return query_embedding
+
+    async def aget_query_embedding(self, query: str) -> Optional[List[float]]:
+        """Returns the embedding for a search query without blocking the event loop"""
+        if self.search_cache is not None:
+            cached_embedding = self.search_cache.get_embedding(query)
+            if cached_embedding is not None:
+                return cached_embedding
+
+        query_embedding = await self.embedder.aget_embedding(query)  # type: ignore
+        if self.search_cache is not None and query_embedding:
+            self.search_cache.set_embedding(query, query_embedding)
+        return query_embedding
+
+    def get_cached_results(
+        self, query: str, limit: int, filters: Optional[Dict[str, Any]] = None
+    ) -> Optional[List[Document]]:
+        if self.search_cache is None:
+            return None
+        return self.search_cache.get_results(query=query, limit=limit, filters=filters)
+
+    def cache_results(
+        self, query: str, limit: int, results: List[Document], filters: Optional[Dict[str, Any]] = None
+    ) -> None:
+        if self.search_cache is not None:
+            self.search_cache.set_results(query=query, limit=limit, results=results, filters=filters)
+
+    def invalidate_search_cache(self) -> None:
+        """Clear cached search results after the contents of the vector db change"""
+        if self.search_cache is not None:
+            self.search_cache.clear_results()
+
     @abstractmethod
     def delete(self) -> None:
         raise NotImplementedError
@@ -0,0 +1,110 @@
+import re
+from collections import Counter
+from math import log
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+
+from phi.document import Document
+from phi.vectordb.base import VectorDb
+from phi.vectordb.filters import matches_filters
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class BM25Index(BaseModel):
+    """In-process keyword index ranking documents using Okapi BM25.
+
+    Documents are identified by their content hash, so adding the same document twice indexes it once.
+    """
+
+    # Term frequency saturation
+    k1: float = 1.5
+    # Document length normalization
+    b: float = 0.75
+
+    # Map of term to {content_hash: term frequency}
+    _postings: Dict[str, Dict[str, int]] = PrivateAttr(default_factory=dict)
+    _lengths: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _documents: Dict[str, Document] = PrivateAttr(default_factory=dict)
+    _total_length: int = PrivateAttr(default=0)
+    _lock: Lock = PrivateAttr(default_factory=Lock)
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        return TOKEN_PATTERN.findall(text.lower())
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, documents: List[Document]) -> None:
+        with self._lock:
+            for document in documents:
+                content_hash = VectorDb.get_content_hash(document)
+                if content_hash in self._documents:
+                    continue
+
+                tokens = self.tokenize(document.content)
+                for term, frequency in Counter(tokens).items():
+                    self._postings.setdefault(term, {})[content_hash] = frequency
+                self._lengths[content_hash] = len(tokens)
+                self._total_length += len(tokens)
+                self._documents[content_hash] = Document(
+                    id=document.id, name=document.name, meta_data=document.meta_data, content=document.content
+                )
+
+    def remove(self, content_hashes: List[str]) -> None:
+        with self._lock:
+            for content_hash in content_hashes:
+                document = self._documents.pop(content_hash, None)
+                if document is None:
+                    continue
+
+                for term in set(self.tokenize(document.content)):
+                    postings = self._postings.get(term)
+                    if postings is not None:
+                        postings.pop(content_hash, None)
+                        if len(postings) == 0:
+                            del self._postings[term]
+                self._total_length -= self._lengths.pop(content_hash, 0)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._lengths.clear()
+            self._documents.clear()
+            self._total_length = 0
+
+    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """Returns the documents matching the query and the meta_data filters, ordered by BM25 score"""
+        with self._lock:
+            num_documents = len(self._documents)
+            if num_documents == 0:
+                return []
+
+            average_length = self._total_length / num_documents
+            scores: Dict[str, float] = {}
+            for term in set(self.tokenize(query)):
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+
+                idf = log(1 + (num_documents - len(postings) + 0.5) / (len(postings) + 0.5))
+                for content_hash, frequency in postings.items():
+                    length_norm = 1 - self.b + self.b * self._lengths[content_hash] / average_length
+                    score = idf * frequency * (self.k1 + 1) / (frequency + self.k1 * length_norm)
+                    scores[content_hash] = scores.get(content_hash, 0.0) + score
+
+            if filters:
+                scores = {
+                    content_hash: score
+                    for content_hash, score in scores.items()
+                    if matches_filters(
+                        {"name": self._documents[content_hash].name, **self._documents[content_hash].meta_data}, filters
+                    )
+                }
+            top_hashes = sorted(scores, key=lambda content_hash: scores[content_hash], reverse=True)[:limit]
+            return [self._documents[content_hash].model_copy() for content_hash in top_hashes]
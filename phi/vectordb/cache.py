@@ -0,0 +1,93 @@
+import json
+from collections import OrderedDict
+from copy import deepcopy
+from threading import Lock
+from time import monotonic
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+
+from phi.document import Document
+
+
+class SearchCache(BaseModel):
+    """Least recently used cache for query embeddings and search results, with entries expiring after `ttl` seconds.
+
+    Search results are cleared whenever documents are written to or removed from the vector db.
+    """
+
+    # Maximum number of query embeddings and of search results to keep in the cache
+    max_size: int = 1000
+    # Number of seconds after which an entry expires. Entries never expire if None.
+    ttl: Optional[float] = 300
+    # Cache search results in addition to query embeddings
+    cache_results: bool = True
+
+    _embeddings: "OrderedDict[str, Tuple[float, List[float]]]" = PrivateAttr(default_factory=OrderedDict)
+    _results: "OrderedDict[str, Tuple[float, List[Document]]]" = PrivateAttr(default_factory=OrderedDict)
+    _lock: Lock = PrivateAttr(default_factory=Lock)
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @staticmethod
+    def get_results_key(query: str, limit: int, filters: Optional[Dict[str, Any]] = None) -> str:
+        return json.dumps([query, limit, filters], sort_keys=True, default=str)
+
+    def _get(self, entries: "OrderedDict[str, Tuple[float, Any]]", key: str) -> Optional[Any]:
+        with self._lock:
+            entry = entries.get(key)
+            if entry is None:
+                return None
+            created_at, value = entry
+            if self.ttl is not None and monotonic() - created_at > self.ttl:
+                del entries[key]
+                return None
+            entries.move_to_end(key)
+            return value
+
+    def _set(self, entries: "OrderedDict[str, Tuple[float, Any]]", key: str, value: Any) -> None:
+        with self._lock:
+            entries[key] = (monotonic(), value)
+            entries.move_to_end(key)
+            while len(entries) > self.max_size:
+                entries.popitem(last=False)
+
+    def get_embedding(self, query: str) -> Optional[List[float]]:
+        return self._get(self._embeddings, query)
+
+    def set_embedding(self, query: str, embedding: List[float]) -> None:
+        self._set(self._embeddings, query, embedding)
+
+    def get_results(self, query: str, limit: int, filters: Optional[Dict[str, Any]] = None) -> Optional[List[Document]]:
+        if not self.cache_results:
+            return None
+        results = self._get(self._results, self.get_results_key(query, limit, filters))
+        if results is None:
+            return None
+        # Return copies so callers cannot modify the cached documents
+        return [self.copy_document(document) for document in results]
+
+    def set_results(
+        self, query: str, limit: int, results: List[Document], filters: Optional[Dict[str, Any]] = None
+    ) -> None:
+        if not self.cache_results:
+            return
+        self._set(
+            self._results,
+            self.get_results_key(query, limit, filters),
+            [self.copy_document(document) for document in results],
+        )
+
+    @staticmethod
+    def copy_document(document: Document) -> Document:
+        """Returns a deep copy of the document, including its meta_data and embedding, sharing its embedder"""
+        return deepcopy(document, memo={id(document.embedder): document.embedder})
+
+    def clear_results(self) -> None:
+        with self._lock:
+            self._results.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._embeddings.clear()
+            self._results.clear()
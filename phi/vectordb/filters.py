@@ -0,0 +1,48 @@
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+
+class Range(BaseModel):
+    """Matches meta_data values within a range, e.g. Range(gte=2020, lt=2024)"""
+
+    gt: Optional[Any] = None
+    gte: Optional[Any] = None
+    lt: Optional[Any] = None
+    lte: Optional[Any] = None
+
+    def matches(self, value: Any) -> bool:
+        if value is None:
+            return False
+        try:
+            if self.gt is not None and not value > self.gt:
+                return False
+            if self.gte is not None and not value >= self.gte:
+                return False
+            if self.lt is not None and not value < self.lt:
+                return False
+            if self.lte is not None and not value <= self.lte:
+                return False
+        except TypeError:
+            return False
+        return True
+
+
+def matches_filter(expected: Any, value: Any) -> bool:
+    """Returns True if a value matches a filter value.
+
+    A Range matches values within the range, a list, tuple or set matches any of its values
+    and any other filter value matches equal values.
+    """
+    if isinstance(expected, Range):
+        return expected.matches(value)
+    if isinstance(expected, (list, tuple, set)):
+        return value in expected
+    return value == expected
+
+
+def matches_filters(meta_data: Dict[str, Any], filters: Optional[Dict[str, Any]]) -> bool:
+    """Returns True if the meta_data matches all filters"""
+    if not filters:
+        return True
+    return all(matches_filter(expected, meta_data.get(key)) for key, expected in filters.items())
@@ -1,10 +1,14 @@
 from hashlib import md5
-from typing import List, Optional
+from math import isfinite, sqrt
+from threading import Lock
+from typing import Any, Dict, List, Literal, Optional, Set, cast
 import json
 
 try:
     import lancedb
     import pyarrow as pa
+    from lancedb.query import LanceVectorQueryBuilder
+    from lancedb.table import Table
 except ImportError:
     raise ImportError("`lancedb` not installed.")
 
@@ -12,9 +16,37 @@ from phi.document import Document
 from phi.embedder import Embedder
 from phi.embedder.openai import OpenAIEmbedder
 from phi.vectordb.base import VectorDb
+from phi.vectordb.cache import SearchCache
 from phi.vectordb.distance import Distance
+from phi.vectordb.filters import Range
 from phi.utils.log import logger
 
+# Document fields without a fixed set of keys. Their scalar values are stored in a column per key,
+# named "<field>/<key>", e.g. "meta_data/year".
+DICT_FIELDS = ("meta_data", "usage")
+
+
+def get_arrow_type(value: Any) -> Optional[pa.DataType]:
+    """Returns the type of the column storing a value, or None if the value is stored as json"""
+    if isinstance(value, bool):
+        return pa.bool_()
+    if isinstance(value, int):
+        return pa.int64() if -(2**63) <= value < 2**63 else None
+    if isinstance(value, float):
+        return pa.float64()
+    if isinstance(value, str):
+        return pa.string()
+    return None
+
+
+def fits_arrow_type(value: Any, arrow_type: pa.DataType) -> bool:
+    """Returns True if the value can be stored in a column of the given type"""
+    value_type = get_arrow_type(value)
+    # Integers can be stored in float columns, e.g. a score which is sometimes a whole number
+    return value_type is not None and (
+        value_type == arrow_type or (value_type == pa.int64() and arrow_type == pa.float64())
+    )
+
 
 class LanceDb(VectorDb):
     def __init__(
@@ -25,6 +57,11 @@ class LanceDb(VectorDb):
         uri: Optional[str] = "/tmp/lancedb",
         table_name: Optional[str] = "phi",
         nprobes: Optional[int] = 20,
+        search_cache: Optional[SearchCache] = None,
+        index_num_partitions: Optional[int] = None,
+        index_num_sub_vectors: Optional[int] = None,
+        with_vectors: bool = True,
+        migration_batch_size: int = 1000,
         **kwargs,
     ):
         # Embedder for embedding the document contents
@@ -34,11 +71,26 @@ class LanceDb(VectorDb):
         # Distance metric
         self.distance: Distance = distance
 
+        # Cache for query embeddings and search results
+        self.search_cache: Optional[SearchCache] = search_cache
+
         # Connection to lancedb table, can also be provided to use an existing connection
         self.uri = uri
         self.client = lancedb.connect(self.uri)
         self.nprobes = nprobes
+        # Number of IVF partitions of the index built by optimize().
+        # Defaults to sqrt(number of rows), with at least 256 rows per partition.
+        self.index_num_partitions: Optional[int] = index_num_partitions
+        # Number of PQ sub-vectors of the index built by optimize(). Defaults to dimensions / 16.
+        self.index_num_sub_vectors: Optional[int] = index_num_sub_vectors
+        # Return the embeddings with search results, set to False to read fewer columns
+        self.with_vectors: bool = with_vectors
+        # Number of rows read at a time when migrating a table storing documents in a "payload" column
+        self.migration_batch_size: int = migration_batch_size
+        # Serializes adding columns for new meta_data and usage keys
+        self._columns_lock = Lock()
 
+        self.connection: Table
         if connection:
             if not isinstance(connection, lancedb.db.LanceTable):
                 raise ValueError(
@@ -48,7 +100,7 @@ class LanceDb(VectorDb):
             self.connection = connection
             self.table_name = self.connection.name
             self._vector_col = self.connection.schema.names[0]
-            self._id = self.tbl.schema.names[1]  # type: ignore
+            self._id = self.connection.schema.names[1]
 
         else:
             self.table_name = table_name
@@ -57,29 +109,171 @@ class LanceDb(VectorDb):
         # Lancedb kwargs
         self.kwargs = kwargs
 
-    def create(self) -> lancedb.db.LanceTable:
-        return self._init_table()
+    def create(self) -> Table:
+        self.connection = self._init_table()
+        return self.connection
 
-    def _init_table(self) -> lancedb.db.LanceTable:
-        self._id = "id"
-        self._vector_col = "vector"
-        schema = pa.schema(
+    @property
+    def metric(self) -> Literal["l2", "cosine", "dot"]:
+        if self.distance == Distance.l2:
+            return "l2"
+        if self.distance == Distance.max_inner_product:
+            return "dot"
+        return "cosine"
+
+    def get_schema(self) -> pa.Schema:
+        return pa.schema(
             [
-                pa.field(
-                    self._vector_col,
-                    pa.list_(
-                        pa.float32(),
-                        len(self.embedder.get_embedding("test")),  # type: ignore
-                    ),
-                ),
+                pa.field(self._vector_col, pa.list_(pa.float32(), self.dimensions)),
                 pa.field(self._id, pa.string()),
-                pa.field("payload", pa.string()),
+                pa.field("name", pa.string()),
+                pa.field("content", pa.string()),
+                # meta_data and usage values which are not stored in their own column,
+                # e.g. lists, objects and None, as a json object: {"meta_data": {...}, "usage": {...}}
+                pa.field("json_fields", pa.string()),
             ]
         )
 
+    def _init_table(self) -> Table:
+        self._id = "id"
+        self._vector_col = "vector"
+        schema = self.get_schema()
+
+        if self.table_name in self.client.table_names():
+            tbl = self.client.open_table(self.table_name)
+            if "payload" in tbl.schema.names:
+                self.migrate_payload(tbl)
+            missing_columns = [name for name in schema.names if name not in tbl.schema.names]
+            if len(missing_columns) > 0:
+                raise ValueError(
+                    f"Table {self.table_name} is missing the columns {missing_columns}. "
+                    "Use another table_name, or delete() the table to recreate it."
+                )
+            return tbl
+
         logger.info(f"Creating table: {self.table_name}")
-        tbl = self.client.create_table(self.table_name, schema=schema, mode="overwrite")
-        return tbl
+        return self.client.create_table(self.table_name, schema=schema)
+
+    def migrate_payload(self, tbl: Table) -> None:
+        """
+        Move the documents of a table storing them as json in the "payload" column to the columns of get_schema().
+        The table is updated in place and the payload column is dropped last, so an interrupted migration resumes
+        when the table is opened again.
+        """
+        logger.info(f"Migrating table {self.table_name} from the payload column to columns")
+        new_fields = [field for field in self.get_schema() if field.name not in tbl.schema.names]
+        if len(new_fields) > 0:
+            tbl.add_columns(new_fields)
+
+        reader = tbl.search().select([self._id, "payload"]).limit(None).to_batches(self.migration_batch_size)
+        for batch in reader:
+            rows: Dict[str, Dict[str, Any]] = {}
+            for item in batch.to_pylist():
+                payload = json.loads(item["payload"]) if item["payload"] else {}
+                rows[item[self._id]] = self.get_row(
+                    doc_id=item[self._id],
+                    name=payload.get("name"),
+                    content=payload.get("content"),
+                    fields={field: payload.get(field) for field in DICT_FIELDS},
+                )
+            if len(rows) > 0:
+                data = self.to_arrow(tbl, list(rows.values()))
+                tbl.merge_insert(self._id).when_matched_update_all().execute(data)
+        tbl.drop_columns(["payload"])
+        logger.info(f"Migrated {tbl.count_rows()} rows")
+
+    def get_row(
+        self,
+        doc_id: str,
+        name: Optional[str],
+        content: Optional[str],
+        fields: Dict[str, Optional[Dict[str, Any]]],
+        embedding: Optional[List[float]] = None,
+    ) -> Dict[str, Any]:
+        """Returns the row storing a document, without the columns of meta_data and usage keys added by to_arrow()"""
+        row: Dict[str, Any] = {self._id: doc_id, "name": name, "content": content}
+        if embedding is not None:
+            row[self._vector_col] = embedding
+        row["fields"] = fields
+        return row
+
+    def to_arrow(self, tbl: Table, rows: List[Dict[str, Any]]) -> pa.Table:
+        """
+        Returns rows from get_row() as a pyarrow table with the schema of `tbl`, storing scalar meta_data and usage
+        values in their column and other values in the json_fields column. Columns are added for new keys.
+        """
+        column_types = self.add_dict_columns(tbl, [row["fields"] for row in rows])
+        data: List[Dict[str, Any]] = []
+        for row in rows:
+            fields: Dict[str, Optional[Dict[str, Any]]] = row["fields"]
+            item = {key: value for key, value in row.items() if key != "fields"}
+            json_fields: Dict[str, Dict[str, Any]] = {}
+            for field, values in fields.items():
+                for key, value in (values or {}).items():
+                    column = f"{field}/{key}"
+                    if column in column_types and fits_arrow_type(value, column_types[column]):
+                        item[column] = value
+                    else:
+                        json_fields.setdefault(field, {})[key] = value
+            item["json_fields"] = json.dumps(json_fields) if len(json_fields) > 0 else None
+            data.append(item)
+        schema = pa.schema([field for field in tbl.schema if any(field.name in item for item in data)])
+        return pa.Table.from_pylist(data, schema=schema)
+
+    def add_dict_columns(self, tbl: Table, rows_fields: List[Dict[str, Optional[Dict[str, Any]]]]) -> Dict[str, Any]:
+        """Adds a column for each new meta_data and usage key with a scalar value. Returns the types of the columns."""
+        with self._columns_lock:
+            column_types = {field.name: field.type for field in tbl.schema if field.name.split("/")[0] in DICT_FIELDS}
+            new_types: Dict[str, pa.DataType] = {}
+            for fields in rows_fields:
+                for field, values in fields.items():
+                    for key, value in (values or {}).items():
+                        column = f"{field}/{key}"
+                        value_type = get_arrow_type(value)
+                        # Keys which are not valid column names are stored as json
+                        if column in column_types or value_type is None or key == "" or "." in key or "`" in key:
+                            continue
+                        if column not in new_types or (new_types[column] == pa.int64() and value_type == pa.float64()):
+                            new_types[column] = value_type
+            if len(new_types) == 0:
+                return column_types
+
+            logger.debug(f"Adding columns: {list(new_types)}")
+            try:
+                tbl.add_columns([pa.field(column, value_type) for column, value_type in new_types.items()])
+            except Exception:
+                # The columns may have been added by another process, use the latest version of the table
+                tbl.checkout_latest()
+                if not all(column in tbl.schema.names for column in new_types):
+                    raise
+            return {field.name: field.type for field in tbl.schema if field.name.split("/")[0] in DICT_FIELDS}
+
+    def get_document(self, item: Dict[str, Any]) -> Document:
+        """Returns the document stored in a row"""
+        json_fields = json.loads(item["json_fields"]) if item.get("json_fields") else {}
+        fields: Dict[str, Dict[str, Any]] = {field: {} for field in DICT_FIELDS}
+        for column, value in item.items():
+            field, _, key = column.partition("/")
+            if field in fields and key != "" and value is not None:
+                fields[field][key] = value
+        for field, values in json_fields.items():
+            fields.setdefault(field, {}).update(values)
+        return Document(
+            name=item["name"],
+            meta_data=fields["meta_data"],
+            content=item["content"],
+            embedder=self.embedder,
+            embedding=item.get(self._vector_col),
+            usage=fields["usage"] or None,
+        )
+
+    def get_columns(self) -> List[str]:
+        """Returns the columns read by searches"""
+        columns = [self._id, "name", "content", "json_fields"]
+        columns.extend(name for name in self.connection.schema.names if name.split("/")[0] in DICT_FIELDS)
+        if self.with_vectors:
+            columns.append(self._vector_col)
+        return columns
 
     def doc_exists(self, document: Document) -> bool:
         """
@@ -95,30 +289,53 @@ class LanceDb(VectorDb):
             return len(result) > 0
         return False
 
+    def docs_exist(self, documents: List[Document]) -> Set[str]:
+        """
+        Returns the content hashes of the documents which exist, using an `IN` filter
+
+        Args:
+            documents (List[Document]): Documents to validate
+        """
+        content_hashes = list({self.get_content_hash(document) for document in documents})
+        if len(content_hashes) == 0 or not self.client:
+            return set()
+
+        existing: Set[str] = set()
+        for i in range(0, len(content_hashes), 1000):
+            batch = content_hashes[i : i + 1000]
+            id_list = ", ".join(f"'{doc_id}'" for doc_id in batch)
+            result = (
+                self.connection.search()
+                .where(f"{self._id} IN ({id_list})")
+                .select([self._id])
+                .limit(len(batch))
+                .to_arrow()
+            )
+            existing.update(result[self._id].to_pylist())
+        return existing
+
     def insert(self, documents: List[Document]) -> None:
         logger.debug(f"Inserting {len(documents)} documents")
-        data = []
+        rows = []
+        Document.embed_documents(documents=documents, embedder=self.embedder)
         for document in documents:
-            document.embed(embedder=self.embedder)
             cleaned_content = document.content.replace("\x00", "\ufffd")
             doc_id = str(md5(cleaned_content.encode()).hexdigest())
-            payload = {
-                "name": document.name,
-                "meta_data": document.meta_data,
-                "content": cleaned_content,
-                "usage": document.usage,
-            }
-            data.append(
-                {
-                    "id": doc_id,
-                    "vector": document.embedding,
-                    "payload": json.dumps(payload),
-                }
+            rows.append(
+                self.get_row(
+                    doc_id=doc_id,
+                    name=document.name,
+                    content=cleaned_content,
+                    fields={"meta_data": document.meta_data, "usage": document.usage},
+                    embedding=document.embedding,
+                )
             )
             logger.debug(f"Inserted document: {document.name} ({document.meta_data})")
 
-        self.connection.add(data)
-        logger.debug(f"Upsert {len(data)} documents")
+        if len(rows) > 0:
+            self.connection.add(self.to_arrow(self.connection, rows))
+        logger.debug(f"Upsert {len(rows)} documents")
+        self.invalidate_search_cache()
 
     def upsert(self, documents: List[Document]) -> None:
         """
@@ -130,48 +347,123 @@ class LanceDb(VectorDb):
         logger.debug("Redirecting the request to insert")
         self.insert(documents)
 
-    def search(self, query: str, limit: int = 5) -> List[Document]:
-        query_embedding = self.embedder.get_embedding(query)
+    def delete_documents(self, content_hashes: List[str]) -> None:
+        """
+        Delete the documents with the given content hashes
+
+        Args:
+            content_hashes (List[str]): Content hashes of the documents to delete
+        """
+        for i in range(0, len(content_hashes), 1000):
+            id_list = ", ".join(f"'{doc_id}'" for doc_id in content_hashes[i : i + 1000])
+            self.connection.delete(f"{self._id} IN ({id_list})")
+        logger.debug(f"Deleted {len(content_hashes)} documents")
+        self.invalidate_search_cache()
+
+    def get_where_clause(self, filters: Optional[Dict[str, Any]]) -> Optional[str]:
+        """
+        Compile search filters to a SQL filter, applied before the vector search.
+
+        The "name" key matches the document name, other keys match the column of the meta_data key.
+        A Range matches values within the range, a list, tuple or set matches any of its values
+        and other values match equal values. Values stored in the json_fields column are not matched.
+        """
+        if not filters:
+            return None
+
+        column_types = {field.name: field.type for field in self.connection.schema}
+        conditions = [self.get_filter_condition(key, value, column_types) for key, value in filters.items()]
+        return " AND ".join(conditions)
+
+    def get_filter_condition(self, key: str, value: Any, column_types: Dict[str, pa.DataType]) -> str:
+        column = "name" if key == "name" else f"meta_data/{key}"
+        if column not in column_types:
+            # No document has a value for the key
+            none_matches = value is None or (isinstance(value, (list, tuple, set)) and None in value)
+            return "TRUE" if none_matches else "FALSE"
+
+        column_type = column_types[column]
+        sql_column = f"`{column}`"
+        if isinstance(value, Range):
+            conditions = [f"{sql_column} IS NOT NULL"]
+            for operator, bound in ((">", value.gt), (">=", value.gte), ("<", value.lt), ("<=", value.lte)):
+                if bound is None:
+                    continue
+                if pa.types.is_integer(column_type) and isinstance(bound, float):
+                    # Integer columns can not be compared to float literals
+                    literal = self.get_sql_literal(bound, pa.float64())
+                    conditions.append(f"CAST({sql_column} AS DOUBLE) {operator} {literal}")
+                    continue
+                literal = self.get_sql_literal(bound, column_type)
+                if literal is None:
+                    return "FALSE"
+                conditions.append(f"{sql_column} {operator} {literal}")
+            return "(" + " AND ".join(conditions) + ")"
+        if isinstance(value, (list, tuple, set)):
+            literals = [self.get_sql_literal(v, column_type) for v in value if v is not None]
+            in_list = ", ".join(literal for literal in literals if literal is not None)
+            conditions = [f"{sql_column} IN ({in_list})"] if in_list != "" else []
+            if None in value:
+                conditions.append(f"{sql_column} IS NULL")
+            return "(" + " OR ".join(conditions) + ")" if len(conditions) > 0 else "FALSE"
+        if value is None:
+            return f"{sql_column} IS NULL"
+        literal = self.get_sql_literal(value, column_type)
+        return f"{sql_column} = {literal}" if literal is not None else "FALSE"
+
+    @staticmethod
+    def get_sql_literal(value: Any, column_type: pa.DataType) -> Optional[str]:
+        """Returns the SQL literal of a value compared to a column, or None if the column can not store the value"""
+        if isinstance(value, float) and pa.types.is_integer(column_type) and value.is_integer():
+            value = int(value)
+        if not fits_arrow_type(value, column_type) or (isinstance(value, float) and not isfinite(value)):
+            return None
+        if isinstance(value, bool):
+            return "TRUE" if value else "FALSE"
+        if isinstance(value, (int, float)):
+            return repr(value)
+        return "'" + value.replace("'", "''") + "'"
+
+    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        cached_results = self.get_cached_results(query=query, limit=limit, filters=filters)
+        if cached_results is not None:
+            return cached_results
+
+        query_embedding = self.get_query_embedding(query)
         if query_embedding is None:
             logger.error(f"Error getting embedding for Query: {query}")
             return []
 
-        results = (
-            self.connection.search(
-                query=query_embedding,
-                vector_column_name=self._vector_col,
-            )
-            .limit(limit)
-            .nprobes(self.nprobes)
-            .to_pandas()
-        )
+        query_builder = cast(
+            LanceVectorQueryBuilder,
+            self.connection.search(query=query_embedding, vector_column_name=self._vector_col),
+        ).metric(self.metric)
+        if self.nprobes is not None:
+            query_builder = query_builder.nprobes(self.nprobes)
+        where_clause = self.get_where_clause(filters)
+        if where_clause is not None:
+            query_builder = query_builder.where(where_clause, prefilter=True)
+        results = query_builder.select(self.get_columns()).limit(limit).to_arrow().to_pylist()
 
         # Build search results
         search_results: List[Document] = []
 
         try:
-            for _, item in results.iterrows():
-                payload = json.loads(item["payload"])
-                search_results.append(
-                    Document(
-                        name=payload["name"],
-                        meta_data=payload["meta_data"],
-                        content=payload["content"],
-                        embedder=self.embedder,
-                        embedding=item["vector"],
-                        usage=payload["usage"],
-                    )
-                )
+            for item in results:
+                search_results.append(self.get_document(item))
 
         except Exception as e:
             logger.error(f"Error building search results: {e}")
+            return search_results
 
+        self.cache_results(query=query, limit=limit, results=search_results, filters=filters)
         return search_results
 
     def delete(self) -> None:
         if self.exists():
             logger.debug(f"Deleting collection: {self.table_name}")
-            self.client.drop(self.table_name)
+            self.client.drop_table(self.table_name)
+            self.invalidate_search_cache()
 
     def exists(self) -> bool:
         if self.client:
@@ -181,11 +473,34 @@ class LanceDb(VectorDb):
 
     def get_count(self) -> int:
         if self.exists():
-            return self.client.table(self.table_name).count_rows()
+            return self.client.open_table(self.table_name).count_rows()
         return 0
 
     def optimize(self) -> None:
-        pass
+        """Build an IVF_PQ index on the vector column, replacing the existing index"""
+        num_rows = self.get_count()
+        # Training the PQ codebook requires at least 256 rows
+        if num_rows < 256:
+            logger.debug(f"Not creating an index for {num_rows} rows, searches compare all rows")
+            return
+
+        # Keep at least 256 rows per partition to train its centroid
+        num_partitions = self.index_num_partitions or max(min(int(sqrt(num_rows)), num_rows // 256), 1)
+        num_sub_vectors = self.index_num_sub_vectors
+        if num_sub_vectors is None:
+            # Each sub-vector must cover a whole number of dimensions
+            num_sub_vectors = max(self.dimensions // 16, 1)
+            while self.dimensions % num_sub_vectors != 0:
+                num_sub_vectors -= 1
+
+        logger.info(f"Creating IVF_PQ index with {num_partitions} partitions and {num_sub_vectors} sub-vectors")
+        self.connection.create_index(
+            metric=self.metric,
+            num_partitions=num_partitions,
+            num_sub_vectors=num_sub_vectors,
+            vector_column_name=self._vector_col,
+            replace=True,
+        )
 
     def clear(self) -> bool:
         return False
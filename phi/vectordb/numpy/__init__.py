@@ -0,0 +1,2 @@
+from phi.vectordb.distance import Distance
+from phi.vectordb.numpy.numpydb import NumpyDb
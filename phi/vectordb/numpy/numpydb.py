@@ -0,0 +1,427 @@
+import json
+import os
+from pathlib import Path
+from threading import RLock
+from typing import Any, Dict, List, Optional, Set, Union
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("`numpy` not installed")
+
+from phi.document import Document
+from phi.embedder import Embedder
+from phi.vectordb.base import VectorDb
+from phi.vectordb.bm25 import BM25Index
+from phi.vectordb.cache import SearchCache
+from phi.vectordb.distance import Distance
+from phi.vectordb.filters import matches_filters
+from phi.utils.log import logger
+
+
+class NumpyDb(VectorDb):
+    """Local vector db storing embeddings in a float32 matrix backed by a memory-mapped .npy file.
+
+    The documents are stored in an append-only json lines log alongside the matrix, with the matrix row of each
+    document. The log is compacted when it holds more than twice as many lines as there are documents.
+    Search computes the distance to every row, so it is best suited to collections of up to a few million documents.
+    """
+
+    def __init__(
+        self,
+        collection: str = "phi",
+        path: Union[str, Path] = "storage/numpydb",
+        embedder: Optional[Embedder] = None,
+        distance: Distance = Distance.cosine,
+        initial_capacity: int = 1024,
+        search_cache: Optional[SearchCache] = None,
+    ):
+        # Collection attributes
+        self.collection: str = collection
+        self.path: Path = Path(path)
+
+        # Embedder for embedding the document contents
+        _embedder = embedder
+        if _embedder is None:
+            from phi.embedder.openai import OpenAIEmbedder
+
+            _embedder = OpenAIEmbedder()
+        self.embedder: Embedder = _embedder
+        self.dimensions: int = self.embedder.dimensions
+
+        # Distance metric
+        self.distance: Distance = distance
+
+        # Number of rows allocated when the matrix is created, the matrix doubles in size when full
+        self.initial_capacity: int = max(initial_capacity, 1)
+
+        # Cache for query embeddings and search results
+        self.search_cache: Optional[SearchCache] = search_cache
+
+        # Embedding matrix, only the first len(self.records) rows are used
+        self._matrix: Optional[np.memmap] = None
+        # Norms of the used rows of the matrix
+        self._norms: np.ndarray = np.zeros(0, dtype=np.float32)
+        # Documents in the same order as the matrix rows
+        self._records: List[Dict[str, Any]] = []
+        # Map of document id to row
+        self._rows: Dict[str, int] = {}
+        # Map of content hash to the rows of the documents with that content
+        self._hash_rows: Dict[str, Set[int]] = {}
+        # Number of lines in the records log
+        self._log_lines: int = 0
+        # Keyword index over the documents, built on the first keyword search after the documents change
+        self._keyword_index: Optional[BM25Index] = None
+        self._lock: RLock = RLock()
+
+    @property
+    def matrix_file(self) -> Path:
+        return self.path.joinpath(f"{self.collection}.npy")
+
+    @property
+    def records_file(self) -> Path:
+        return self.path.joinpath(f"{self.collection}.jsonl")
+
+    @property
+    def matrix(self) -> np.memmap:
+        if self._matrix is None:
+            self.create()
+        return self._matrix  # type: ignore
+
+    def create(self) -> None:
+        with self._lock:
+            if self._matrix is not None:
+                return
+
+            if self.exists():
+                logger.debug(f"Loading collection: {self.collection}")
+                self._matrix = np.lib.format.open_memmap(self.matrix_file, mode="r+")
+                self._records = self._read_records()
+                if self._matrix.shape[1] != self.dimensions:
+                    raise ValueError(
+                        f"Collection {self.collection} has {self._matrix.shape[1]} dimensions, "
+                        f"embedder has {self.dimensions}"
+                    )
+            else:
+                logger.debug(f"Creating collection: {self.collection}")
+                self.path.mkdir(parents=True, exist_ok=True)
+                self._matrix = self._new_matrix(self.matrix_file, self.initial_capacity)
+                self._records = []
+                self._write_records()
+
+            self._index_records()
+            self._norms = np.linalg.norm(self._matrix[: len(self._records)], axis=1)
+
+    def _new_matrix(self, file: Path, capacity: int) -> np.memmap:
+        return np.lib.format.open_memmap(file, mode="w+", dtype=np.float32, shape=(capacity, self.dimensions))
+
+    def _ensure_capacity(self, num_rows: int) -> None:
+        """Grow the matrix file so it holds at least `num_rows` rows"""
+        capacity = self.matrix.shape[0]
+        if num_rows <= capacity:
+            return
+
+        while capacity < num_rows:
+            capacity *= 2
+        self._resize(capacity)
+
+    def _resize(self, capacity: int) -> None:
+        logger.debug(f"Resizing collection {self.collection} to {capacity} rows")
+        count = len(self._records)
+        tmp_file = self.matrix_file.with_suffix(".tmp.npy")
+        new_matrix = self._new_matrix(tmp_file, capacity)
+        new_matrix[:count] = self.matrix[:count]
+        new_matrix.flush()
+        del new_matrix
+        self._matrix = None
+        os.replace(tmp_file, self.matrix_file)
+        self._matrix = np.lib.format.open_memmap(self.matrix_file, mode="r+")
+
+    def _index_records(self) -> None:
+        self._rows = {}
+        self._hash_rows = {}
+        for row, record in enumerate(self._records):
+            self._rows[record["id"]] = row
+            self._hash_rows.setdefault(record["content_hash"], set()).add(row)
+
+    def _read_records(self) -> List[Dict[str, Any]]:
+        """Replay the records log, where each line sets the record of a row"""
+        records: List[Dict[str, Any]] = []
+        self._log_lines = 0
+        skipped_lines = False
+        with self.records_file.open() as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # The last line may be partially written if the process stopped while appending
+                    logger.warning(f"Skipping invalid line in {self.records_file}")
+                    skipped_lines = True
+                    continue
+                self._log_lines += 1
+                row = entry["row"]
+                if row == len(records):
+                    records.append(entry["record"])
+                else:
+                    records[row] = entry["record"]
+        if skipped_lines:
+            # Rewrite the log, so new lines are not appended to the invalid line
+            self._records = records
+            self._write_records()
+        return records
+
+    def _write_records(self) -> None:
+        """Compact the records log to one line per record"""
+        # Write to a temporary file first so the records are never left partially written
+        tmp_file = self.records_file.with_suffix(".tmp.jsonl")
+        with tmp_file.open("w") as f:
+            for row, record in enumerate(self._records):
+                f.write(json.dumps({"row": row, "record": record}) + "\n")
+        os.replace(tmp_file, self.records_file)
+        self._log_lines = len(self._records)
+
+    def _persist(self, rows: List[int]) -> None:
+        """Flush the matrix and append the records of the updated rows to the log"""
+        self.matrix.flush()
+        if self._log_lines + len(rows) > 2 * max(len(self._records), self.initial_capacity):
+            self._write_records()
+        else:
+            with self.records_file.open("a") as f:
+                f.writelines(json.dumps({"row": row, "record": self._records[row]}) + "\n" for row in rows)
+            self._log_lines += len(rows)
+        self._keyword_index = None
+
+    def doc_exists(self, document: Document) -> bool:
+        return self.get_content_hash(document) in self.docs_exist([document])
+
+    def docs_exist(self, documents: List[Document]) -> Set[str]:
+        self.create()
+        return {
+            content_hash
+            for content_hash in (self.get_content_hash(document) for document in documents)
+            if content_hash in self._hash_rows
+        }
+
+    def name_exists(self, name: str) -> bool:
+        self.create()
+        return any(record["name"] == name for record in self._records)
+
+    def insert(self, documents: List[Document]) -> None:
+        """Insert documents, replacing stored documents with the same id"""
+        self.upsert(documents)
+
+    def upsert_available(self) -> bool:
+        return True
+
+    def upsert(self, documents: List[Document]) -> None:
+        """
+        Upsert documents into the collection. Documents are identified by their id, or their content hash.
+
+        Args:
+            documents (List[Document]): List of documents to upsert
+        """
+        if len(documents) == 0:
+            return
+
+        self.create()
+        Document.embed_documents(documents=documents, embedder=self.embedder)
+        embedded_documents = [document for document in documents if document.embedding]
+        if len(embedded_documents) < len(documents):
+            logger.error(f"Skipping {len(documents) - len(embedded_documents)} documents without embeddings")
+        documents = embedded_documents
+        with self._lock:
+            new_rows: Dict[str, int] = {}
+            for document in documents:
+                content_hash = self.get_content_hash(document)
+                _id = document.id or content_hash
+                if _id not in self._rows and _id not in new_rows:
+                    new_rows[_id] = len(self._rows) + len(new_rows)
+            self._ensure_capacity(len(self._records) + len(new_rows))
+            self._records.extend([{} for _ in new_rows])
+            self._rows.update(new_rows)
+            self._norms = np.concatenate([self._norms, np.zeros(len(new_rows), dtype=np.float32)])
+
+            updated_rows: List[int] = []
+            for document in documents:
+                content_hash = self.get_content_hash(document)
+                row = self._rows[document.id or content_hash]
+                if self._records[row]:
+                    previous_hash = self._records[row]["content_hash"]
+                    self._hash_rows[previous_hash].discard(row)
+                    if len(self._hash_rows[previous_hash]) == 0:
+                        del self._hash_rows[previous_hash]
+                self._hash_rows.setdefault(content_hash, set()).add(row)
+                updated_rows.append(row)
+                self._records[row] = {
+                    "id": document.id or content_hash,
+                    "name": document.name,
+                    "meta_data": document.meta_data,
+                    "content": document.content,
+                    "usage": document.usage,
+                    "content_hash": content_hash,
+                }
+                self.matrix[row] = document.embedding
+                self._norms[row] = np.linalg.norm(self.matrix[row])
+            # Rows updated more than once are written once
+            self._persist(sorted(set(updated_rows)))
+        logger.debug(f"Upserted {len(documents)} documents")
+        self.invalidate_search_cache()
+
+    def delete_documents(self, content_hashes: List[str]) -> None:
+        """
+        Delete the documents with the given content hashes
+
+        Args:
+            content_hashes (List[str]): Content hashes of the documents to delete
+        """
+        if len(content_hashes) == 0:
+            return
+
+        self.create()
+        with self._lock:
+            rows_to_delete: Set[int] = set()
+            for content_hash in set(content_hashes):
+                rows_to_delete.update(self._hash_rows.get(content_hash, set()))
+            if len(rows_to_delete) == 0:
+                return
+
+            # Compact the matrix so the used rows stay contiguous
+            keep = [row for row in range(len(self._records)) if row not in rows_to_delete]
+            self.matrix[: len(keep)] = self.matrix[keep]
+            self.matrix.flush()
+            self._norms = self._norms[keep]
+            self._records = [self._records[row] for row in keep]
+            self._index_records()
+            # Rows moved, so the log is rewritten
+            self._write_records()
+            self._keyword_index = None
+        logger.debug(f"Deleted {len(content_hashes)} documents")
+        self.invalidate_search_cache()
+
+    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        cached_results = self.get_cached_results(query=query, limit=limit, filters=filters)
+        if cached_results is not None:
+            return cached_results
+
+        query_embedding = self.get_query_embedding(query)
+        if query_embedding is None:
+            logger.error(f"Error getting embedding for Query: {query}")
+            return []
+
+        self.create()
+        with self._lock:
+            count = len(self._records)
+            rows = np.arange(count)
+            if filters is not None:
+                rows = np.array(
+                    [
+                        row
+                        for row, record in enumerate(self._records)
+                        if matches_filters({"name": record["name"], **record["meta_data"]}, filters)
+                    ],
+                    dtype=np.int64,
+                )
+            if len(rows) == 0 or limit <= 0:
+                return []
+
+            vectors = self.matrix[:count] if filters is None else self.matrix[rows]
+            norms = self._norms[rows]
+            query_vector = np.asarray(query_embedding, dtype=np.float32)
+            dot_products = vectors @ query_vector
+
+            # Higher scores are closer
+            if self.distance == Distance.cosine:
+                denominator = norms * np.linalg.norm(query_vector)
+                scores = np.divide(dot_products, denominator, out=np.zeros_like(dot_products), where=denominator > 0)
+            elif self.distance == Distance.l2:
+                # Squared l2 distance without the constant norm of the query
+                scores = 2 * dot_products - norms**2
+            else:
+                scores = dot_products
+
+            k = min(limit, len(rows))
+            top_k = np.argpartition(-scores, k - 1)[:k]
+            top_k = top_k[np.argsort(-scores[top_k])]
+
+            search_results: List[Document] = []
+            for i in top_k:
+                row = int(rows[i])
+                record = self._records[row]
+                search_results.append(
+                    Document(
+                        id=record["id"],
+                        name=record["name"],
+                        meta_data=record["meta_data"],
+                        content=record["content"],
+                        embedder=self.embedder,
+                        embedding=self.matrix[row].tolist(),
+                        usage=record["usage"],
+                    )
+                )
+
+        self.cache_results(query=query, limit=limit, results=search_results, filters=filters)
+        return search_results
+
+    def keyword_search_available(self) -> bool:
+        return True
+
+    def keyword_search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        self.create()
+        with self._lock:
+            if self._keyword_index is None:
+                self._keyword_index = BM25Index()
+                self._keyword_index.add(
+                    [
+                        Document(
+                            id=record["id"],
+                            name=record["name"],
+                            meta_data=record["meta_data"],
+                            content=record["content"],
+                        )
+                        for record in self._records
+                    ]
+                )
+            keyword_index = self._keyword_index
+        return keyword_index.search(query=query, limit=limit, filters=filters)
+
+    def delete(self) -> None:
+        with self._lock:
+            self._matrix = None
+            self._records = []
+            self._rows = {}
+            self._hash_rows = {}
+            self._log_lines = 0
+            self._norms = np.zeros(0, dtype=np.float32)
+            self._keyword_index = None
+            if self.exists():
+                logger.debug(f"Deleting collection: {self.collection}")
+                self.matrix_file.unlink()
+                self.records_file.unlink()
+        self.invalidate_search_cache()
+
+    def exists(self) -> bool:
+        return self.matrix_file.exists() and self.records_file.exists()
+
+    def get_count(self) -> int:
+        self.create()
+        return len(self._records)
+
+    def optimize(self) -> None:
+        """Shrink the matrix file to the number of stored documents"""
+        self.create()
+        with self._lock:
+            capacity = max(len(self._records), self.initial_capacity)
+            if capacity < self.matrix.shape[0]:
+                self._resize(capacity)
+
+    def clear(self) -> bool:
+        self.create()
+        with self._lock:
+            self._records = []
+            self._rows = {}
+            self._hash_rows = {}
+            self._norms = np.zeros(0, dtype=np.float32)
+            self._keyword_index = None
+            self._write_records()
+        self.invalidate_search_cache()
+        return True
@@ -0,0 +1,115 @@
+from time import perf_counter
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from phi.vectordb.pgvector.index import Ivfflat, HNSW
+from phi.vectordb.pgvector.pgvector2 import PgVector2
+from phi.utils.log import logger
+
+
+class RecallResult(BaseModel):
+    """Recall and latency of approximate searches using one value of the index search parameter"""
+
+    # Search parameter, "ef_search" for HNSW indexes and "probes" for Ivfflat indexes
+    parameter: str
+    value: int
+    limit: int
+    # Average fraction of the exact top `limit` results returned by the approximate search
+    recall: float
+    mean_latency_ms: float
+    p95_latency_ms: float
+
+
+def benchmark_recall(
+    vector_db: PgVector2,
+    limit: int = 10,
+    sample_size: int = 100,
+    values: Optional[List[int]] = None,
+) -> List[RecallResult]:
+    """
+    Measure recall@limit and latency of the vector index against exact search, using the embeddings
+    of `sample_size` random rows as queries.
+
+    Args:
+        vector_db (PgVector2): Vector db with a HNSW or Ivfflat index
+        limit (int): Number of results per search
+        sample_size (int): Number of queries
+        values (Optional[List[int]]): Values of ef_search (HNSW) or probes (Ivfflat) to benchmark.
+            Defaults to multiples of limit for HNSW and powers of 2 up to the number of lists for Ivfflat.
+    """
+    index = vector_db.index
+    if not isinstance(index, (HNSW, Ivfflat)):
+        raise ValueError("Recall can only be measured for a HNSW or Ivfflat index")
+
+    parameter = "ef_search" if isinstance(index, HNSW) else "probes"
+    if values is None:
+        if isinstance(index, HNSW):
+            values = [limit, 2 * limit, 4 * limit, 8 * limit, 16 * limit]
+        else:
+            index_state = vector_db.get_index_state(index.name) if index.name is not None else None
+            num_lists = (index_state or {}).get("lists") or index.lists
+            values = sorted({min(2**i, num_lists) for i in range(num_lists.bit_length() + 1)})
+
+    queries = vector_db.sample_embeddings(sample_size)
+    if len(queries) == 0:
+        logger.warning("No embeddings to benchmark")
+        return []
+
+    logger.debug(f"Computing exact results for {len(queries)} queries")
+    exact_ids = [
+        {document.id for document in vector_db.search_by_embedding(query, limit=limit, exact=True)} for query in queries
+    ]
+
+    results: List[RecallResult] = []
+    for value in values:
+        latencies: List[float] = []
+        recalls: List[float] = []
+        for query, expected_ids in zip(queries, exact_ids):
+            start = perf_counter()
+            documents = vector_db.search_by_embedding(query, limit=limit, **{parameter: value})  # type: ignore
+            latencies.append((perf_counter() - start) * 1000)
+            if len(expected_ids) > 0:
+                recalls.append(len(expected_ids & {document.id for document in documents}) / len(expected_ids))
+
+        latencies.sort()
+        result = RecallResult(
+            parameter=parameter,
+            value=value,
+            limit=limit,
+            recall=sum(recalls) / len(recalls) if recalls else 1.0,
+            mean_latency_ms=sum(latencies) / len(latencies),
+            p95_latency_ms=latencies[min(int(0.95 * len(latencies)), len(latencies) - 1)],
+        )
+        logger.info(
+            f"{parameter}={value}: recall@{limit}={result.recall:.3f}, "
+            f"mean latency={result.mean_latency_ms:.1f}ms, p95 latency={result.p95_latency_ms:.1f}ms"
+        )
+        results.append(result)
+    return results
+
+
+def tune_recall(
+    vector_db: PgVector2,
+    recall_target: float = 0.95,
+    limit: int = 10,
+    sample_size: int = 100,
+    values: Optional[List[int]] = None,
+) -> Optional[RecallResult]:
+    """
+    Set the default ef_search (HNSW) or probes (Ivfflat) of the vector db to the smallest benchmarked value
+    reaching `recall_target`, or the largest value if none reaches it. Returns the chosen result.
+    """
+    results = benchmark_recall(vector_db=vector_db, limit=limit, sample_size=sample_size, values=values)
+    if len(results) == 0:
+        return None
+
+    chosen = next((result for result in results if result.recall >= recall_target), results[-1])
+    if chosen.recall < recall_target:
+        logger.warning(f"Recall target {recall_target} not reached, best recall: {chosen.recall:.3f}")
+    if isinstance(vector_db.index, HNSW):
+        vector_db.index.ef_search = chosen.value
+    elif isinstance(vector_db.index, Ivfflat):
+        vector_db.index.probes = chosen.value
+    logger.info(f"Using {chosen.parameter}={chosen.value} for a recall target of {recall_target}")
+    return chosen
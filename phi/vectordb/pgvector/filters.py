@@ -0,0 +1,58 @@
+from typing import Any
+
+try:
+    from sqlalchemy.schema import Table
+    from sqlalchemy.sql.expression import and_, or_, true, false, ColumnElement
+    from sqlalchemy.types import Float
+except ImportError:
+    raise ImportError("`sqlalchemy` not installed")
+
+from phi.vectordb.filters import Range
+
+
+def get_filter_clause(table: Table, key: str, value: Any) -> ColumnElement:
+    """
+    Compile a search filter to a where clause on a table with a jsonb meta_data column.
+
+    Keys which are columns of the table are compared to the column, other keys are compared to the
+    meta_data field with that name. A Range matches values within the range, a list, tuple or set
+    matches any of its values and other values match equal values. Equality uses the jsonb
+    containment operator so it can use a GIN index on meta_data.
+    """
+    if key != "meta_data" and hasattr(table.c, key):
+        column = getattr(table.c, key)
+        if isinstance(value, Range):
+            conditions = []
+            if value.gt is not None:
+                conditions.append(column > value.gt)
+            if value.gte is not None:
+                conditions.append(column >= value.gte)
+            if value.lt is not None:
+                conditions.append(column < value.lt)
+            if value.lte is not None:
+                conditions.append(column <= value.lte)
+            return and_(*conditions) if conditions else true()
+        if isinstance(value, (list, tuple, set)):
+            return column.in_(list(value))
+        return column == value
+
+    meta_data = table.c.meta_data
+    if isinstance(value, Range):
+        bounds = [v for v in (value.gt, value.gte, value.lt, value.lte) if v is not None]
+        # Compare numbers numerically and other values, e.g. ISO dates, as text
+        is_numeric = len(bounds) > 0 and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in bounds)
+        field = meta_data[key].astext.cast(Float) if is_numeric else meta_data[key].astext
+        conditions = []
+        if value.gt is not None:
+            conditions.append(field > value.gt)
+        if value.gte is not None:
+            conditions.append(field >= value.gte)
+        if value.lt is not None:
+            conditions.append(field < value.lt)
+        if value.lte is not None:
+            conditions.append(field <= value.lte)
+        # Only match documents which have the field
+        return and_(meta_data.has_key(key), *conditions)
+    if isinstance(value, (list, tuple, set)):
+        return or_(false(), *[meta_data.contains({key: v}) for v in value])
+    return meta_data.contains({key: value})
@@ -8,6 +8,11 @@ class Ivfflat(BaseModel):
     lists: int = 100
     probes: int = 10
     dynamic_lists: bool = True
+    # Rebuild the index when the number of lists for the current number of rows
+    # differs from the number of lists of the index by this factor
+    rebuild_factor: float = 2.0
+    # Build the index without blocking writes to the table
+    concurrently: bool = True
     configuration: Dict[str, Any] = {
         "maintenance_work_mem": "2GB",
     }
@@ -18,6 +23,8 @@ class HNSW(BaseModel):
     m: int = 16
     ef_search: int = 5
     ef_construction: int = 200
+    # Build the index without blocking writes to the table
+    concurrently: bool = True
     configuration: Dict[str, Any] = {
         "maintenance_work_mem": "2GB",
     }
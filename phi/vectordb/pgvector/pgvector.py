@@ -1,13 +1,12 @@
-from typing import Optional, List, Union
+from typing import Optional, List, Union, Dict, Any, Set
 from hashlib import md5
 
 try:
     from sqlalchemy.dialects import postgresql
-    from sqlalchemy.engine import create_engine, Engine
+    from sqlalchemy.engine import Engine
     from sqlalchemy.inspection import inspect
-    from sqlalchemy.orm import Session, sessionmaker
     from sqlalchemy.schema import MetaData, Table, Column
-    from sqlalchemy.sql.expression import text, func, select
+    from sqlalchemy.sql.expression import text, func, select, bindparam, any_
     from sqlalchemy.types import DateTime, String
 except ImportError:
     raise ImportError("`sqlalchemy` not installed")
@@ -20,8 +19,11 @@ except ImportError:
 from phi.document import Document
 from phi.embedder import Embedder
 from phi.vectordb.base import VectorDb
+from phi.vectordb.cache import SearchCache
 from phi.vectordb.distance import Distance
+from phi.vectordb.pgvector.filters import get_filter_clause
 from phi.vectordb.pgvector.index import Ivfflat, HNSW
+from phi.utils.db import get_engine, SessionFactory
 from phi.utils.log import logger
 
 
@@ -35,10 +37,11 @@ class PgVector(VectorDb):
         embedder: Optional[Embedder] = None,
         distance: Distance = Distance.cosine,
         index: Optional[Union[Ivfflat, HNSW]] = HNSW(),
+        search_cache: Optional[SearchCache] = None,
     ):
         _engine: Optional[Engine] = db_engine
         if _engine is None and db_url is not None:
-            _engine = create_engine(db_url)
+            _engine = get_engine(db_url)
 
         if _engine is None:
             raise ValueError("Must provide either db_url or db_engine")
@@ -67,8 +70,11 @@ class PgVector(VectorDb):
         # Index for the collection
         self.index: Optional[Union[Ivfflat, HNSW]] = index
 
+        # Cache for query embeddings and search results
+        self.search_cache: Optional[SearchCache] = search_cache
+
         # Database session
-        self.Session: sessionmaker[Session] = sessionmaker(bind=self.db_engine)
+        self.Session: SessionFactory = SessionFactory(self.db_engine)
 
         # Database table for the collection
         self.table: Table = self.get_table()
@@ -123,6 +129,24 @@ class PgVector(VectorDb):
                 result = sess.execute(stmt).first()
                 return result is not None
 
+    def docs_exist(self, documents: List[Document]) -> Set[str]:
+        """
+        Returns the content hashes of the documents which exist, using a single query
+
+        Args:
+            documents (List[Document]): Documents to validate
+        """
+        content_hashes = list({self.get_content_hash(document) for document in documents})
+        if len(content_hashes) == 0:
+            return set()
+
+        hashes_param = bindparam("content_hashes", value=content_hashes, type_=postgresql.ARRAY(String))
+        with self.Session() as sess:
+            with sess.begin():
+                stmt = select(self.table.c.content_hash).where(self.table.c.content_hash == any_(hashes_param))
+                result = sess.execute(stmt).scalars().all()
+                return set(result)
+
     def name_exists(self, name: str) -> bool:
         """
         Validate if a row with this name exists or not
@@ -139,8 +163,8 @@ class PgVector(VectorDb):
     def insert(self, documents: List[Document], batch_size: int = 10) -> None:
         with self.Session() as sess:
             counter = 0
+            Document.embed_documents(documents=documents, embedder=self.embedder)
             for document in documents:
-                document.embed(embedder=self.embedder)
                 cleaned_content = document.content.replace("\x00", "\ufffd")
                 stmt = postgresql.insert(self.table).values(
                     name=document.name,
@@ -164,6 +188,7 @@ class PgVector(VectorDb):
             if counter > 0:
                 sess.commit()
                 logger.debug(f"Committed {counter} documents")
+        self.invalidate_search_cache()
 
     def upsert(self, documents: List[Document]) -> None:
         """
@@ -174,8 +199,8 @@ class PgVector(VectorDb):
         """
         with self.Session() as sess:
             with sess.begin():
+                Document.embed_documents(documents=documents, embedder=self.embedder)
                 for document in documents:
-                    document.embed(embedder=self.embedder)
                     cleaned_content = document.content.replace("\x00", "\ufffd")
                     stmt = postgresql.insert(self.table).values(
                         name=document.name,
@@ -196,9 +221,34 @@ class PgVector(VectorDb):
                     )
                     sess.execute(stmt)
                     logger.debug(f"Upserted document: {document.name} ({document.meta_data})")
+        self.invalidate_search_cache()
+
+    def delete_documents(self, content_hashes: List[str]) -> None:
+        """
+        Delete the documents with the given content hashes
+
+        Args:
+            content_hashes (List[str]): Content hashes of the documents to delete
+        """
+        from sqlalchemy import delete
+
+        if len(content_hashes) == 0:
+            return
+
+        hashes_param = bindparam("content_hashes", value=content_hashes, type_=postgresql.ARRAY(String))
+        with self.Session() as sess:
+            with sess.begin():
+                stmt = delete(self.table).where(self.table.c.content_hash == any_(hashes_param))
+                sess.execute(stmt)
+                logger.debug(f"Deleted {len(content_hashes)} documents")
+        self.invalidate_search_cache()
 
-    def search(self, query: str, limit: int = 5) -> List[Document]:
-        query_embedding = self.embedder.get_embedding(query)
+    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        cached_results = self.get_cached_results(query=query, limit=limit, filters=filters)
+        if cached_results is not None:
+            return cached_results
+
+        query_embedding = self.get_query_embedding(query)
         if query_embedding is None:
             logger.error(f"Error getting embedding for Query: {query}")
             return []
@@ -212,6 +262,11 @@ class PgVector(VectorDb):
         ]
 
         stmt = select(*columns)
+
+        if filters is not None:
+            for key, value in filters.items():
+                stmt = stmt.where(get_filter_clause(self.table, key, value))
+
         if self.distance == Distance.l2:
             stmt = stmt.order_by(self.table.c.embedding.max_inner_product(query_embedding))
         if self.distance == Distance.cosine:
@@ -246,12 +301,14 @@ class PgVector(VectorDb):
                 )
             )
 
+        self.cache_results(query=query, limit=limit, results=search_results, filters=filters)
         return search_results
 
     def delete(self) -> None:
         if self.table_exists():
             logger.debug(f"Deleting table: {self.collection}")
             self.table.drop(self.db_engine)
+            self.invalidate_search_cache()
 
     def exists(self) -> bool:
         return self.table_exists()
@@ -335,4 +392,5 @@ class PgVector(VectorDb):
             with sess.begin():
                 stmt = delete(self.table)
                 sess.execute(stmt)
-                return True
+        self.invalidate_search_cache()
+        return True
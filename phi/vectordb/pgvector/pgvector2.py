@@ -1,13 +1,27 @@
-from typing import Optional, List, Union, Dict, Any
+import asyncio
+import json
+from functools import partial
+from typing import Optional, List, Union, Dict, Any, Set
 from hashlib import md5
 
 try:
     from sqlalchemy.dialects import postgresql
-    from sqlalchemy.engine import create_engine, Engine
+    from sqlalchemy.engine import Engine, Row
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
     from sqlalchemy.inspection import inspect
-    from sqlalchemy.orm import Session, sessionmaker
+    from sqlalchemy.orm import Session
     from sqlalchemy.schema import MetaData, Table, Column
-    from sqlalchemy.sql.expression import text, func, select
+    from sqlalchemy.sql.expression import (
+        text,
+        func,
+        select,
+        bindparam,
+        any_,
+        literal_column,
+        ColumnElement,
+        Select,
+        TextClause,
+    )
     from sqlalchemy.types import DateTime, String
 except ImportError:
     raise ImportError("`sqlalchemy` not installed")
@@ -20,8 +34,11 @@ except ImportError:
 from phi.document import Document
 from phi.embedder import Embedder
 from phi.vectordb.base import VectorDb
+from phi.vectordb.cache import SearchCache
 from phi.vectordb.distance import Distance
+from phi.vectordb.pgvector.filters import get_filter_clause
 from phi.vectordb.pgvector.index import Ivfflat, HNSW
+from phi.utils.db import get_async_engine, get_engine, SessionFactory
 from phi.utils.log import logger
 
 
@@ -32,13 +49,19 @@ class PgVector2(VectorDb):
         schema: Optional[str] = "ai",
         db_url: Optional[str] = None,
         db_engine: Optional[Engine] = None,
+        async_db_engine: Optional[AsyncEngine] = None,
         embedder: Optional[Embedder] = None,
         distance: Distance = Distance.cosine,
         index: Optional[Union[Ivfflat, HNSW]] = HNSW(),
+        batch_size: int = 100,
+        use_copy: bool = False,
+        search_cache: Optional[SearchCache] = None,
+        text_search_config: str = "english",
+        keyword_index: bool = False,
     ):
         _engine: Optional[Engine] = db_engine
         if _engine is None and db_url is not None:
-            _engine = create_engine(db_url)
+            _engine = get_engine(db_url)
 
         if _engine is None:
             raise ValueError("Must provide either db_url or db_engine")
@@ -50,6 +73,12 @@ class PgVector2(VectorDb):
         # Database attributes
         self.db_url: Optional[str] = db_url
         self.db_engine: Engine = _engine
+        # Engine used by asearch(). Created from db_url for the psycopg (v3) driver, which supports asyncio.
+        # For other drivers, provide an async engine, e.g. for postgresql+asyncpg, or searches run in a thread.
+        _async_engine: Optional[AsyncEngine] = async_db_engine
+        if _async_engine is None and db_url is not None and self.db_engine.dialect.driver == "psycopg":
+            _async_engine = get_async_engine(db_url)
+        self.async_db_engine: Optional[AsyncEngine] = _async_engine
         self.metadata: MetaData = MetaData(schema=self.schema)
 
         # Embedder for embedding the document contents
@@ -67,8 +96,25 @@ class PgVector2(VectorDb):
         # Index for the collection
         self.index: Optional[Union[Ivfflat, HNSW]] = index
 
+        # Number of documents to embed and write in a single statement and transaction
+        self.batch_size: int = batch_size
+        # Use COPY instead of INSERT when inserting documents. Requires the psycopg (v3) driver.
+        # Useful for initial loads as COPY does not handle conflicts with existing rows.
+        self.use_copy: bool = use_copy
+
+        # Cache for query embeddings and search results
+        self.search_cache: Optional[SearchCache] = search_cache
+
+        # Postgres text search configuration used for keyword search
+        if not text_search_config.replace("_", "").isalnum():
+            raise ValueError(f"Invalid text search configuration: {text_search_config}")
+        self.text_search_config: str = text_search_config
+        # Create the GIN index used by keyword_search() in optimize(), enable when using hybrid search.
+        # Without it, keyword searches scan the table but inserts do not have to update the index.
+        self.keyword_index: bool = keyword_index
+
         # Database session
-        self.Session: sessionmaker[Session] = sessionmaker(bind=self.db_engine)
+        self.Session: SessionFactory = SessionFactory(self.db_engine)
 
         # Database table for the collection
         self.table: Table = self.get_table()
@@ -124,6 +170,24 @@ class PgVector2(VectorDb):
                 result = sess.execute(stmt).first()
                 return result is not None
 
+    def docs_exist(self, documents: List[Document]) -> Set[str]:
+        """
+        Returns the content hashes of the documents which exist, using a single query
+
+        Args:
+            documents (List[Document]): Documents to validate
+        """
+        content_hashes = list({self.get_content_hash(document) for document in documents})
+        if len(content_hashes) == 0:
+            return set()
+
+        hashes_param = bindparam("content_hashes", value=content_hashes, type_=postgresql.ARRAY(String))
+        with self.Session() as sess:
+            with sess.begin():
+                stmt = select(self.table.c.content_hash).where(self.table.c.content_hash == any_(hashes_param))
+                result = sess.execute(stmt).scalars().all()
+                return set(result)
+
     def name_exists(self, name: str) -> bool:
         """
         Validate if a row with this name exists or not
@@ -150,65 +214,91 @@ class PgVector2(VectorDb):
                 result = sess.execute(stmt).first()
                 return result is not None
 
-    def insert(self, documents: List[Document], batch_size: int = 10) -> None:
-        with self.Session() as sess:
-            counter = 0
-            for document in documents:
-                document.embed(embedder=self.embedder)
-                cleaned_content = document.content.replace("\x00", "\ufffd")
-                content_hash = md5(cleaned_content.encode()).hexdigest()
-                _id = document.id or content_hash
-                stmt = postgresql.insert(self.table).values(
-                    id=_id,
-                    name=document.name,
-                    meta_data=document.meta_data,
-                    content=cleaned_content,
-                    embedding=document.embedding,
-                    usage=document.usage,
-                    content_hash=content_hash,
-                )
-                sess.execute(stmt)
-                counter += 1
-                logger.debug(f"Inserted document: {document.name} ({document.meta_data})")
+    def get_row(self, document: Document) -> Dict[str, Any]:
+        cleaned_content = document.content.replace("\x00", "\ufffd")
+        content_hash = md5(cleaned_content.encode()).hexdigest()
+        return dict(
+            id=document.id or content_hash,
+            name=document.name,
+            meta_data=document.meta_data,
+            content=cleaned_content,
+            embedding=document.embedding,
+            usage=document.usage,
+            content_hash=content_hash,
+        )
+
+    def insert(self, documents: List[Document], batch_size: Optional[int] = None) -> None:
+        """
+        Insert documents into the database using one multi-row INSERT (or COPY) per batch.
 
-                # Commit every `batch_size` documents
-                if counter >= batch_size:
-                    sess.commit()
-                    logger.info(f"Committed {counter} documents")
-                    counter = 0
+        Args:
+            documents (List[Document]): List of documents to insert
+            batch_size (Optional[int]): Number of documents per statement and transaction. Defaults to self.batch_size.
+        """
+        _batch_size = batch_size or self.batch_size
+        use_copy = self.use_copy
+        if use_copy and self.db_engine.dialect.driver != "psycopg":
+            logger.warning(f"COPY requires the psycopg driver, got: {self.db_engine.dialect.driver}. Using INSERT.")
+            use_copy = False
 
-            # Commit any remaining documents
-            if counter > 0:
+        with self.Session() as sess:
+            for i in range(0, len(documents), _batch_size):
+                batch = documents[i : i + _batch_size]
+                # Embed the batch using as few requests to the embedder as possible
+                Document.embed_documents(documents=batch, embedder=self.embedder)
+                rows = [self.get_row(document) for document in batch]
+                if use_copy:
+                    self.copy_rows(sess, rows)
+                else:
+                    sess.execute(postgresql.insert(self.table).values(rows))
                 sess.commit()
-                logger.info(f"Committed {counter} documents")
+                logger.info(f"Committed {len(rows)} documents")
+        self.invalidate_search_cache()
+
+    def copy_rows(self, sess: Session, rows: List[Dict[str, Any]]) -> None:
+        """Write rows using COPY ... FROM STDIN on the connection of the session, in its transaction"""
+        from psycopg.types.json import Jsonb
+
+        columns = ["id", "name", "meta_data", "content", "embedding", "usage", "content_hash"]
+        dbapi_connection = sess.connection().connection.driver_connection
+        if dbapi_connection is None:
+            raise RuntimeError("The session has no database connection to COPY rows with")
+        with dbapi_connection.cursor() as cursor:
+            with cursor.copy(f"COPY {self.table} ({', '.join(columns)}) FROM STDIN") as copy:
+                for row in rows:
+                    embedding = row["embedding"]
+                    copy.write_row(
+                        (
+                            row["id"],
+                            row["name"],
+                            Jsonb(row["meta_data"]),
+                            row["content"],
+                            "[" + ",".join(str(v) for v in embedding) + "]" if embedding is not None else None,
+                            Jsonb(row["usage"]) if row["usage"] is not None else None,
+                            row["content_hash"],
+                        )
+                    )
 
     def upsert_available(self) -> bool:
         return True
 
-    def upsert(self, documents: List[Document], batch_size: int = 20) -> None:
+    def upsert(self, documents: List[Document], batch_size: Optional[int] = None) -> None:
         """
-        Upsert documents into the database.
+        Upsert documents into the database using one multi-row INSERT ... ON CONFLICT per batch.
 
         Args:
             documents (List[Document]): List of documents to upsert
-            batch_size (int): Batch size for upserting documents
+            batch_size (Optional[int]): Number of documents per statement and transaction. Defaults to self.batch_size.
         """
+        _batch_size = batch_size or self.batch_size
         with self.Session() as sess:
-            counter = 0
-            for document in documents:
-                document.embed(embedder=self.embedder)
-                cleaned_content = document.content.replace("\x00", "\ufffd")
-                content_hash = md5(cleaned_content.encode()).hexdigest()
-                _id = document.id or content_hash
-                stmt = postgresql.insert(self.table).values(
-                    id=_id,
-                    name=document.name,
-                    meta_data=document.meta_data,
-                    content=cleaned_content,
-                    embedding=document.embedding,
-                    usage=document.usage,
-                    content_hash=content_hash,
-                )
+            for i in range(0, len(documents), _batch_size):
+                batch = documents[i : i + _batch_size]
+                # Embed the batch using as few requests to the embedder as possible
+                Document.embed_documents(documents=batch, embedder=self.embedder)
+                # A row can only be affected once per statement, so keep the last document for each id
+                rows = list({row["id"]: row for row in (self.get_row(document) for document in batch)}.values())
+                stmt = postgresql.insert(self.table).values(rows)
                 # Update row when id matches but 'content_hash' is different
                 stmt = stmt.on_conflict_do_update(
                     index_elements=["id"],
@@ -222,27 +312,167 @@ class PgVector2(VectorDb):
                     ),
                 )
                 sess.execute(stmt)
-                counter += 1
-                logger.debug(f"Upserted document: {document.id} | {document.name} | {document.meta_data}")
+                sess.commit()
+                logger.info(f"Committed {len(rows)} documents")
+        self.invalidate_search_cache()
 
-                # Commit every `batch_size` documents
-                if counter >= batch_size:
-                    sess.commit()
-                    logger.info(f"Committed {counter} documents")
-                    counter = 0
+    def delete_documents(self, content_hashes: List[str]) -> None:
+        """
+        Delete the documents with the given content hashes
 
-            # Commit any remaining documents
-            if counter > 0:
-                sess.commit()
-                logger.info(f"Committed {counter} documents")
+        Args:
+            content_hashes (List[str]): Content hashes of the documents to delete
+        """
+        from sqlalchemy import delete
+
+        if len(content_hashes) == 0:
+            return
+
+        hashes_param = bindparam("content_hashes", value=content_hashes, type_=postgresql.ARRAY(String))
+        with self.Session() as sess:
+            with sess.begin():
+                stmt = delete(self.table).where(self.table.c.content_hash == any_(hashes_param))
+                sess.execute(stmt)
+                logger.debug(f"Deleted {len(content_hashes)} documents")
+        self.invalidate_search_cache()
+
+    def search(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> List[Document]:
+        """
+        Search for the documents closest to the query.
 
-    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
-        query_embedding = self.embedder.get_embedding(query)
+        Args:
+            query (str): Query to search for
+            limit (int): Maximum number of documents to return
+            filters (Optional[Dict[str, Any]]): Filters on columns or meta_data fields, see get_filter_clause()
+            ef_search (Optional[int]): Size of the HNSW candidate list for this search, higher values improve recall.
+                Defaults to the larger of HNSW.ef_search and limit.
+            probes (Optional[int]): Number of Ivfflat lists to search, higher values improve recall.
+                Defaults to Ivfflat.probes.
+        """
+        # Results depend on the search parameters, so only searches using the defaults are cached
+        use_cache = ef_search is None and probes is None
+        if use_cache:
+            cached_results = self.get_cached_results(query=query, limit=limit, filters=filters)
+            if cached_results is not None:
+                return cached_results
+
+        query_embedding = self.get_query_embedding(query)
+        if query_embedding is None:
+            logger.error(f"Error getting embedding for Query: {query}")
+            return []
+
+        search_results = self.search_by_embedding(
+            query_embedding=query_embedding, limit=limit, filters=filters, ef_search=ef_search, probes=probes
+        )
+        if use_cache:
+            self.cache_results(query=query, limit=limit, results=search_results, filters=filters)
+        return search_results
+
+    def get_search_settings(
+        self, limit: int, ef_search: Optional[int] = None, probes: Optional[int] = None
+    ) -> Dict[str, int]:
+        """Returns the index settings for a search returning `limit` documents"""
+        if isinstance(self.index, Ivfflat):
+            return {"ivfflat.probes": probes or self.index.probes}
+        if isinstance(self.index, HNSW):
+            # HNSW returns at most ef_search results, so the candidate list is at least as large as the limit
+            return {"hnsw.ef_search": ef_search or max(self.index.ef_search, limit)}
+        return {}
+
+    def search_by_embedding(
+        self,
+        query_embedding: List[float],
+        limit: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        exact: bool = False,
+    ) -> List[Document]:
+        """
+        Search for the documents closest to an embedding.
+
+        Args:
+            query_embedding (List[float]): Embedding to search for
+            limit (int): Maximum number of documents to return
+            filters (Optional[Dict[str, Any]]): Filters on columns or meta_data fields, see get_filter_clause()
+            ef_search (Optional[int]): Size of the HNSW candidate list, see search()
+            probes (Optional[int]): Number of Ivfflat lists to search, see search()
+            exact (bool): Compare the embedding to every row instead of using the vector index
+        """
+        stmt = self.get_search_statement(query_embedding=query_embedding, limit=limit, filters=filters)
+        logger.debug(f"Query: {stmt}")
+
+        # Get neighbors
+        try:
+            with self.Session() as sess:
+                with sess.begin():
+                    for setting in self.get_search_settings_statements(limit, ef_search, probes, exact):
+                        sess.execute(setting)
+                    neighbors = sess.execute(stmt).fetchall() or []
+        except Exception as e:
+            logger.error(f"Error searching for documents: {e}")
+            logger.error("Table might not exist, creating for future use")
+            self.create()
+            return []
+
+        return [self.get_search_result(neighbor) for neighbor in neighbors]
+
+    async def asearch(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> List[Document]:
+        """
+        Search for the documents closest to the query without blocking the event loop, see search().
+        Uses the async engine if available, otherwise runs search() in a thread.
+        """
+        if self.async_db_engine is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, partial(self.search, query, limit, filters, ef_search, probes))
+
+        use_cache = ef_search is None and probes is None
+        if use_cache:
+            cached_results = self.get_cached_results(query=query, limit=limit, filters=filters)
+            if cached_results is not None:
+                return cached_results
+
+        query_embedding = await self.aget_query_embedding(query)
         if query_embedding is None:
             logger.error(f"Error getting embedding for Query: {query}")
             return []
 
+        stmt = self.get_search_statement(query_embedding=query_embedding, limit=limit, filters=filters)
+        try:
+            async with AsyncSession(self.async_db_engine) as sess:
+                async with sess.begin():
+                    for setting in self.get_search_settings_statements(limit, ef_search, probes):
+                        await sess.execute(setting)
+                    neighbors = (await sess.execute(stmt)).fetchall() or []
+        except Exception as e:
+            logger.error(f"Error searching for documents: {e}")
+            return []
+
+        search_results = [self.get_search_result(neighbor) for neighbor in neighbors]
+        if use_cache:
+            self.cache_results(query=query, limit=limit, results=search_results, filters=filters)
+        return search_results
+
+    def get_search_statement(
+        self, query_embedding: List[float], limit: int, filters: Optional[Dict[str, Any]] = None
+    ) -> Select:
+        """Returns the statement selecting the `limit` rows closest to an embedding"""
         columns = [
+            self.table.c.id,
             self.table.c.name,
             self.table.c.meta_data,
             self.table.c.content,
@@ -254,55 +484,108 @@ class PgVector2(VectorDb):
 
         if filters is not None:
             for key, value in filters.items():
-                if hasattr(self.table.c, key):
-                    stmt = stmt.where(getattr(self.table.c, key) == value)
+                stmt = stmt.where(self.get_filter_clause(key, value))
 
         if self.distance == Distance.l2:
-            stmt = stmt.order_by(self.table.c.embedding.max_inner_product(query_embedding))
+            stmt = stmt.order_by(self.table.c.embedding.l2_distance(query_embedding))
         if self.distance == Distance.cosine:
             stmt = stmt.order_by(self.table.c.embedding.cosine_distance(query_embedding))
         if self.distance == Distance.max_inner_product:
             stmt = stmt.order_by(self.table.c.embedding.max_inner_product(query_embedding))
 
-        stmt = stmt.limit(limit=limit)
+        return stmt.limit(limit=limit)
+
+    def get_search_settings_statements(
+        self, limit: int, ef_search: Optional[int] = None, probes: Optional[int] = None, exact: bool = False
+    ) -> List[TextClause]:
+        """Returns the SET LOCAL statements to run in the search transaction"""
+        if exact:
+            # Without index scans the planner sorts all rows by distance
+            return [text("SET LOCAL enable_indexscan = off")]
+        return [
+            text(f"SET LOCAL {key} = {int(value)}")
+            for key, value in self.get_search_settings(limit, ef_search, probes).items()
+        ]
+
+    def get_search_result(self, neighbor: Row) -> Document:
+        return Document(
+            id=neighbor.id,
+            name=neighbor.name,
+            meta_data=neighbor.meta_data,
+            content=neighbor.content,
+            embedder=self.embedder,
+            embedding=neighbor.embedding,
+            usage=neighbor.usage,
+        )
+
+    def sample_embeddings(self, sample_size: int) -> List[List[float]]:
+        """Returns the embeddings of up to `sample_size` random rows"""
+        stmt = select(self.table.c.embedding).order_by(func.random()).limit(sample_size)
+        with self.Session() as sess:
+            with sess.begin():
+                rows = sess.execute(stmt).fetchall()
+        return [[float(v) for v in row.embedding] for row in rows if row.embedding is not None]
+
+    def get_filter_clause(self, key: str, value: Any) -> ColumnElement:
+        """Compile a search filter to a where clause, see phi.vectordb.pgvector.filters.get_filter_clause()"""
+        return get_filter_clause(self.table, key, value)
+
+    def keyword_search_available(self) -> bool:
+        return True
+
+    def keyword_search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """
+        Full text search on the document contents using tsvector, ranked by ts_rank_cd.
+        The query expression matches the GIN index created by optimize() when keyword_index is True.
+
+        Args:
+            query (str): Keywords to search for, in websearch_to_tsquery syntax
+            limit (int): Maximum number of documents to return
+            filters (Optional[Dict[str, Any]]): Filters on columns or meta_data fields, see get_filter_clause()
+        """
+        config: ColumnElement = literal_column(f"'{self.text_search_config}'::regconfig")
+        ts_vector = func.to_tsvector(config, self.table.c.content)
+        ts_query = func.websearch_to_tsquery(config, query)
+        stmt = (
+            select(
+                self.table.c.name,
+                self.table.c.meta_data,
+                self.table.c.content,
+                self.table.c.usage,
+            )
+            .where(ts_vector.op("@@")(ts_query))
+            .order_by(func.ts_rank_cd(ts_vector, ts_query).desc())
+            .limit(limit=limit)
+        )
+        if filters is not None:
+            for key, value in filters.items():
+                stmt = stmt.where(self.get_filter_clause(key, value))
         logger.debug(f"Query: {stmt}")
 
-        # Get neighbors
         try:
             with self.Session() as sess:
                 with sess.begin():
-                    if self.index is not None:
-                        if isinstance(self.index, Ivfflat):
-                            sess.execute(text(f"SET LOCAL ivfflat.probes = {self.index.probes}"))
-                        elif isinstance(self.index, HNSW):
-                            sess.execute(text(f"SET LOCAL hnsw.ef_search  = {self.index.ef_search}"))
-                    neighbors = sess.execute(stmt).fetchall() or []
+                    rows = sess.execute(stmt).fetchall() or []
         except Exception as e:
             logger.error(f"Error searching for documents: {e}")
-            logger.error("Table might not exist, creating for future use")
-            self.create()
             return []
 
-        # Build search results
-        search_results: List[Document] = []
-        for neighbor in neighbors:
-            search_results.append(
-                Document(
-                    name=neighbor.name,
-                    meta_data=neighbor.meta_data,
-                    content=neighbor.content,
-                    embedder=self.embedder,
-                    embedding=neighbor.embedding,
-                    usage=neighbor.usage,
-                )
+        return [
+            Document(
+                name=row.name,
+                meta_data=row.meta_data,
+                content=row.content,
+                embedder=self.embedder,
+                usage=row.usage,
             )
-
-        return search_results
+            for row in rows
+        ]
 
     def delete(self) -> None:
         if self.table_exists():
             logger.debug(f"Deleting table: {self.collection}")
             self.table.drop(self.db_engine)
+            self.invalidate_search_cache()
 
     def exists(self) -> bool:
         return self.table_exists()
@@ -310,16 +593,21 @@ class PgVector2(VectorDb):
     def get_count(self) -> int:
         with self.Session() as sess:
             with sess.begin():
-                stmt = select(func.count(self.table.c.name)).select_from(self.table)
+                stmt = select(func.count()).select_from(self.table)
                 result = sess.execute(stmt).scalar()
                 if result is not None:
                     return int(result)
                 return 0
 
     def optimize(self) -> None:
-        from math import sqrt
-
+        """
+        Create the indexes of the collection without blocking writes, and rebuild the vector index online
+        when an Ivfflat index has too few or too many lists for the current number of rows.
+        """
         logger.debug("==== Optimizing Vector DB ====")
+        if self.keyword_index:
+            self.create_keyword_index()
+        self.create_meta_data_index()
         if self.index is None:
             return
 
@@ -327,6 +615,88 @@ class PgVector2(VectorDb):
             _type = "ivfflat" if isinstance(self.index, Ivfflat) else "hnsw"
             self.index.name = f"{self.collection}_{_type}_index"
 
+        num_rows = self.get_count()
+        logger.debug(f"Number of records: {num_rows}")
+        index_state = self.get_index_state(self.index.name)
+        if index_state is None:
+            self.create_vector_index(index_name=self.index.name, num_rows=num_rows)
+        elif not index_state["valid"]:
+            # Left behind by a failed concurrent build
+            logger.warning(f"Index {self.index.name} is invalid, rebuilding")
+            self.rebuild_vector_index(num_rows=num_rows)
+        elif self.index_is_stale(index_state=index_state, num_rows=num_rows):
+            logger.info(
+                f"Rebuilding index {self.index.name}: built for {index_state['rows']} rows "
+                f"with {index_state['lists']} lists, table has {num_rows} rows"
+            )
+            self.rebuild_vector_index(num_rows=num_rows)
+        logger.debug("==== Optimized Vector DB ====")
+
+    def get_index_lists(self, num_rows: int) -> int:
+        """Returns the number of lists of an Ivfflat index for a table with `num_rows` rows"""
+        from math import sqrt
+
+        if not isinstance(self.index, Ivfflat) or not self.index.dynamic_lists:
+            return self.index.lists if isinstance(self.index, Ivfflat) else 0
+        if num_rows <= 1000000:
+            return max(int(num_rows / 1000), 1)
+        return int(sqrt(num_rows))
+
+    def get_index_state(self, index_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the state of an index, or None if it does not exist.
+
+        The state has the keys:
+            valid (bool): False if the index was left behind by a failed concurrent build
+            lists (Optional[int]): Number of lists of an Ivfflat index
+            rows (Optional[int]): Number of rows in the table when the index was built
+        """
+        stmt = text(
+            "SELECT i.indisvalid AS valid, c.reloptions AS options, obj_description(c.oid, 'pg_class') AS comment "
+            "FROM pg_class c "
+            "JOIN pg_index i ON i.indexrelid = c.oid "
+            "JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE c.relname = :index_name AND n.nspname = coalesce(:schema, current_schema())"
+        )
+        with self.Session() as sess:
+            with sess.begin():
+                row = sess.execute(stmt, {"index_name": index_name, "schema": self.schema}).first()
+        if row is None:
+            return None
+
+        lists: Optional[int] = None
+        for option in row.options or []:
+            key, _, value = option.partition("=")
+            if key == "lists":
+                lists = int(value)
+
+        rows: Optional[int] = None
+        if row.comment:
+            try:
+                rows = json.loads(row.comment).get("rows")
+            except (ValueError, AttributeError):
+                pass
+        return {"valid": row.valid, "lists": lists, "rows": rows}
+
+    def index_is_stale(self, index_state: Dict[str, Any], num_rows: int) -> bool:
+        """Returns True if the number of lists of an Ivfflat index differs from the number of lists
+        for the current number of rows by at least `rebuild_factor`.
+        HNSW indexes are updated incrementally and are never stale.
+        """
+        if not isinstance(self.index, Ivfflat) or not self.index.dynamic_lists:
+            return False
+
+        built_lists = index_state.get("lists")
+        if built_lists is None:
+            return False
+        lists = self.get_index_lists(num_rows)
+        return max(lists, built_lists) / max(min(lists, built_lists), 1) >= self.index.rebuild_factor
+
+    def create_vector_index(self, index_name: str, num_rows: int) -> None:
+        """Create the vector index, recording the number of rows at build time in the index comment"""
+        if self.index is None:
+            return
+
         index_distance = "vector_cosine_ops"
         if self.distance == Distance.l2:
             index_distance = "vector_l2_ops"
@@ -334,50 +704,100 @@ class PgVector2(VectorDb):
             index_distance = "vector_ip_ops"
 
         if isinstance(self.index, Ivfflat):
-            num_lists = self.index.lists
-            if self.index.dynamic_lists:
-                total_records = self.get_count()
-                logger.debug(f"Number of records: {total_records}")
-                if total_records < 1000000:
-                    num_lists = int(total_records / 1000)
-                elif total_records > 1000000:
-                    num_lists = int(sqrt(total_records))
+            num_lists = self.get_index_lists(num_rows)
+            logger.debug(
+                f"Creating Ivfflat index with lists: {num_lists}, probes: {self.index.probes} "
+                f"and distance metric: {index_distance}"
+            )
+            using = f"ivfflat (embedding {index_distance}) WITH (lists = {num_lists})"
+        else:
+            logger.debug(
+                f"Creating HNSW index with m: {self.index.m}, ef_construction: {self.index.ef_construction} "
+                f"and distance metric: {index_distance}"
+            )
+            using = (
+                f"hnsw (embedding {index_distance}) "
+                f"WITH (m = {self.index.m}, ef_construction = {self.index.ef_construction})"
+            )
+        self.create_index(
+            index_name=index_name,
+            using=using,
+            configuration=self.index.configuration,
+            concurrently=self.index.concurrently,
+        )
+        with self.db_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(
+                text(f"COMMENT ON INDEX {self.get_index_path(index_name)} IS '{json.dumps({'rows': num_rows})}'")
+            )
 
-            with self.Session() as sess:
-                with sess.begin():
-                    logger.debug(f"Setting configuration: {self.index.configuration}")
-                    for key, value in self.index.configuration.items():
-                        sess.execute(text(f"SET {key} = '{value}';"))
-                    logger.debug(
-                        f"Creating Ivfflat index with lists: {num_lists}, probes: {self.index.probes} "
-                        f"and distance metric: {index_distance}"
-                    )
-                    sess.execute(text(f"SET ivfflat.probes = {self.index.probes};"))
-                    sess.execute(
-                        text(
-                            f"CREATE INDEX IF NOT EXISTS {self.index.name} ON {self.table} "
-                            f"USING ivfflat (embedding {index_distance}) "
-                            f"WITH (lists = {num_lists});"
-                        )
-                    )
-        elif isinstance(self.index, HNSW):
-            with self.Session() as sess:
-                with sess.begin():
-                    logger.debug(f"Setting configuration: {self.index.configuration}")
-                    for key, value in self.index.configuration.items():
-                        sess.execute(text(f"SET {key} = '{value}';"))
-                    logger.debug(
-                        f"Creating HNSW index with m: {self.index.m}, ef_construction: {self.index.ef_construction} "
-                        f"and distance metric: {index_distance}"
-                    )
-                    sess.execute(
-                        text(
-                            f"CREATE INDEX IF NOT EXISTS {self.index.name} ON {self.table} "
-                            f"USING hnsw (embedding {index_distance}) "
-                            f"WITH (m = {self.index.m}, ef_construction = {self.index.ef_construction});"
-                        )
+    def rebuild_vector_index(self, num_rows: int) -> None:
+        """Build a new vector index next to the current one, then drop the current index and take over its name.
+        Searches keep using the current index while the new index is being built.
+        """
+        if self.index is None or self.index.name is None:
+            return
+
+        new_index_name = f"{self.index.name}_rebuild"
+        concurrently = "CONCURRENTLY " if self.index.concurrently else ""
+        with self.db_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            # Remove a new index left behind by a previous rebuild
+            conn.execute(text(f"DROP INDEX {concurrently}IF EXISTS {self.get_index_path(new_index_name)};"))
+        self.create_vector_index(index_name=new_index_name, num_rows=num_rows)
+        with self.db_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(f"DROP INDEX {concurrently}IF EXISTS {self.get_index_path(self.index.name)};"))
+            conn.execute(text(f"ALTER INDEX {self.get_index_path(new_index_name)} RENAME TO {self.index.name};"))
+        logger.debug(f"Rebuilt index: {self.index.name}")
+
+    def get_index_path(self, index_name: str) -> str:
+        return f"{self.schema}.{index_name}" if self.schema is not None else index_name
+
+    def create_index(
+        self,
+        index_name: str,
+        using: str,
+        configuration: Optional[Dict[str, Any]] = None,
+        concurrently: bool = True,
+    ) -> None:
+        """
+        Create an index on the table if it does not exist.
+
+        Args:
+            index_name (str): Name of the index
+            using (str): Index method and definition, e.g. "gin (meta_data jsonb_path_ops)"
+            configuration (Optional[Dict[str, Any]]): Settings for the session building the index
+            concurrently (bool): Build the index without blocking writes to the table
+        """
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+        with self.db_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            if configuration:
+                logger.debug(f"Setting configuration: {configuration}")
+            for key, value in (configuration or {}).items():
+                conn.execute(text(f"SET {key} = '{value}';"))
+            try:
+                conn.execute(
+                    text(
+                        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {index_name} "
+                        f"ON {self.table} USING {using};"
                     )
-        logger.debug("==== Optimized Vector DB ====")
+                )
+            finally:
+                # Do not leak the settings to other users of the pooled connection
+                for key in (configuration or {}).keys():
+                    conn.execute(text(f"RESET {key};"))
+
+    def create_keyword_index(self) -> None:
+        """Create a GIN index on the tsvector of the document contents used by keyword_search()"""
+        index_name = f"{self.collection}_content_fts_index"
+        logger.debug(f"Creating keyword index: {index_name}")
+        self.create_index(
+            index_name=index_name, using=f"gin (to_tsvector('{self.text_search_config}'::regconfig, content))"
+        )
+
+    def create_meta_data_index(self) -> None:
+        """Create a GIN index on meta_data used by equality filters in search()"""
+        index_name = f"{self.collection}_meta_data_index"
+        logger.debug(f"Creating meta_data index: {index_name}")
+        self.create_index(index_name=index_name, using="gin (meta_data jsonb_path_ops)")
 
     def clear(self) -> bool:
         from sqlalchemy import delete
@@ -386,4 +806,5 @@ class PgVector2(VectorDb):
             with sess.begin():
                 stmt = delete(self.table)
                 sess.execute(stmt)
-                return True
+        self.invalidate_search_cache()
+        return True
@@ -1,4 +1,4 @@
-from typing import Optional, Dict, Union, List
+from typing import Any, Optional, Dict, Union, List, Set
 
 try:
     from pinecone import Pinecone
@@ -11,6 +11,8 @@ except ImportError:
 from phi.document import Document
 from phi.embedder import Embedder
 from phi.vectordb.base import VectorDb
+from phi.vectordb.cache import SearchCache
+from phi.vectordb.filters import Range
 from phi.utils.log import logger
 from pinecone.core.client.api.manage_indexes_api import ManageIndexesApi
 from pinecone.models import ServerlessSpec, PodSpec
@@ -32,6 +34,7 @@ class PineconeDB(VectorDb):
         api_key (Optional[str], optional): The Pinecone API key. Defaults to None.
         host (Optional[str], optional): The Pinecone host. Defaults to None.
         config (Optional[Config], optional): The Pinecone config. Defaults to None.
+        search_cache (Optional[SearchCache], optional): Cache for query embeddings and results. Defaults to None.
         **kwargs: Additional keyword arguments.
 
     Attributes:
@@ -48,6 +51,7 @@ class PineconeDB(VectorDb):
         spec (Union[Dict, ServerlessSpec, PodSpec]): The index spec.
         metric (Optional[str]): The metric used for similarity search.
         timeout (Optional[int]): The timeout for Pinecone operations.
+        search_cache (Optional[SearchCache]): Cache for query embeddings and search results.
         kwargs (Optional[Dict[str, str]]): Additional keyword arguments.
     """
 
@@ -66,6 +70,7 @@ class PineconeDB(VectorDb):
         api_key: Optional[str] = None,
         host: Optional[str] = None,
         config: Optional[Config] = None,
+        search_cache: Optional[SearchCache] = None,
         **kwargs,
     ):
         self._client = None
@@ -92,6 +97,9 @@ class PineconeDB(VectorDb):
             _embedder = OpenAIEmbedder()
         self.embedder: Embedder = _embedder
 
+        # Cache for query embeddings and search results
+        self.search_cache: Optional[SearchCache] = search_cache
+
     @property
     def client(self) -> Pinecone:
         """The Pinecone client.
@@ -153,6 +161,7 @@ class PineconeDB(VectorDb):
         if self.exists():
             logger.debug(f"Deleting index: {self.name}")
             self.client.delete_index(name=self.name, timeout=self.timeout)
+            self.invalidate_search_cache()
 
     def doc_exists(self, document: Document) -> bool:
         """Check if a document exists in the index.
@@ -167,6 +176,30 @@ class PineconeDB(VectorDb):
         response = self.index.fetch(ids=[document.id])
         return len(response.vectors) > 0
 
+    def docs_exist(self, documents: List[Document]) -> Set[str]:
+        """Check which documents exist in the index, fetching ids in batches.
+
+        Args:
+            documents (List[Document]): The documents to check.
+
+        Returns:
+            Set[str]: The content hashes of the documents that exist.
+
+        """
+        documents_by_id: Dict[str, List[Document]] = {}
+        for document in documents:
+            if document.id is not None:
+                documents_by_id.setdefault(document.id, []).append(document)
+
+        existing: Set[str] = set()
+        ids = list(documents_by_id.keys())
+        # Pinecone limits the number of ids that can be fetched in a single request
+        for i in range(0, len(ids), 1000):
+            response = self.index.fetch(ids=ids[i : i + 1000])
+            for _id in response.vectors:
+                existing.update(self.get_content_hash(document) for document in documents_by_id.get(_id, []))
+        return existing
+
     def name_exists(self, name: str) -> bool:
         """Check if an index with the given name exists.
 
@@ -201,8 +234,8 @@ class PineconeDB(VectorDb):
         """
 
         vectors = []
+        Document.embed_documents(documents=documents, embedder=self.embedder)
         for document in documents:
-            document.embed(embedder=self.embedder)
             document.meta_data["text"] = document.content
             vectors.append(
                 Vector(
@@ -217,6 +250,7 @@ class PineconeDB(VectorDb):
             batch_size=batch_size,
             show_progress=show_progress,
         )
+        self.invalidate_search_cache()
 
     def upsert_available(self) -> bool:
         """Check if upsert operation is available.
@@ -245,6 +279,7 @@ class PineconeDB(VectorDb):
         self,
         query: str,
         limit: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
         namespace: Optional[str] = None,
         filter: Optional[Dict[str, Union[str, float, int, bool, List, dict]]] = None,
         include_values: Optional[bool] = None,
@@ -254,6 +289,7 @@ class PineconeDB(VectorDb):
         Args:
             query (str): The query to search for.
             limit (int, optional): The maximum number of results to return. Defaults to 5.
+            filters (Optional[Dict[str, Any]], optional): Filters on metadata fields, see get_filter(). Defaults to None.
             namespace (Optional[str], optional): The namespace to search in. Defaults to None.
             filter (Optional[Dict[str, Union[str, float, int, bool, List, dict]]], optional): The filter for the search. Defaults to None.
             include_values (Optional[bool], optional): Whether to include values in the search results. Defaults to None.
@@ -263,7 +299,17 @@ class PineconeDB(VectorDb):
             List[Document]: The list of matching documents.
 
         """
-        query_embedding = self.embedder.get_embedding(query)
+        search_filters = {
+            "filters": filters,
+            "namespace": namespace,
+            "filter": filter,
+            "include_values": include_values,
+        }
+        cached_results = self.get_cached_results(query=query, limit=limit, filters=search_filters)
+        if cached_results is not None:
+            return cached_results
+
+        query_embedding = self.get_query_embedding(query)
 
         if query_embedding is None:
             logger.error(f"Error getting embedding for Query: {query}")
@@ -273,11 +319,11 @@ class PineconeDB(VectorDb):
             vector=query_embedding,
             top_k=limit,
             namespace=namespace,
-            filter=filter,
+            filter=self.get_filter(filters, filter),
             include_values=include_values,
             include_metadata=True,
         )
-        return [
+        search_results = [
             Document(
                 content=(result.metadata.get("text", "") if result.metadata is not None else ""),
                 id=result.id,
@@ -286,6 +332,34 @@ class PineconeDB(VectorDb):
             )
             for result in response.matches
         ]
+        self.cache_results(query=query, limit=limit, results=search_results, filters=search_filters)
+        return search_results
+
+    @staticmethod
+    def get_filter(
+        filters: Optional[Dict[str, Any]], filter: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Compile search filters to a Pinecone metadata filter, combined with a Pinecone `filter`.
+
+        A Range matches values within the range, a list, tuple or set matches any of its values
+        and other values match equal values.
+        """
+        conditions: List[Dict[str, Any]] = [filter] if filter else []
+        for key, value in (filters or {}).items():
+            if isinstance(value, Range):
+                bounds = {"$gt": value.gt, "$gte": value.gte, "$lt": value.lt, "$lte": value.lte}
+                # A Range without bounds matches documents which have the field
+                conditions.append(
+                    {key: {op: bound for op, bound in bounds.items() if bound is not None} or {"$exists": True}}
+                )
+            elif isinstance(value, (list, tuple, set)):
+                conditions.append({key: {"$in": list(value)}})
+            else:
+                conditions.append({key: {"$eq": value}})
+        if len(conditions) == 0:
+            return None
+        return conditions[0] if len(conditions) == 1 else {"$and": conditions}
 
     def optimize(self) -> None:
         """Optimize the index.
@@ -304,6 +378,7 @@ class PineconeDB(VectorDb):
         """
         try:
             self.index.delete(delete_all=True, namespace=namespace)
+            self.invalidate_search_cache()
             return True
         except Exception:
             return False
@@ -1,8 +1,11 @@
+import asyncio
 from hashlib import md5
-from typing import List, Optional
+from importlib.util import find_spec
+from math import ceil
+from typing import Any, Dict, Iterator, List, Optional, Set
 
 try:
-    from qdrant_client import QdrantClient  # noqa: F401
+    from qdrant_client import AsyncQdrantClient, QdrantClient  # noqa: F401
     from qdrant_client.http import models
 except ImportError:
     raise ImportError(
@@ -14,7 +17,9 @@ from phi.document import Document
 from phi.embedder import Embedder
 from phi.embedder.openai import OpenAIEmbedder
 from phi.vectordb.base import VectorDb
+from phi.vectordb.cache import SearchCache
 from phi.vectordb.distance import Distance
+from phi.vectordb.filters import Range
 from phi.utils.log import logger
 
 
@@ -28,13 +33,17 @@ class Qdrant(VectorDb):
         url: Optional[str] = None,
         port: Optional[int] = 6333,
         grpc_port: int = 6334,
-        prefer_grpc: bool = False,
+        prefer_grpc: Optional[bool] = None,
         https: Optional[bool] = None,
         api_key: Optional[str] = None,
         prefix: Optional[str] = None,
         timeout: Optional[float] = None,
         host: Optional[str] = None,
         path: Optional[str] = None,
+        search_cache: Optional[SearchCache] = None,
+        batch_size: int = 64,
+        parallel: int = 1,
+        wait: bool = False,
         **kwargs,
     ):
         # Collection attributes
@@ -47,15 +56,27 @@ class Qdrant(VectorDb):
         # Distance metric
         self.distance: Distance = distance
 
-        # Qdrant client instance
+        # Cache for query embeddings and search results
+        self.search_cache: Optional[SearchCache] = search_cache
+
+        # Number of documents to embed and upload in a single request
+        self.batch_size: int = batch_size
+        # Number of processes uploading batches in parallel
+        self.parallel: int = parallel
+        # Wait for uploaded points to be indexed. If False, points may not be searchable right after an insert.
+        self.wait: bool = wait
+
+        # Qdrant client instances
         self._client: Optional[QdrantClient] = None
+        self._async_client: Optional[AsyncQdrantClient] = None
 
         # Qdrant client arguments
         self.location: Optional[str] = location
         self.url: Optional[str] = url
         self.port: Optional[int] = port
         self.grpc_port: int = grpc_port
-        self.prefer_grpc: bool = prefer_grpc
+        # Use gRPC by default when grpcio is installed, as it is faster than REST for uploads
+        self.prefer_grpc: bool = prefer_grpc if prefer_grpc is not None else find_spec("grpc") is not None
         self.https: Optional[bool] = https
         self.api_key: Optional[str] = api_key
         self.prefix: Optional[str] = prefix
@@ -79,13 +100,43 @@ class Qdrant(VectorDb):
                 https=self.https,
                 api_key=self.api_key,
                 prefix=self.prefix,
-                timeout=self.timeout,
+                timeout=self.client_timeout,
                 host=self.host,
                 path=self.path,
                 **self.kwargs,
             )
         return self._client
 
+    @property
+    def client_timeout(self) -> Optional[int]:
+        """The clients take the timeout in whole seconds, round up so the timeout is not shortened"""
+        return ceil(self.timeout) if self.timeout is not None else None
+
+    @property
+    def async_client(self) -> AsyncQdrantClient:
+        if self._async_client is None:
+            logger.debug("Creating Async Qdrant Client")
+            self._async_client = AsyncQdrantClient(
+                location=self.location,
+                url=self.url,
+                port=self.port,
+                grpc_port=self.grpc_port,
+                prefer_grpc=self.prefer_grpc,
+                https=self.https,
+                api_key=self.api_key,
+                prefix=self.prefix,
+                timeout=self.client_timeout,
+                host=self.host,
+                path=self.path,
+                **self.kwargs,
+            )
+        return self._async_client
+
+    @property
+    def async_client_available(self) -> bool:
+        """The async client does not share the data of a local (in-memory or on-disk) sync client"""
+        return self.location != ":memory:" and self.path is None
+
     def create(self) -> None:
         # Collection distance
         _distance = models.Distance.COSINE
@@ -118,14 +169,33 @@ class Qdrant(VectorDb):
             return len(collection_points) > 0
         return False
 
+    def docs_exist(self, documents: List[Document]) -> Set[str]:
+        """
+        Returns the content hashes of the documents which exist, using a single request
+
+        Args:
+            documents (List[Document]): Documents to validate
+        """
+        content_hashes = list({self.get_content_hash(document) for document in documents})
+        if len(content_hashes) == 0 or not self.client:
+            return set()
+
+        collection_points = self.client.retrieve(
+            collection_name=self.collection,
+            ids=content_hashes,
+            with_payload=False,
+            with_vectors=False,
+        )
+        # Qdrant returns string ids as UUIDs, so remove the hyphens to get back the content hash
+        return {str(point.id).replace("-", "") for point in collection_points}
+
     def name_exists(self, name: str) -> bool:
         raise NotImplementedError
 
-    def insert(self, documents: List[Document], batch_size: int = 10) -> None:
-        logger.debug(f"Inserting {len(documents)} documents")
+    def get_points(self, documents: List[Document]) -> List[models.PointStruct]:
+        """Returns the points for embedded documents"""
         points = []
         for document in documents:
-            document.embed(embedder=self.embedder)
             cleaned_content = document.content.replace("\x00", "\ufffd")
             doc_id = md5(cleaned_content.encode()).hexdigest()
             points.append(
@@ -141,9 +211,68 @@ class Qdrant(VectorDb):
                 )
             )
             logger.debug(f"Inserted document: {document.name} ({document.meta_data})")
-        if len(points) > 0:
-            self.client.upsert(collection_name=self.collection, wait=False, points=points)
-        logger.debug(f"Upsert {len(points)} documents")
+        return points
+
+    def iter_points(self, documents: List[Document], batch_size: int) -> Iterator[models.PointStruct]:
+        """Embeds the documents one batch at a time and yields their points"""
+        for i in range(0, len(documents), batch_size):
+            batch = documents[i : i + batch_size]
+            Document.embed_documents(documents=batch, embedder=self.embedder)
+            yield from self.get_points(batch)
+
+    def insert(self, documents: List[Document], batch_size: Optional[int] = None) -> None:
+        """
+        Insert documents into the collection, embedding one batch at a time as the points are uploaded.
+        With `parallel` > 1, batches are embedded while previous batches are uploaded by the worker processes.
+
+        Args:
+            documents (List[Document]): List of documents to insert
+            batch_size (Optional[int]): Number of documents per batch. Defaults to self.batch_size.
+        """
+        if len(documents) == 0:
+            return
+
+        _batch_size = max(batch_size or self.batch_size, 1)
+        logger.debug(f"Inserting {len(documents)} documents in batches of {_batch_size}")
+        self.client.upload_points(
+            collection_name=self.collection,
+            points=self.iter_points(documents, _batch_size),
+            batch_size=_batch_size,
+            parallel=self.parallel,
+            wait=self.wait,
+        )
+        logger.debug(f"Upsert {len(documents)} documents")
+        self.invalidate_search_cache()
+
+    async def ainsert(self, documents: List[Document], batch_size: Optional[int] = None) -> None:
+        if not self.async_client_available:
+            return await super().ainsert(documents)
+        if len(documents) == 0:
+            return
+
+        _batch_size = max(batch_size or self.batch_size, 1)
+        logger.debug(f"Inserting {len(documents)} documents in batches of {_batch_size}")
+        # Upload each batch while the next batch is being embedded
+        upload: Optional[asyncio.Task] = None
+        try:
+            for i in range(0, len(documents), _batch_size):
+                batch = documents[i : i + _batch_size]
+                await Document.aembed_documents(documents=batch, embedder=self.embedder)
+                points = self.get_points(batch)
+                if upload is not None:
+                    await upload
+                upload = asyncio.create_task(
+                    self.async_client.upsert(collection_name=self.collection, points=points, wait=self.wait)
+                )
+            if upload is not None:
+                await upload
+        except BaseException:
+            if upload is not None and not upload.done():
+                upload.cancel()
+                await asyncio.gather(upload, return_exceptions=True)
+            raise
+        logger.debug(f"Upsert {len(documents)} documents")
+        self.invalidate_search_cache()
 
     def upsert(self, documents: List[Document]) -> None:
         """
@@ -155,8 +284,59 @@ class Qdrant(VectorDb):
         logger.debug("Redirecting the request to insert")
         self.insert(documents)
 
-    def search(self, query: str, limit: int = 5) -> List[Document]:
-        query_embedding = self.embedder.get_embedding(query)
+    async def aupsert(self, documents: List[Document]) -> None:
+        logger.debug("Redirecting the request to insert")
+        await self.ainsert(documents)
+
+    def delete_documents(self, content_hashes: List[str]) -> None:
+        """
+        Delete the documents with the given content hashes
+
+        Args:
+            content_hashes (List[str]): Content hashes of the documents to delete
+        """
+        if len(content_hashes) == 0:
+            return
+
+        self.client.delete(
+            collection_name=self.collection,
+            points_selector=models.PointIdsList(points=content_hashes),  # type: ignore
+        )
+        logger.debug(f"Deleted {len(content_hashes)} documents")
+        self.invalidate_search_cache()
+
+    def get_filter(self, filters: Optional[Dict[str, Any]]) -> Optional[models.Filter]:
+        """
+        Compile search filters to a Qdrant payload filter.
+
+        The "name" key matches the document name, other keys match the meta_data field with that name.
+        A Range matches values within the range, a list, tuple or set matches any of its values
+        and other values match equal values.
+        """
+        if not filters:
+            return None
+
+        conditions: List[models.Condition] = []
+        for key, value in filters.items():
+            field = key if key == "name" else f"meta_data.{key}"
+            if isinstance(value, Range):
+                conditions.append(
+                    models.FieldCondition(
+                        key=field, range=models.Range(gt=value.gt, gte=value.gte, lt=value.lt, lte=value.lte)
+                    )
+                )
+            elif isinstance(value, (list, tuple, set)):
+                conditions.append(models.FieldCondition(key=field, match=models.MatchAny(any=list(value))))
+            else:
+                conditions.append(models.FieldCondition(key=field, match=models.MatchValue(value=value)))
+        return models.Filter(must=conditions)
+
+    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        cached_results = self.get_cached_results(query=query, limit=limit, filters=filters)
+        if cached_results is not None:
+            return cached_results
+
+        query_embedding = self.get_query_embedding(query)
         if query_embedding is None:
             logger.error(f"Error getting embedding for Query: {query}")
             return []
@@ -164,12 +344,43 @@ class Qdrant(VectorDb):
         results = self.client.search(
             collection_name=self.collection,
             query_vector=query_embedding,
+            query_filter=self.get_filter(filters),
             with_vectors=True,
             with_payload=True,
             limit=limit,
         )
 
-        # Build search results
+        search_results = self.get_search_results(results)
+        self.cache_results(query=query, limit=limit, results=search_results, filters=filters)
+        return search_results
+
+    async def asearch(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        if not self.async_client_available:
+            return await super().asearch(query=query, limit=limit, filters=filters)
+
+        cached_results = self.get_cached_results(query=query, limit=limit, filters=filters)
+        if cached_results is not None:
+            return cached_results
+
+        query_embedding = await self.aget_query_embedding(query)
+        if query_embedding is None:
+            logger.error(f"Error getting embedding for Query: {query}")
+            return []
+
+        results = await self.async_client.search(
+            collection_name=self.collection,
+            query_vector=query_embedding,
+            query_filter=self.get_filter(filters),
+            with_vectors=True,
+            with_payload=True,
+            limit=limit,
+        )
+
+        search_results = self.get_search_results(results)
+        self.cache_results(query=query, limit=limit, results=search_results, filters=filters)
+        return search_results
+
+    def get_search_results(self, results: List[models.ScoredPoint]) -> List[Document]:
         search_results: List[Document] = []
         for result in results:
             if result.payload is None:
@@ -184,13 +395,13 @@ class Qdrant(VectorDb):
                     usage=result.payload["usage"],
                 )
             )
-
         return search_results
 
     def delete(self) -> None:
         if self.exists():
             logger.debug(f"Deleting collection: {self.collection}")
             self.client.delete_collection(self.collection)
+            self.invalidate_search_cache()
 
     def exists(self) -> bool:
         if self.client:
@@ -1,14 +1,13 @@
 import json
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set
 from hashlib import md5
 
 try:
     from sqlalchemy.dialects import mysql
-    from sqlalchemy.engine import create_engine, Engine
+    from sqlalchemy.engine import Engine
     from sqlalchemy.inspection import inspect
-    from sqlalchemy.orm import Session, sessionmaker
     from sqlalchemy.schema import MetaData, Table, Column
-    from sqlalchemy.sql.expression import text, func, select
+    from sqlalchemy.sql.expression import text, func, select, and_, or_, false, true, ColumnElement
     from sqlalchemy.types import DateTime
 except ImportError:
     raise ImportError("`sqlalchemy` not installed")
@@ -18,7 +17,10 @@ from phi.document import Document
 from phi.embedder import Embedder
 from phi.embedder.openai import OpenAIEmbedder
 from phi.vectordb.base import VectorDb
+from phi.vectordb.cache import SearchCache
 from phi.vectordb.distance import Distance
+from phi.vectordb.filters import Range
+from phi.utils.db import get_engine, SessionFactory
 from phi.utils.log import logger
 
 
@@ -31,10 +33,11 @@ class S2VectorDb(VectorDb):
         db_engine: Optional[Engine] = None,
         embedder: Embedder = OpenAIEmbedder(),
         distance: Distance = Distance.cosine,
+        search_cache: Optional[SearchCache] = None,
     ):
         _engine: Optional[Engine] = db_engine
         if _engine is None and db_url is not None:
-            _engine = create_engine(db_url)
+            _engine = get_engine(db_url)
 
         if _engine is None:
             raise ValueError("Must provide either db_url or db_engine")
@@ -47,7 +50,8 @@ class S2VectorDb(VectorDb):
         self.embedder: Embedder = embedder
         self.dimensions: int = self.embedder.dimensions
         self.distance: Distance = distance
-        self.Session: sessionmaker[Session] = sessionmaker(bind=self.db_engine)
+        self.search_cache: Optional[SearchCache] = search_cache
+        self.Session: SessionFactory = SessionFactory(self.db_engine)
         self.table: Table = self.get_table()
 
     def get_table(self) -> Table:
@@ -98,6 +102,22 @@ class S2VectorDb(VectorDb):
             result = sess.execute(stmt).first()
             return result is not None
 
+    def docs_exist(self, documents: List[Document]) -> Set[str]:
+        """
+        Returns the content hashes of the documents which exist, using a single query
+
+        Args:
+            documents (List[Document]): Documents to validate
+        """
+        content_hashes = list({self.get_content_hash(document) for document in documents})
+        if len(content_hashes) == 0:
+            return set()
+
+        with self.Session.begin() as sess:
+            stmt = select(self.table.c.content_hash).where(self.table.c.content_hash.in_(content_hashes))
+            result = sess.execute(stmt).scalars().all()
+            return set(result)
+
     def name_exists(self, name: str) -> bool:
         """
         Validate if a row with this name exists or not
@@ -125,8 +145,8 @@ class S2VectorDb(VectorDb):
     def insert(self, documents: List[Document], batch_size: int = 10) -> None:
         with self.Session.begin() as sess:
             counter = 0
+            Document.embed_documents(documents=documents, embedder=self.embedder)
             for document in documents:
-                document.embed(embedder=self.embedder)
                 cleaned_content = document.content.replace("\x00", "\ufffd")
                 content_hash = md5(cleaned_content.encode()).hexdigest()
                 _id = document.id or content_hash
@@ -152,6 +172,7 @@ class S2VectorDb(VectorDb):
             # Commit all documents
             sess.commit()
             logger.debug(f"Committed {counter} documents")
+        self.invalidate_search_cache()
 
     def upsert_available(self) -> bool:
         return False
@@ -166,8 +187,8 @@ class S2VectorDb(VectorDb):
         """
         with self.Session.begin() as sess:
             counter = 0
+            Document.embed_documents(documents=documents, embedder=self.embedder)
             for document in documents:
-                document.embed(embedder=self.embedder)
                 cleaned_content = document.content.replace("\x00", "\ufffd")
                 content_hash = md5(cleaned_content.encode()).hexdigest()
                 _id = document.id or content_hash
@@ -193,9 +214,30 @@ class S2VectorDb(VectorDb):
             # Commit all remaining documents
             sess.commit()
             logger.debug(f"Committed {counter} documents")
+        self.invalidate_search_cache()
+
+    def delete_documents(self, content_hashes: List[str]) -> None:
+        """
+        Delete the documents with the given content hashes
+
+        Args:
+            content_hashes (List[str]): Content hashes of the documents to delete
+        """
+        if len(content_hashes) == 0:
+            return
+
+        with self.Session.begin() as sess:
+            stmt = self.table.delete().where(self.table.c.content_hash.in_(content_hashes))
+            sess.execute(stmt)
+            logger.debug(f"Deleted {len(content_hashes)} documents")
+        self.invalidate_search_cache()
 
     def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
-        query_embedding = self.embedder.get_embedding(query)
+        cached_results = self.get_cached_results(query=query, limit=limit, filters=filters)
+        if cached_results is not None:
+            return cached_results
+
+        query_embedding = self.get_query_embedding(query)
         if query_embedding is None:
             logger.error(f"Error getting embedding for Query: {query}")
             return []
@@ -214,8 +256,7 @@ class S2VectorDb(VectorDb):
 
         if filters is not None:
             for key, value in filters.items():
-                if hasattr(self.table.c, key):
-                    stmt = stmt.where(getattr(self.table.c, key) == value)
+                stmt = stmt.where(self.get_filter_clause(key, value))
 
         if self.distance == Distance.l2:
             stmt = stmt.order_by(self.table.c.embedding.max_inner_product(query_embedding))
@@ -264,12 +305,73 @@ class S2VectorDb(VectorDb):
                 )
             )
 
+        self.cache_results(query=query, limit=limit, results=search_results, filters=filters)
         return search_results
 
+    def get_filter_clause(self, key: str, value: Any) -> ColumnElement:
+        """
+        Compile a search filter to a where clause.
+
+        Keys which are columns of the table are compared to the column, other keys are compared to the
+        meta_data field with that name using the JSON_EXTRACT_* functions. A Range matches values within
+        the range, a list, tuple or set matches any of its values and other values match equal values.
+        """
+        if key != "meta_data" and hasattr(self.table.c, key):
+            column = getattr(self.table.c, key)
+            if isinstance(value, Range):
+                return self.get_range_clause(column, value)
+            if isinstance(value, (list, tuple, set)):
+                return column.in_(list(value))
+            return column == value
+
+        if isinstance(value, Range):
+            bounds = [v for v in (value.gt, value.gte, value.lt, value.lte) if v is not None]
+            # Compare numbers numerically and other values, e.g. ISO dates, as strings
+            is_numeric = len(bounds) > 0 and all(self.is_number(v) for v in bounds)
+            field = self.get_meta_data_field(key, 0.0 if is_numeric else "")
+            # Only match documents which have the field
+            return and_(field.is_not(None), self.get_range_clause(field, value))
+        if isinstance(value, (list, tuple, set)):
+            return or_(false(), *[self.get_meta_data_field(key, v) == self.get_json_value(v) for v in value])
+        return self.get_meta_data_field(key, value) == self.get_json_value(value)
+
+    @staticmethod
+    def is_number(value: Any) -> bool:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    def get_meta_data_field(self, key: str, value: Any) -> ColumnElement:
+        """Returns the meta_data field `key`, extracted with the JSON_EXTRACT_* function matching the type of `value`"""
+        meta_data = self.table.c.meta_data
+        if self.is_number(value):
+            return func.json_extract_double(meta_data, key)
+        if isinstance(value, str):
+            return func.json_extract_string(meta_data, key)
+        # Compare other values, e.g. booleans and null, by their JSON representation
+        return func.json_extract_json(meta_data, key)
+
+    def get_json_value(self, value: Any) -> Any:
+        if self.is_number(value) or isinstance(value, str):
+            return value
+        return json.dumps(value)
+
+    @staticmethod
+    def get_range_clause(field: Any, value: Range) -> ColumnElement:
+        conditions = []
+        if value.gt is not None:
+            conditions.append(field > value.gt)
+        if value.gte is not None:
+            conditions.append(field >= value.gte)
+        if value.lt is not None:
+            conditions.append(field < value.lt)
+        if value.lte is not None:
+            conditions.append(field <= value.lte)
+        return and_(*conditions) if conditions else true()
+
     def delete(self) -> None:
         if self.table_exists():
             logger.debug(f"Deleting table: {self.collection}")
             self.table.drop(self.db_engine)
+            self.invalidate_search_cache()
 
     def exists(self) -> bool:
         return self.table_exists()
@@ -290,4 +392,5 @@ class S2VectorDb(VectorDb):
         with self.Session.begin() as sess:
             stmt = self.table.delete()
             sess.execute(stmt)
-            return True
+        self.invalidate_search_cache()
+        return True